@@ -1,7 +1,26 @@
+import sys
 from core.client import GitHubClient
 from managers.repository import RepositoryManager
 from managers.file import FileManager
-from managers.workflow import WorkflowManager
+from managers.workflow import WorkflowManager, CONCLUSION_EXIT_CODES
+from managers.provision import ProvisionManager
+from managers.commit import CommitManager
+from managers.export import ExportManager
+from managers.branch import BranchManager
+from managers.issue_pr import IssuePRManager
+from managers.campaign import CampaignManager
+from managers.collaborator import CollaboratorManager
+from managers.audit import AuditManager, LEVEL_CODES
+from managers.logs import LogManager
+from managers.stats import ActionsStatsManager
+from managers.profile import ProfileManager
+from managers.dashboard import DashboardManager
+from managers.orchestrate import OrchestrationManager
+from managers.autorerun import AutoRerunManager
+from managers.secret import SecretManager
+from core.exceptions import GitHubManagerError
+from utils.manifest import load_manifest
+from utils.timeutil import parse_duration
 
 class CommandHandler:
     def __init__(self, token: str):
@@ -9,6 +28,21 @@ class CommandHandler:
         self.repo_manager = RepositoryManager(self.client)
         self.file_manager = FileManager(self.client)
         self.workflow_manager = WorkflowManager(self.client)
+        self.provision_manager = ProvisionManager(self.client)
+        self.commit_manager = CommitManager(self.client)
+        self.export_manager = ExportManager(self.client)
+        self.branch_manager = BranchManager(self.client)
+        self.issue_pr_manager = IssuePRManager(self.client)
+        self.campaign_manager = CampaignManager(self.client)
+        self.collaborator_manager = CollaboratorManager(self.client)
+        self.audit_manager = AuditManager(self.client)
+        self.log_manager = LogManager(self.client)
+        self.stats_manager = ActionsStatsManager(self.client)
+        self.profile_manager = ProfileManager(self.client)
+        self.dashboard_manager = DashboardManager(self.client)
+        self.orchestration_manager = OrchestrationManager(self.client)
+        self.auto_rerun_manager = AutoRerunManager(self.client)
+        self.secret_manager = SecretManager(self.client)
         
         print(f"已认证用户: {self.client.username}\n")
     
@@ -34,13 +68,42 @@ class CommandHandler:
     def handle_fork_repo(self, args):
         self.repo_manager.fork(
             args.owner,
-            args.repo_name
+            args.repo_name,
+            wait=args.wait,
+            timeout=args.timeout
         )
     
     def handle_list_repos(self, args):
         """处理列出仓库命令"""
         self.repo_manager.list(args.visibility)
     
+    def handle_apply_repos(self, args):
+        """处理按清单批量管理仓库命令"""
+        manifest = load_manifest(args.manifest)
+        actions = self.provision_manager.plan(manifest)
+        
+        if not actions:
+            print("✓ 所有仓库已符合清单，无需变更")
+            return
+        
+        print(f"计划执行 {len(actions)} 个操作:")
+        for action in actions:
+            detail = action.get("changes") or ""
+            print(f"  {action['action']:<7} {action['name']} {detail}")
+        if args.dry_run:
+            return
+        
+        deletes = [a["name"] for a in actions if a["action"] == "delete"]
+        if deletes and not args.yes:
+            confirm = input(f"确定要删除 {len(deletes)} 个仓库吗? (yes/no): ")
+            if confirm.lower() != "yes":
+                print("已取消")
+                return
+        
+        self.client.set_write_rate(args.rate)
+        self.provision_manager.apply(actions, max_workers=args.workers,
+                                     wait_forks=not args.no_wait, timeout=args.timeout)
+    
     def handle_create_file(self, args):
         """处理创建文件命令"""
         self.file_manager.create(
@@ -51,19 +114,502 @@ class CommandHandler:
             args.branch
         )
     
+    def handle_create_branch(self, args):
+        """处理创建分支命令"""
+        self.branch_manager.create(args.repo, args.branch, args.from_branch)
+    
+    def handle_list_branches(self, args):
+        """处理列出分支命令"""
+        self.branch_manager.list(args.repo)
+    
+    def handle_create_branches(self, args):
+        """处理批量创建分支命令"""
+        items = list(args.pairs)
+        if args.file:
+            with open(args.file, "r", encoding="utf-8") as f:
+                items.extend(
+                    line.strip() for line in f
+                    if line.strip() and not line.startswith("#")
+                )
+        
+        pairs = []
+        for item in items:
+            repo, sep, branch = item.partition(":")
+            if not sep or not repo or not branch:
+                raise GitHubManagerError(f"格式应为 仓库名:分支名: {item}")
+            pairs.append((repo, branch))
+        if not pairs:
+            raise GitHubManagerError("请指定要创建的分支或使用 --file")
+        
+        self.client.set_write_rate(args.rate)
+        self.branch_manager.create_many(
+            pairs,
+            from_branch=args.from_branch,
+            max_workers=args.workers
+        )
+    
+    def handle_stale_branches(self, args):
+        """处理过期分支分析命令"""
+        report = self.branch_manager.analyze(
+            args.repo,
+            stale_days=args.days,
+            max_workers=args.workers
+        )
+        if not args.delete_merged:
+            return
+        
+        merged = [b["name"] for b in report
+                  if b["state"] == "merged" and not b["protected"]]
+        if not merged:
+            print("没有可删除的已合并分支")
+            return
+        if not args.yes:
+            confirm = input(f"确定要删除 {len(merged)} 个已合并分支吗? (yes/no): ")
+            if confirm.lower() != "yes":
+                print("已取消")
+                return
+        self.client.set_write_rate(args.rate)
+        self.branch_manager.delete_many(args.repo, merged, max_workers=args.workers)
+    
+    def handle_create_issue(self, args):
+        """处理创建 Issue 命令"""
+        self.issue_pr_manager.create_issue(args.repo, args.title, args.body, args.labels)
+    
+    def handle_create_pr(self, args):
+        """处理创建 Pull Request 命令"""
+        self.issue_pr_manager.create_pull_request(
+            args.repo,
+            args.title,
+            args.head,
+            args.base,
+            args.body
+        )
+    
+    def handle_import_issues(self, args):
+        """处理批量导入 Issue 命令"""
+        self.client.set_write_rate(args.rate)
+        self.issue_pr_manager.import_issues(args.repo, args.source, restart=args.restart)
+    
+    def handle_issues(self, args):
+        """处理 Issue/PR 本地镜像命令"""
+        if args.issues_command == "sync" or args.sync:
+            self.issue_pr_manager.sync(args.repo)
+        if args.issues_command == "list":
+            self.issue_pr_manager.query(
+                args.repo,
+                state=args.state,
+                kind=args.kind,
+                label=args.label,
+                author=args.author,
+                assignee=args.assignee,
+                search=args.search,
+                updated_since=args.since,
+                limit=args.limit or None
+            )
+    
+    def handle_add_collaborator(self, args):
+        """处理添加协作者命令"""
+        self.collaborator_manager.add(args.repo, args.username, args.permission)
+    
+    def handle_list_collaborators(self, args):
+        """处理列出协作者命令"""
+        self.collaborator_manager.list(args.repo)
+    
+    def handle_remove_collaborator(self, args):
+        """处理移除协作者命令"""
+        self.collaborator_manager.remove(args.repo, args.username)
+    
+    def handle_reconcile_access(self, args):
+        """处理按策略同步协作者权限命令"""
+        policy = load_manifest(args.policy)
+        desired, prune = self.collaborator_manager.resolve_policy(policy)
+        if args.prune:
+            prune = {repo: True for repo in desired}
+        
+        changes = self.collaborator_manager.plan_access(
+            desired, prune, max_workers=args.workers
+        )
+        if not changes:
+            print(f"✓ {len(desired)} 个仓库的权限均符合策略，无需变更")
+            return
+        
+        print(f"\n计划执行 {len(changes)} 个变更（涉及 {len(desired)} 个仓库）:")
+        for change in changes:
+            detail = f"{change.get('from', '-')} -> {change.get('permission', '-')}"
+            print(f"  {change['action']:<18} {change['repo']:<30} {change['user']:<20} {detail}")
+        if args.dry_run:
+            return
+        
+        removals = [c for c in changes if c["action"] in ("remove", "cancel-invitation")]
+        if removals and not args.yes:
+            confirm = input(f"确定要移除 {len(removals)} 个协作者/邀请吗? (yes/no): ")
+            if confirm.lower() != "yes":
+                print("已取消")
+                return
+        self.client.set_write_rate(args.rate)
+        self.collaborator_manager.apply_access(changes, max_workers=args.workers)
+    
+    def handle_set_secret(self, args):
+        """处理批量设置 secret 命令"""
+        import getpass
+        repos = self.repo_manager.select(args.repos)
+        if not repos:
+            print(f"没有匹配的仓库: {args.repos}")
+            return
+        print(f"匹配 {len(repos)} 个仓库")
+        if args.dry_run:
+            for repo in repos:
+                print(f"  {repo['full_name']}")
+            return
+        
+        if args.value_file:
+            with open(args.value_file, "r", encoding="utf-8") as f:
+                value = f.read()
+        elif sys.stdin.isatty():
+            value = getpass.getpass(f"{args.name} 的值: ")
+        else:
+            value = sys.stdin.read()
+        if value.endswith("\n"):
+            value = value[:-1]
+        if not value:
+            print("✗ secret 值为空")
+            return
+        
+        if not args.yes and sys.stdin.isatty():
+            confirm = input(f"确定要在 {len(repos)} 个仓库中设置 {args.name} 吗? (yes/no): ")
+            if confirm.lower() != "yes":
+                print("已取消")
+                return
+        self.client.set_write_rate(args.rate)
+        report = self.secret_manager.set_secret(
+            args.name,
+            value,
+            repos,
+            max_workers=args.workers,
+            verify=not args.no_verify
+        )
+        if any(not entry["ok"] or entry["verified"] is False for entry in report):
+            sys.exit(1)
+    
+    def handle_audit_access(self, args):
+        """处理权限审计命令"""
+        if args.offline:
+            matrix = self.audit_manager.latest()
+            if matrix is None:
+                raise GitHubManagerError("没有本地快照，请先不带 --offline 运行一次")
+        else:
+            matrix = self.audit_manager.snapshot(
+                affiliation=args.affiliation, max_workers=args.workers
+            )
+        
+        min_level = LEVEL_CODES[args.min_permission]
+        if args.user:
+            self.audit_manager.print_user(matrix, args.user, min_level)
+        if args.repo:
+            self.audit_manager.print_repo(matrix, args.repo, min_level)
+        if args.diff is not None:
+            previous = self.audit_manager.baseline(matrix, days=args.diff)
+            if previous is None:
+                print("没有更早的快照可供对比")
+            else:
+                self.audit_manager.print_diff(matrix.diff(previous), previous)
+        if not (args.user or args.repo or args.diff is not None):
+            self.audit_manager.print_summary(matrix, min_level)
+    
+    def handle_list_commits(self, args):
+        """处理列出提交历史命令"""
+        if args.all or args.offline:
+            self.commit_manager.history(
+                args.repo,
+                args.branch,
+                limit=args.limit if not args.all else None,
+                refresh=not args.offline
+            )
+        else:
+            self.commit_manager.list(args.repo, args.branch, args.limit)
+    
     def handle_list_workflows(self, args):
         """处理列出 workflows 命令"""
         self.workflow_manager.list_workflows(args.repo)
     
+    def handle_get_run(self, args):
+        """处理获取运行详情命令"""
+        self.workflow_manager.get_run(args.repo, args.run_id)
+    
+    def handle_watch_run(self, args):
+        """处理跟踪运行命令，以运行结论作为退出码"""
+        run = self.workflow_manager.watch_run(
+            args.repo,
+            args.run_id,
+            interval=args.interval,
+            max_interval=args.max_interval,
+            timeout=args.timeout
+        )
+        sys.exit(CONCLUSION_EXIT_CODES.get(run.get("conclusion"), 1))
+    
+    def handle_get_logs(self, args):
+        """处理下载日志命令"""
+        self.workflow_manager.get_logs(
+            args.repo,
+            args.run_id,
+            output=args.output,
+            only=args.only,
+            extract_dir=args.extract_dir
+        )
+    
+    def handle_list_artifacts(self, args):
+        """处理列出构建产物命令"""
+        self.workflow_manager.list_artifacts(args.repo, args.run_id, args.name)
+    
+    def handle_get_artifacts(self, args):
+        """处理下载构建产物命令"""
+        self.workflow_manager.get_artifacts(
+            args.repo,
+            args.run_ids,
+            patterns=args.name,
+            output_dir=args.output,
+            extract=args.extract,
+            max_workers=args.workers
+        )
+    
+    def handle_list_jobs(self, args):
+        """处理列出 Jobs 命令"""
+        self.workflow_manager.list_jobs(args.repo, args.run_id)
+    
+    def handle_logs(self, args):
+        """处理失败日志与日志搜索命令"""
+        if args.logs_command == "failures":
+            self.log_manager.failures(args.repo, args.run_id, tail=args.tail)
+        elif args.logs_command == "search":
+            self.log_manager.search(args.repo, args.pattern, last=args.last, limit=args.limit)
+    
+    def handle_enable_workflow(self, args):
+        """处理启用 workflow 命令"""
+        self.workflow_manager.set_state(args.repo, args.workflow_id, enabled=True)
+    
+    def handle_disable_workflow(self, args):
+        """处理禁用 workflow 命令"""
+        self.workflow_manager.set_state(args.repo, args.workflow_id, enabled=False)
+    
+    def handle_workflows(self, args):
+        """处理跨仓库批量管理 workflow 命令"""
+        if args.workflows_command == "set-state":
+            repos = self.repo_manager.select(args.repos)
+            if not repos:
+                print(f"没有匹配的仓库: {args.repos}")
+                return
+            print(f"匹配 {len(repos)} 个仓库")
+            self.client.set_write_rate(args.rate)
+            result = self.workflow_manager.bulk_set_state(
+                repos,
+                args.name,
+                enabled=args.state == "enabled",
+                max_workers=args.workers,
+                refresh=args.refresh,
+                dry_run=args.dry_run
+            )
+            if result["failed"]:
+                sys.exit(1)
+    
+    def handle_caches(self, args):
+        """处理 Actions 缓存命令"""
+        if args.caches_command == "list":
+            self.workflow_manager.list_caches(args.repo, key=args.key, ref=args.ref)
+        elif args.caches_command == "usage":
+            self.workflow_manager.cache_usage(
+                args.repo,
+                by=args.by,
+                depth=args.depth,
+                top=args.top,
+                offline=args.offline
+            )
+        elif args.caches_command == "evict":
+            if not args.dry_run and not args.yes:
+                confirm = input(f"确定要删除 {args.repo} 中符合条件的缓存吗? (yes/no): ")
+                if confirm.lower() != "yes":
+                    print("已取消")
+                    return
+            self.client.set_write_rate(args.rate)
+            self.workflow_manager.evict_caches(
+                args.repo,
+                prefix=args.prefix,
+                ref=args.ref,
+                older_than=parse_duration(args.older_than) if args.older_than else None,
+                dry_run=args.dry_run,
+                max_workers=args.workers
+            )
+    
+    def handle_rerun(self, args):
+        """处理重新运行命令"""
+        self.workflow_manager.rerun(args.repo, args.run_id, failed_only=args.failed_only)
+    
+    def handle_auto_rerun(self, args):
+        """处理自动重试 flaky 失败命令"""
+        self.auto_rerun_manager.watch(
+            args.repos,
+            jobs=args.jobs,
+            workflows=args.workflows,
+            max_attempts=args.max_attempts,
+            max_calls=args.max_calls,
+            max_minutes=args.max_minutes,
+            interval=args.interval,
+            max_interval=args.max_interval,
+            duration=parse_duration(args.duration) if args.duration else 0
+        )
+    
+    def handle_delete_run(self, args):
+        """处理删除运行记录命令"""
+        self.workflow_manager.delete_run(args.repo, args.run_id)
+    
+    def handle_prune_runs(self, args):
+        """处理按保留策略批量删除运行记录命令"""
+        if not args.dry_run and not args.yes:
+            confirm = input(f"确定要永久删除 {args.repo} 中早于 {args.older_than} 的运行记录吗? (yes/no): ")
+            if confirm.lower() != "yes":
+                print("已取消")
+                return
+        self.client.set_write_rate(args.rate)
+        self.workflow_manager.prune_runs(
+            args.repo,
+            parse_duration(args.older_than),
+            keep_last=args.keep_last,
+            status=args.status or None,
+            workflow_id=args.workflow,
+            dry_run=args.dry_run,
+            max_workers=args.workers,
+            restart=args.restart
+        )
+    
     def handle_trigger_workflow(self, args):
         """处理触发 workflow 命令"""
         import json
         inputs = None
         if args.inputs:
             inputs = json.loads(args.inputs)
-        self.workflow_manager.trigger(
+        if not args.wait:
+            self.workflow_manager.trigger(
+                args.repo,
+                args.workflow_id,
+                args.ref,
+                inputs
+            )
+            return
+        
+        run = self.workflow_manager.trigger_and_find(
             args.repo,
             args.workflow_id,
             args.ref,
-            inputs
+            inputs,
+            correlation_input=args.correlation_input or None
+        )
+        run = self.workflow_manager.watch_run(args.repo, run["id"], timeout=args.timeout)
+        print(f"run_id={run['id']} conclusion={run.get('conclusion')}")
+        sys.exit(CONCLUSION_EXIT_CODES.get(run.get("conclusion"), 1))
+    
+    def handle_orchestrate(self, args):
+        """处理编排 Workflow DAG 命令"""
+        nodes = self.orchestration_manager.load_plan(load_manifest(args.plan))
+        stages = self.orchestration_manager.stages(nodes)
+        print(f"计划包含 {len(nodes)} 个节点，{len(stages)} 层:")
+        for level, stage in enumerate(stages, 1):
+            print(f"  {level}. " + ", ".join(
+                f"{name} ({nodes[name]['repo']}/{nodes[name]['workflow']})" for name in stage
+            ))
+        if args.dry_run:
+            return
+        
+        states = self.orchestration_manager.run(
+            nodes,
+            interval=args.interval,
+            max_interval=args.max_interval
+        )
+        if any(state["state"] != "success" for state in states.values()):
+            sys.exit(1)
+    
+    def handle_export(self, args):
+        """处理列式导出命令"""
+        if args.kind == "commits":
+            self.export_manager.export_commits(
+                args.repo,
+                args.output,
+                branch=args.branch or "main",
+                limit=args.limit,
+                fmt=args.format
+            )
+        else:
+            export = (self.export_manager.export_runs if args.kind == "runs"
+                      else self.export_manager.export_jobs)
+            export(
+                args.repo,
+                args.output,
+                workflow_id=args.workflow,
+                status=args.status,
+                branch=args.branch,
+                limit=args.limit,
+                fmt=args.format
+            )
+    
+    def handle_actions_stats(self, args):
+        """处理 Workflow 统计命令"""
+        if not args.offline:
+            self.stats_manager.sync(
+                args.repo,
+                max_runs=args.runs,
+                max_workers=args.workers,
+                fmt=args.format
+            )
+        self.stats_manager.stats(args.repo, last=args.runs, workflow=args.workflow)
+    
+    def handle_profile_run(self, args):
+        """处理运行耗时剖析命令"""
+        self.profile_manager.profile(
+            args.repo,
+            args.run_id,
+            top_steps=args.top,
+            trace_file=args.trace
+        )
+    
+    def handle_dashboard(self, args):
+        """处理多仓库 Actions 看板命令"""
+        try:
+            self.dashboard_manager.show(
+                args.repos,
+                max_workers=args.workers,
+                refresh=args.watch,
+                failing_only=args.failing
+            )
+        except KeyboardInterrupt:
+            print("\n已退出")
+    
+    def handle_campaign(self, args):
+        """处理多仓库批量修改命令"""
+        import re
+        if args.content_from:
+            with open(args.content_from, "r", encoding="utf-8") as f:
+                content = f.read()
+            transform = lambda current: content
+        else:
+            pattern = re.compile(args.replace[0], re.MULTILINE)
+            replacement = args.replace[1]
+            transform = lambda current: (
+                pattern.sub(replacement, current) if current is not None else None
+            )
+        
+        repos = self.repo_manager.select(args.repos)
+        if not repos:
+            print(f"没有匹配的仓库: {args.repos}")
+            return
+        print(f"匹配 {len(repos)} 个仓库")
+        
+        self.client.set_write_rate(args.rate)
+        self.campaign_manager.run(
+            repos,
+            args.path,
+            transform,
+            branch=args.branch,
+            title=args.title,
+            message=args.message,
+            body=args.body,
+            max_workers=args.workers,
+            dry_run=args.dry_run
         )
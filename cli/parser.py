@@ -12,8 +12,10 @@ def create_parser():
   %(prog)s create-repo my-project --description "我的项目" --private
   %(prog)s delete-repo my-project
   %(prog)s fork-repo some-owner some-repo
+  %(prog)s fork-repo some-owner some-repo --wait --timeout 120
   %(prog)s list-repos --visibility public
   %(prog)s repo-info my-project
+  %(prog)s apply-repos repos.yaml --workers 4 --rate 1 --dry-run
   
   # 文件操作
   %(prog)s create-file my-repo README.md "# Hello World" -m "Initial commit"
@@ -23,32 +25,68 @@ def create_parser():
   # 分支管理
   %(prog)s create-branch my-repo feature-branch --from main
   %(prog)s list-branches my-repo
+  %(prog)s create-branches repo-a:release-1.2 repo-b:release-1.2 --from main
+  %(prog)s stale-branches my-repo --days 60 --delete-merged
   
   # Issue 和 PR
   %(prog)s create-issue my-repo "Bug报告" --body "发现一个bug"
   %(prog)s create-pr my-repo "新功能" feature-branch main --body "添加新功能"
+  %(prog)s import-issues my-repo issues.jsonl --rate 0.5
+  %(prog)s issues sync my-repo
+  %(prog)s issues list my-repo --type pr --label bug --state open
   
   # 协作者管理
   %(prog)s add-collaborator my-repo username --permission push
   %(prog)s list-collaborators my-repo
   %(prog)s remove-collaborator my-repo username
+  %(prog)s reconcile-access access.yaml --dry-run
+  %(prog)s audit-access --user alice --min-permission admin
+  %(prog)s audit-access --offline --diff
+  
+  # Secrets
+  printf '%%s' "$TOKEN" | %(prog)s set-secret NPM_TOKEN --repos "svc-*" --rate 2
   
   # 提交历史
   %(prog)s list-commits my-repo --branch main --limit 20
+  %(prog)s list-commits my-repo --branch main --all
   
   # Workflow 管理
   %(prog)s list-workflows my-repo
   %(prog)s get-workflow my-repo 12345678
   %(prog)s list-runs my-repo --status completed --limit 5
   %(prog)s get-run my-repo 9876543210
+  %(prog)s watch-run my-repo 9876543210
   %(prog)s trigger-workflow my-repo ci.yml --ref main
+  %(prog)s trigger-workflow my-repo deploy.yml --ref main --wait
+  %(prog)s orchestrate release-plan.yaml --dry-run
   %(prog)s cancel-run my-repo 9876543210
   %(prog)s rerun my-repo 9876543210 --failed-only
+  %(prog)s auto-rerun --repos "svc-*" --jobs "integration-*" --max-attempts 2 --max-minutes 120
   %(prog)s list-jobs my-repo 9876543210
   %(prog)s get-logs my-repo 9876543210 --output logs.zip
+  %(prog)s get-logs my-repo 9876543210 --only "build/*"
+  %(prog)s list-artifacts my-repo --run 9876543210
+  %(prog)s get-artifacts my-repo 9876543210 9876543211 --name "dist-*" --extract
+  %(prog)s caches usage my-repo --by prefix
+  %(prog)s caches evict my-repo --ref refs/pull/42/merge --dry-run
+  %(prog)s logs failures my-repo 9876543210
+  %(prog)s logs search my-repo "connection refused" --last 200
   %(prog)s delete-run my-repo 9876543210
+  %(prog)s prune-runs my-repo --older-than 30d --keep-last 50 --dry-run
   %(prog)s enable-workflow my-repo ci.yml
   %(prog)s disable-workflow my-repo ci.yml
+  %(prog)s workflows set-state --name deploy.yml --state disabled --repos "team-*"
+  
+  # 数据导出
+  %(prog)s export runs my-repo -o runs.parquet
+  %(prog)s export jobs my-repo --limit 500 -o jobs --format npy
+  %(prog)s actions-stats my-repo --runs 5000
+  %(prog)s profile-run my-repo 9876543210 --trace trace.json
+  %(prog)s dashboard --repos "team-*" --watch 30
+  
+  # 多仓库批量修改
+  %(prog)s campaign --repos 'team-*' --file .github/CODEOWNERS --content-from CODEOWNERS \\
+      --branch chore/codeowners --title "Add CODEOWNERS"
 
 更多信息请访问: https://docs.github.com/en/rest
         """
@@ -71,8 +109,12 @@ def create_parser():
     _add_branch_commands(subparsers)
     _add_issue_pr_commands(subparsers)
     _add_collaborator_commands(subparsers)
+    _add_secret_commands(subparsers)
     _add_commit_commands(subparsers)
     _add_workflow_commands(subparsers)
+    _add_export_commands(subparsers)
+    _add_stats_commands(subparsers)
+    _add_campaign_commands(subparsers)
     
     return parser
 
@@ -119,6 +161,17 @@ def _add_repository_commands(subparsers):
     )
     fork_repo.add_argument("owner", help="要 Fork 的仓库的拥有者")
     fork_repo.add_argument("repo_name", help="要 Fork 的仓库名称")
+    fork_repo.add_argument(
+        "--wait",
+        action="store_true",
+        help="等待 Fork 完成（git refs 可用）后再返回"
+    )
+    fork_repo.add_argument(
+        "--timeout",
+        type=float,
+        default=300,
+        help="等待超时时间，秒（默认: 300）"
+    )
     
     # 列出仓库
     list_repos = subparsers.add_parser(
@@ -140,6 +193,47 @@ def _add_repository_commands(subparsers):
         description="显示仓库的详细信息，包括统计数据"
     )
     repo_info.add_argument("repo", help="仓库名称")
+    
+    # 按清单批量管理仓库
+    apply_repos = subparsers.add_parser(
+        "apply-repos",
+        help="按清单批量创建/更新/删除仓库",
+        description="对比清单 (YAML/JSON) 与现有仓库，只执行需要的创建、更新、Fork 和删除操作"
+    )
+    apply_repos.add_argument("manifest", help="清单文件路径（如: repos.yaml）")
+    apply_repos.add_argument(
+        "--workers",
+        type=int,
+        default=4,
+        help="并发工作线程数（默认: 4）"
+    )
+    apply_repos.add_argument(
+        "--rate",
+        type=float,
+        default=1.0,
+        help="写请求速率上限，次/秒（默认: 1，避免触发 secondary rate limit）"
+    )
+    apply_repos.add_argument(
+        "--dry-run",
+        action="store_true",
+        help="只显示将要执行的操作，不实际执行"
+    )
+    apply_repos.add_argument(
+        "--yes", "-y",
+        action="store_true",
+        help="跳过删除操作的确认"
+    )
+    apply_repos.add_argument(
+        "--no-wait",
+        action="store_true",
+        help="不等待新建的 Fork 就绪"
+    )
+    apply_repos.add_argument(
+        "--timeout",
+        type=float,
+        default=300,
+        help="等待 Fork 就绪的超时时间，秒（默认: 300）"
+    )
 
 
 def _add_file_commands(subparsers):
@@ -225,6 +319,77 @@ def _add_branch_commands(subparsers):
         description="显示仓库的所有分支"
     )
     list_branches.add_argument("repo", help="仓库名称")
+    
+    # 批量创建分支
+    create_branches = subparsers.add_parser(
+        "create-branches",
+        help="批量创建分支",
+        description="在多个仓库中批量创建分支，每个仓库的源分支只解析一次，并发创建"
+    )
+    create_branches.add_argument(
+        "pairs",
+        nargs="*",
+        metavar="REPO:BRANCH",
+        help="要创建的分支，格式为 仓库名:分支名"
+    )
+    create_branches.add_argument(
+        "--file", "-f",
+        help="从文件读取，每行一个 仓库名:分支名（# 开头为注释）"
+    )
+    create_branches.add_argument(
+        "--from",
+        dest="from_branch",
+        default="main",
+        help="基于哪个分支创建（默认: main）"
+    )
+    create_branches.add_argument(
+        "--workers",
+        type=int,
+        default=8,
+        help="并发工作线程数（默认: 8）"
+    )
+    create_branches.add_argument(
+        "--rate",
+        type=float,
+        default=10.0,
+        help="每秒最多创建请求数（默认: 10，0 表示不限）"
+    )
+    
+    # 分析过期分支
+    stale_branches = subparsers.add_parser(
+        "stale-branches",
+        help="分析已合并和过期的分支",
+        description="并发比较所有分支与默认分支，显示领先/落后提交数和最后提交时间"
+    )
+    stale_branches.add_argument("repo", help="仓库名称")
+    stale_branches.add_argument(
+        "--days",
+        type=int,
+        default=90,
+        help="最后提交早于多少天视为过期（默认: 90）"
+    )
+    stale_branches.add_argument(
+        "--workers",
+        type=int,
+        default=8,
+        help="并发 compare 请求数（默认: 8）"
+    )
+    stale_branches.add_argument(
+        "--delete-merged",
+        action="store_true",
+        help="批量删除已合并到默认分支的分支（跳过受保护分支）"
+    )
+    stale_branches.add_argument(
+        "--yes", "-y",
+        action="store_true",
+        help="跳过删除确认"
+    )
+    stale_branches.add_argument(
+        "--rate",
+        type=float,
+        default=10.0,
+        help="--delete-merged 每秒最多删除请求数（默认: 10，0 表示不限）"
+    )
 
 
 def _add_issue_pr_commands(subparsers):
@@ -264,6 +429,88 @@ def _add_issue_pr_commands(subparsers):
         default="",
         help="PR 描述"
     )
+    
+    # 批量导入 Issue
+    import_issues = subparsers.add_parser(
+        "import-issues",
+        help="从 JSONL/CSV 批量导入 Issue",
+        description="按顺序逐条创建 Issue，按速率上限和 Retry-After 自动限速，"
+                    "支持中断后从检查点继续"
+    )
+    import_issues.add_argument("repo", help="仓库名称")
+    import_issues.add_argument(
+        "source",
+        help="数据文件（.jsonl 或 .csv，字段: title, body, labels, assignees, milestone）"
+    )
+    import_issues.add_argument(
+        "--rate",
+        type=float,
+        default=1.0,
+        help="创建速率上限，次/秒（默认: 1，GitHub 建议的内容创建间隔）"
+    )
+    import_issues.add_argument(
+        "--restart",
+        action="store_true",
+        help="忽略检查点，从第一条重新导入"
+    )
+    
+    # Issue / PR 本地镜像
+    issues = subparsers.add_parser(
+        "issues",
+        help="Issue/PR 本地镜像（同步与离线查询）",
+        description="将 Issue、PR 和评论增量同步到本地，查询时不再访问 API"
+    )
+    issues_commands = issues.add_subparsers(
+        dest="issues_command",
+        metavar="ACTION",
+        required=True
+    )
+    
+    issues_sync = issues_commands.add_parser(
+        "sync",
+        help="增量同步到本地镜像",
+        description="使用 since 和 ETag 增量同步，无变化时只消耗一次 304 请求"
+    )
+    issues_sync.add_argument("repo", help="仓库名称")
+    
+    issues_list = issues_commands.add_parser(
+        "list",
+        help="查询本地镜像",
+        description="按条件过滤本地镜像中的 Issue/PR"
+    )
+    issues_list.add_argument("repo", help="仓库名称")
+    issues_list.add_argument(
+        "--state",
+        choices=["open", "closed", "all"],
+        default="open",
+        help="状态过滤（默认: open）"
+    )
+    issues_list.add_argument(
+        "--type",
+        dest="kind",
+        choices=["issue", "pr", "all"],
+        default="all",
+        help="类型过滤（默认: all）"
+    )
+    issues_list.add_argument("--label", help="标签过滤")
+    issues_list.add_argument("--author", help="作者过滤")
+    issues_list.add_argument("--assignee", help="负责人过滤")
+    issues_list.add_argument("--search", help="标题或内容包含的文本")
+    issues_list.add_argument(
+        "--since",
+        help="只显示此时间之后更新的（ISO 8601，如: 2024-01-01）"
+    )
+    issues_list.add_argument(
+        "--limit",
+        type=int,
+        default=50,
+        help="显示数量（默认: 50，0 表示全部）"
+    )
+    issues_list.add_argument(
+        "--sync",
+        action="store_true",
+        help="查询前先增量同步"
+    )
 
 
 def _add_collaborator_commands(subparsers):
@@ -305,6 +552,128 @@ def _add_collaborator_commands(subparsers):
     )
     remove_collab.add_argument("repo", help="仓库名称")
     remove_collab.add_argument("username", help="要移除的 GitHub 用户名")
+    
+    # 按策略同步协作者权限
+    reconcile = subparsers.add_parser(
+        "reconcile-access",
+        help="按策略文件同步多个仓库的协作者权限",
+        description="并发读取所有仓库的协作者和待接受邀请，计算最小差异，只执行必要的 PUT/PATCH/DELETE"
+    )
+    reconcile.add_argument("policy", help="策略文件路径（YAML/JSON）")
+    reconcile.add_argument(
+        "--prune",
+        action="store_true",
+        help="移除策略之外的协作者和邀请（覆盖策略文件中的 prune 设置）"
+    )
+    reconcile.add_argument(
+        "--workers",
+        type=int,
+        default=8,
+        help="并发数（默认: 8）"
+    )
+    reconcile.add_argument(
+        "--rate",
+        type=float,
+        default=1.0,
+        help="写请求速率上限，次/秒（默认: 1，避免触发 secondary rate limit）"
+    )
+    reconcile.add_argument(
+        "--dry-run",
+        action="store_true",
+        help="只显示变更计划，不执行"
+    )
+    reconcile.add_argument(
+        "--yes", "-y",
+        action="store_true",
+        help="跳过移除操作的确认"
+    )
+    
+    # 跨仓库权限审计
+    audit = subparsers.add_parser(
+        "audit-access",
+        help="生成所有可访问仓库的 仓库×用户 权限矩阵，并支持查询和对比",
+        description="并发读取协作者生成权限矩阵快照（ETag 缓存，未变化的仓库只消耗 304），"
+                    "可按用户/仓库查询，或与一周前的快照对比"
+    )
+    audit.add_argument(
+        "--offline",
+        action="store_true",
+        help="使用最近一次快照，不访问 API"
+    )
+    audit.add_argument("--user", help="列出该用户拥有权限的仓库")
+    audit.add_argument("--repo", help="列出该仓库（owner/name）中的用户")
+    audit.add_argument(
+        "--min-permission",
+        choices=["pull", "triage", "push", "maintain", "admin"],
+        default="admin",
+        help="最低权限级别（默认: admin）"
+    )
+    audit.add_argument(
+        "--diff",
+        nargs="?",
+        type=float,
+        const=7,
+        metavar="DAYS",
+        help="与至少 DAYS 天前的快照对比（默认: 7）"
+    )
+    audit.add_argument(
+        "--affiliation",
+        default="owner,collaborator,organization_member",
+        help="仓库范围（默认: owner,collaborator,organization_member）"
+    )
+    audit.add_argument(
+        "--workers",
+        type=int,
+        default=8,
+        help="并发数（默认: 8）"
+    )
+
+
+def _add_secret_commands(subparsers):
+    """添加 Actions secrets 相关命令"""
+    
+    set_secret = subparsers.add_parser(
+        "set-secret",
+        help="批量设置 Actions secret",
+        description="用各仓库的公钥在本地加密后并发写入同一个 secret，并回读校验（需要 PyNaCl）"
+    )
+    set_secret.add_argument("name", help="secret 名称")
+    set_secret.add_argument(
+        "--repos",
+        required=True,
+        help="仓库选择器，逗号分隔的通配符，! 开头表示排除"
+    )
+    set_secret.add_argument(
+        "--value-file",
+        help="从文件读取 secret 值（默认从标准输入读取，终端中交互输入）"
+    )
+    set_secret.add_argument(
+        "--workers",
+        type=int,
+        default=8,
+        help="并发数（默认: 8）"
+    )
+    set_secret.add_argument(
+        "--rate",
+        type=float,
+        default=1.0,
+        help="每秒最多写请求数（默认: 1）"
+    )
+    set_secret.add_argument(
+        "--no-verify",
+        action="store_true",
+        help="跳过回读校验"
+    )
+    set_secret.add_argument(
+        "--dry-run",
+        action="store_true",
+        help="只列出匹配的仓库"
+    )
+    set_secret.add_argument(
+        "--yes", "-y",
+        action="store_true",
+        help="跳过确认"
+    )
 
 
 def _add_commit_commands(subparsers):
@@ -328,6 +697,16 @@ def _add_commit_commands(subparsers):
         default=10,
         help="显示数量（默认: 10）"
     )
+    list_commits.add_argument(
+        "--all",
+        action="store_true",
+        help="增量同步到本地缓存并显示完整历史（可与 --limit 同时使用）"
+    )
+    list_commits.add_argument(
+        "--offline",
+        action="store_true",
+        help="只读取本地缓存的历史，不访问 API"
+    )
 
 
 def _add_workflow_commands(subparsers):
@@ -389,6 +768,34 @@ def _add_workflow_commands(subparsers):
     get_run.add_argument("repo", help="仓库名称")
     get_run.add_argument("run_id", type=int, help="运行 ID")
     
+    # 跟踪运行
+    watch_run = subparsers.add_parser(
+        "watch-run",
+        help="实时跟踪运行状态",
+        description="持续跟踪 Workflow 运行，只输出变化的 job 和步骤，退出码反映运行结论"
+                    "（success=0, failure=1, cancelled=2, timed_out=3）"
+    )
+    watch_run.add_argument("repo", help="仓库名称")
+    watch_run.add_argument("run_id", type=int, help="运行 ID")
+    watch_run.add_argument(
+        "--interval",
+        type=float,
+        default=2.0,
+        help="最短轮询间隔，秒（默认: 2）"
+    )
+    watch_run.add_argument(
+        "--max-interval",
+        type=float,
+        default=30.0,
+        help="最长轮询间隔，秒（默认: 30）"
+    )
+    watch_run.add_argument(
+        "--timeout",
+        type=float,
+        default=0,
+        help="超时时间，秒（默认: 0，不超时）"
+    )
+    
     # 触发 Workflow
     trigger_workflow = subparsers.add_parser(
         "trigger-workflow",
@@ -410,6 +817,48 @@ def _add_workflow_commands(subparsers):
         "--inputs",
         help='输入参数（JSON 格式），如: \'{"environment":"production"}\''
     )
+    trigger_workflow.add_argument(
+        "--wait",
+        action="store_true",
+        help="等待本次触发的运行结束，退出码反映运行结论"
+    )
+    trigger_workflow.add_argument(
+        "--correlation-input",
+        default="correlation_id",
+        help="用于关联运行的 workflow 输入名（默认: correlation_id，"
+             "workflow 需声明该输入并建议在 run-name 中引用；传空字符串则不使用）"
+    )
+    trigger_workflow.add_argument(
+        "--timeout",
+        type=float,
+        default=0,
+        help="等待运行结束的超时时间，秒（默认: 0，不超时）"
+    )
+    
+    # 编排跨仓库 Workflow
+    orchestrate = subparsers.add_parser(
+        "orchestrate",
+        help="按计划文件编排跨仓库的 Workflow DAG",
+        description="依赖成功即触发下游 workflow，独立分支并行，所有在途运行由一个轮询器跟踪"
+    )
+    orchestrate.add_argument("plan", help="计划文件路径（如: plan.yaml）")
+    orchestrate.add_argument(
+        "--interval",
+        type=float,
+        default=2.0,
+        help="有变化时的轮询间隔，秒（默认: 2）"
+    )
+    orchestrate.add_argument(
+        "--max-interval",
+        type=float,
+        default=30.0,
+        help="无变化时退避的最大轮询间隔，秒（默认: 30）"
+    )
+    orchestrate.add_argument(
+        "--dry-run",
+        action="store_true",
+        help="只输出执行顺序，不触发"
+    )
     
     # 取消运行
     cancel_run = subparsers.add_parser(
@@ -434,6 +883,64 @@ def _add_workflow_commands(subparsers):
         help="只重新运行失败的 jobs"
     )
     
+    # 自动重试 flaky 失败
+    auto_rerun = subparsers.add_parser(
+        "auto-rerun",
+        help="自动重新运行 flaky 的失败 jobs",
+        description="监视多个仓库的失败运行，失败 job 全部匹配 --jobs 时调用 rerun-failed-jobs，"
+                    "按每小时 API 调用数和 runner 分钟数限额"
+    )
+    auto_rerun.add_argument(
+        "--repos",
+        default="*",
+        help="仓库选择器，逗号分隔的通配符，! 开头表示排除（默认: 全部）"
+    )
+    auto_rerun.add_argument(
+        "--jobs",
+        default="*",
+        help="可重试的 job 名称，逗号分隔的通配符（如: 'integration-*'，默认: 全部）"
+    )
+    auto_rerun.add_argument(
+        "--workflows",
+        default="*",
+        help="监视的 workflow 名称，逗号分隔的通配符（默认: 全部）"
+    )
+    auto_rerun.add_argument(
+        "--max-attempts",
+        type=int,
+        default=2,
+        help="每个运行最多重试次数（默认: 2）"
+    )
+    auto_rerun.add_argument(
+        "--max-calls",
+        type=int,
+        default=1000,
+        help="每小时最多 API 调用数（默认: 1000，0 表示不限）"
+    )
+    auto_rerun.add_argument(
+        "--max-minutes",
+        type=float,
+        default=0,
+        help="每小时最多重跑的 runner 分钟数（默认: 0，不限）"
+    )
+    auto_rerun.add_argument(
+        "--interval",
+        type=float,
+        default=30.0,
+        help="有变化时的轮询间隔，秒（默认: 30）"
+    )
+    auto_rerun.add_argument(
+        "--max-interval",
+        type=float,
+        default=300.0,
+        help="无变化时退避的最大轮询间隔，秒（默认: 300）"
+    )
+    auto_rerun.add_argument(
+        "--for",
+        dest="duration",
+        help="运行时长，如 8h、1d（默认: 直到 Ctrl+C）"
+    )
+    
     # 列出 Jobs
     list_jobs = subparsers.add_parser(
         "list-jobs",
@@ -447,7 +954,7 @@ def _add_workflow_commands(subparsers):
     get_logs = subparsers.add_parser(
         "get-logs",
         help="下载运行日志",
-        description="下载 Workflow 运行的日志文件（ZIP 格式）"
+        description="下载 Workflow 运行的日志文件（ZIP 格式）；下载的 ZIP 不进入 logs search 的本地索引"
     )
     get_logs.add_argument("repo", help="仓库名称")
     get_logs.add_argument("run_id", type=int, help="运行 ID")
@@ -455,6 +962,192 @@ def _add_workflow_commands(subparsers):
         "--output", "-o",
         help="输出文件路径（如: logs.zip）"
     )
+    get_logs.add_argument(
+        "--only",
+        action="append",
+        metavar="PATTERN",
+        help="只解压匹配的 job/步骤日志（可重复，如: \"build/*\"、\"*/3_Run tests.txt\"）"
+    )
+    get_logs.add_argument(
+        "--extract-dir",
+        help="解压目录（默认: logs-<run_id>）"
+    )
+    
+    # 构建产物
+    list_artifacts = subparsers.add_parser(
+        "list-artifacts",
+        help="列出构建产物",
+        description="列出仓库或某个运行的构建产物"
+    )
+    list_artifacts.add_argument("repo", help="仓库名称")
+    list_artifacts.add_argument(
+        "--run",
+        type=int,
+        dest="run_id",
+        help="只列出该运行的构建产物"
+    )
+    list_artifacts.add_argument("--name", help="按产物名称过滤（精确匹配）")
+    
+    get_artifacts = subparsers.add_parser(
+        "get-artifacts",
+        help="并发下载构建产物",
+        description="并发下载多个运行的构建产物，支持断点续传，摘要相同的产物只下载一次"
+    )
+    get_artifacts.add_argument("repo", help="仓库名称")
+    get_artifacts.add_argument("run_ids", type=int, nargs="+", metavar="RUN_ID", help="运行 ID")
+    get_artifacts.add_argument(
+        "--name",
+        action="append",
+        metavar="PATTERN",
+        help="只下载名称匹配的产物（可重复，支持通配符）"
+    )
+    get_artifacts.add_argument(
+        "--output", "-o",
+        default="artifacts",
+        help="保存目录（默认: artifacts）"
+    )
+    get_artifacts.add_argument(
+        "--extract",
+        action="store_true",
+        help="下载后解压到 <目录>/<run_id>/<name>/"
+    )
+    get_artifacts.add_argument(
+        "--workers",
+        type=int,
+        default=4,
+        help="并发下载数（默认: 4）"
+    )
+    
+    # 失败日志与日志搜索
+    logs = subparsers.add_parser(
+        "logs",
+        help="失败日志提取与本地日志搜索",
+        description="只下载失败 Job 的日志并输出失败步骤片段；下载的日志进入本地索引，搜索时不再下载"
+    )
+    logs_commands = logs.add_subparsers(
+        dest="logs_command",
+        metavar="ACTION",
+        required=True
+    )
+    
+    logs_failures = logs_commands.add_parser(
+        "failures",
+        help="输出运行中失败步骤的日志",
+        description="根据 Job 步骤元数据只下载失败 Job 的日志，切出失败步骤并高亮错误行"
+    )
+    logs_failures.add_argument("repo", help="仓库名称")
+    logs_failures.add_argument("run_id", type=int, help="运行 ID")
+    logs_failures.add_argument(
+        "--tail",
+        type=int,
+        default=30,
+        help="每个失败步骤额外输出的末尾行数（默认: 30）"
+    )
+    
+    logs_search = logs_commands.add_parser(
+        "search",
+        help="在已索引的日志中搜索",
+        description="在本地日志索引中按短语搜索（不访问 API）；索引只包含 logs failures 下载过的失败 Job 日志"
+    )
+    logs_search.add_argument("repo", help="仓库名称")
+    logs_search.add_argument("pattern", help="搜索的短语")
+    logs_search.add_argument(
+        "--last",
+        type=int,
+        default=200,
+        help="只搜索最近 N 个已索引的运行（默认: 200）"
+    )
+    logs_search.add_argument(
+        "--limit",
+        type=int,
+        default=100,
+        help="最多显示的行数（默认: 100）"
+    )
+    
+    # Actions 缓存
+    caches = subparsers.add_parser(
+        "caches",
+        help="Actions 缓存清单、占用汇总与批量清理",
+        description="列出 Actions 缓存，按键前缀或 ref 汇总占用（可使用本地快照），按前缀、ref、访问时间批量删除"
+    )
+    caches_commands = caches.add_subparsers(
+        dest="caches_command",
+        metavar="ACTION",
+        required=True
+    )
+    
+    caches_list = caches_commands.add_parser(
+        "list",
+        help="列出缓存",
+        description="分页列出全部缓存；不带过滤条件时同时保存本地快照"
+    )
+    caches_list.add_argument("repo", help="仓库名称")
+    caches_list.add_argument("--key", help="键前缀")
+    caches_list.add_argument("--ref", help="分支引用（如: refs/heads/main）")
+    
+    caches_usage = caches_commands.add_parser(
+        "usage",
+        help="按键前缀或 ref 汇总缓存占用",
+        description="汇总各前缀/ref 的缓存数量、大小和可回收的旧版本大小"
+    )
+    caches_usage.add_argument("repo", help="仓库名称")
+    caches_usage.add_argument(
+        "--by",
+        choices=["prefix", "ref"],
+        default="prefix",
+        help="汇总维度（默认: prefix）"
+    )
+    caches_usage.add_argument(
+        "--depth",
+        type=int,
+        help="前缀取键中前 N 段（按 - 分隔，默认去掉末尾的哈希段）"
+    )
+    caches_usage.add_argument(
+        "--top",
+        type=int,
+        default=20,
+        help="显示的分组数（默认: 20）"
+    )
+    caches_usage.add_argument(
+        "--offline",
+        action="store_true",
+        help="使用本地快照，不访问 API"
+    )
+    
+    caches_evict = caches_commands.add_parser(
+        "evict",
+        help="批量删除缓存",
+        description="按键前缀、ref、最近访问时间并发删除缓存"
+    )
+    caches_evict.add_argument("repo", help="仓库名称")
+    caches_evict.add_argument("--prefix", help="键前缀")
+    caches_evict.add_argument("--ref", help="分支引用（如: refs/pull/42/merge）")
+    caches_evict.add_argument(
+        "--older-than",
+        help="只删除超过该时长未被访问的缓存，如 3d、12h"
+    )
+    caches_evict.add_argument(
+        "--workers",
+        type=int,
+        default=8,
+        help="并发数（默认: 8）"
+    )
+    caches_evict.add_argument(
+        "--rate",
+        type=float,
+        default=1.0,
+        help="每秒最多写请求数（默认: 1）"
+    )
+    caches_evict.add_argument(
+        "--dry-run",
+        action="store_true",
+        help="只列出将要删除的缓存"
+    )
+    caches_evict.add_argument(
+        "--yes", "-y",
+        action="store_true",
+        help="跳过确认"
+    )
     
     # 删除运行记录
     delete_run = subparsers.add_parser(
@@ -465,6 +1158,61 @@ def _add_workflow_commands(subparsers):
     delete_run.add_argument("repo", help="仓库名称")
     delete_run.add_argument("run_id", type=int, help="运行 ID")
     
+    # 按保留策略批量删除运行记录
+    prune_runs = subparsers.add_parser(
+        "prune-runs",
+        help="按保留策略批量删除运行记录",
+        description="流式选出早于指定时间的运行并并发删除，支持 dry-run 和断点续删"
+    )
+    prune_runs.add_argument("repo", help="仓库名称")
+    prune_runs.add_argument(
+        "--older-than",
+        required=True,
+        help="删除早于该时长之前创建的运行（如: 30d、12h、2w）"
+    )
+    prune_runs.add_argument(
+        "--keep-last",
+        type=int,
+        default=0,
+        help="始终保留最新的 N 个运行（默认: 0）"
+    )
+    prune_runs.add_argument(
+        "--status",
+        default="completed",
+        help="只删除该状态的运行（默认: completed）"
+    )
+    prune_runs.add_argument(
+        "--workflow",
+        help="只处理指定的 Workflow（ID 或文件名）"
+    )
+    prune_runs.add_argument(
+        "--workers",
+        type=int,
+        default=4,
+        help="并发删除数（默认: 4）"
+    )
+    prune_runs.add_argument(
+        "--rate",
+        type=float,
+        default=1.0,
+        help="删除请求速率上限，次/秒（默认: 1）"
+    )
+    prune_runs.add_argument(
+        "--dry-run",
+        action="store_true",
+        help="只统计待删除的运行，不删除"
+    )
+    prune_runs.add_argument(
+        "--restart",
+        action="store_true",
+        help="忽略检查点，重新选择"
+    )
+    prune_runs.add_argument(
+        "--yes", "-y",
+        action="store_true",
+        help="跳过确认"
+    )
+    
     # 启用 Workflow
     enable_workflow = subparsers.add_parser(
         "enable-workflow",
@@ -488,6 +1236,252 @@ def _add_workflow_commands(subparsers):
         "workflow_id",
         help="Workflow ID 或文件名（如: ci.yml）"
     )
+    
+    # 批量启用 / 禁用 Workflow
+    workflows = subparsers.add_parser(
+        "workflows",
+        help="跨仓库批量管理 Workflow",
+        description="按仓库选择器批量操作同名 Workflow"
+    )
+    workflows_commands = workflows.add_subparsers(
+        dest="workflows_command",
+        metavar="ACTION",
+        required=True
+    )
+    
+    workflows_set_state = workflows_commands.add_parser(
+        "set-state",
+        help="批量启用或禁用 Workflow",
+        description="通过本地保存的名称 -> ID 映射解析 workflow，并发启用或禁用，输出总用时"
+    )
+    workflows_set_state.add_argument(
+        "--name",
+        required=True,
+        help="Workflow 文件名（如: deploy.yml）或显示名称"
+    )
+    workflows_set_state.add_argument(
+        "--state",
+        choices=["enabled", "disabled"],
+        required=True,
+        help="目标状态"
+    )
+    workflows_set_state.add_argument(
+        "--repos",
+        default="*",
+        help="仓库选择器，逗号分隔的通配符，! 开头表示排除（默认: 全部）"
+    )
+    workflows_set_state.add_argument(
+        "--workers",
+        type=int,
+        default=16,
+        help="并发数（默认: 16）"
+    )
+    workflows_set_state.add_argument(
+        "--rate",
+        type=float,
+        default=10.0,
+        help="每秒最多写请求数（默认: 10，0 表示不限）"
+    )
+    workflows_set_state.add_argument(
+        "--refresh",
+        action="store_true",
+        help="忽略本地映射，重新读取各仓库的 workflow 列表"
+    )
+    workflows_set_state.add_argument(
+        "--dry-run",
+        action="store_true",
+        help="只输出解析结果"
+    )
+
+
+def _add_export_commands(subparsers):
+    """添加列式数据导出相关命令"""
+    
+    export = subparsers.add_parser(
+        "export",
+        help="导出提交/运行记录/Jobs 为列式文件",
+        description="流式分页读取数据并导出为 Parquet（需要 pyarrow）或 NPY 目录格式，"
+                    "时间戳转换为 epoch 秒，状态类字段使用字典编码"
+    )
+    export.add_argument(
+        "kind",
+        choices=["commits", "runs", "jobs"],
+        help="导出的数据类型"
+    )
+    export.add_argument("repo", help="仓库名称")
+    export.add_argument(
+        "--output", "-o",
+        required=True,
+        help="输出路径（parquet 为文件，npy 为目录）"
+    )
+    export.add_argument(
+        "--format",
+        choices=["auto", "parquet", "npy"],
+        default="auto",
+        help="输出格式（默认: auto，已安装 pyarrow 时使用 parquet）"
+    )
+    export.add_argument(
+        "--branch",
+        help="分支名称（commits 默认: main）"
+    )
+    export.add_argument(
+        "--workflow",
+        help="Workflow ID 或文件名（runs/jobs）"
+    )
+    export.add_argument(
+        "--status",
+        choices=["queued", "in_progress", "completed"],
+        help="过滤运行状态（runs/jobs）"
+    )
+    export.add_argument(
+        "--limit",
+        type=int,
+        help="最多导出的提交数或运行数（默认: 全部）"
+    )
+
+
+def _add_stats_commands(subparsers):
+    """添加 Workflow 统计分析相关命令"""
+    
+    actions_stats = subparsers.add_parser(
+        "actions-stats",
+        help="Workflow 运行耗时、排队时间和不稳定率统计",
+        description="增量同步运行和 jobs 元数据到本地列式缓存，计算耗时/排队时间 p50/p95、"
+                    "失败率和不稳定率（重试后成功）"
+    )
+    actions_stats.add_argument("repo", help="仓库名称")
+    actions_stats.add_argument(
+        "--runs",
+        type=int,
+        default=2000,
+        help="统计最近 N 个运行，首次同步也最多读取 N 个（默认: 2000）"
+    )
+    actions_stats.add_argument(
+        "--workflow",
+        help="只统计指定名称的 Workflow"
+    )
+    actions_stats.add_argument(
+        "--offline",
+        action="store_true",
+        help="只使用本地缓存，不同步"
+    )
+    actions_stats.add_argument(
+        "--workers",
+        type=int,
+        default=8,
+        help="读取 jobs 的并发数（默认: 8）"
+    )
+    actions_stats.add_argument(
+        "--format",
+        choices=["auto", "parquet", "npy"],
+        default="auto",
+        help="缓存格式（默认: auto，仅首次同步时生效）"
+    )
+    
+    # 运行耗时剖析
+    profile_run = subparsers.add_parser(
+        "profile-run",
+        help="剖析运行的步骤耗时、关键路径和排队时间",
+        description="根据 Job/步骤时间戳计算耗时分布和关键路径，输出文本甘特图，可导出 Chrome Trace JSON"
+    )
+    profile_run.add_argument("repo", help="仓库名称")
+    profile_run.add_argument("run_id", type=int, help="运行 ID")
+    profile_run.add_argument(
+        "--top",
+        type=int,
+        default=5,
+        help="每个 Job 显示耗时最长的步骤数（默认: 5）"
+    )
+    profile_run.add_argument(
+        "--trace",
+        help="导出 Chrome Trace Event 格式 JSON（可用 chrome://tracing 或 Perfetto 打开）"
+    )
+    
+    # 多仓库 Actions 看板
+    dashboard = subparsers.add_parser(
+        "dashboard",
+        help="多仓库 Actions 状态看板",
+        description="并发获取多个仓库中每个 workflow 的最新运行状态，刷新时使用 ETag，只输出变化的行"
+    )
+    dashboard.add_argument(
+        "--repos",
+        default="*",
+        help="仓库选择器，逗号分隔的通配符，! 开头表示排除（默认: 全部）"
+    )
+    dashboard.add_argument(
+        "--watch",
+        type=float,
+        metavar="SECONDS",
+        help="每隔 SECONDS 秒刷新，只输出变化的行（Ctrl+C 退出）"
+    )
+    dashboard.add_argument(
+        "--failing",
+        action="store_true",
+        help="只显示失败的 workflow"
+    )
+    dashboard.add_argument(
+        "--workers",
+        type=int,
+        default=16,
+        help="并发数（默认: 16）"
+    )
+
+
+def _add_campaign_commands(subparsers):
+    """添加多仓库批量修改相关命令"""
+    
+    campaign = subparsers.add_parser(
+        "campaign",
+        help="在多个仓库中应用同一修改并创建 PR",
+        description="对匹配的每个仓库修改同一个文件，通过 Git Data API 提交到新分支并创建 PR，"
+                    "内容无变化的仓库自动跳过"
+    )
+    campaign.add_argument(
+        "--repos",
+        required=True,
+        help="仓库选择器，逗号分隔的通配符，! 开头表示排除（如: 'team-*,!team-legacy'）"
+    )
+    campaign.add_argument(
+        "--file",
+        dest="path",
+        required=True,
+        help="要修改的文件路径（如: .github/CODEOWNERS）"
+    )
+    transform = campaign.add_mutually_exclusive_group(required=True)
+    transform.add_argument(
+        "--content-from",
+        help="用本地文件的内容替换（文件不存在时创建）"
+    )
+    transform.add_argument(
+        "--replace",
+        nargs=2,
+        metavar=("PATTERN", "REPLACEMENT"),
+        help="对已有文件做正则替换（文件不存在时跳过）"
+    )
+    campaign.add_argument("--branch", required=True, help="新分支名称")
+    campaign.add_argument("--title", required=True, help="PR 标题")
+    campaign.add_argument("--body", default="", help="PR 描述")
+    campaign.add_argument(
+        "-m", "--message",
+        help="提交信息（默认与 PR 标题相同）"
+    )
+    campaign.add_argument(
+        "--workers",
+        type=int,
+        default=4,
+        help="并发工作线程数（默认: 4）"
+    )
+    campaign.add_argument(
+        "--rate",
+        type=float,
+        default=1.0,
+        help="写请求速率上限，次/秒（默认: 1）"
+    )
+    campaign.add_argument(
+        "--dry-run",
+        action="store_true",
+        help="只检查哪些仓库需要修改，不创建分支和 PR"
+    )
 
 
 if __name__ == "__main__":
@@ -7,6 +7,18 @@ class Config:
     BASE_URL = "https://api.github.com"
     API_VERSION = "application/vnd.github.v3+json"
     
+    # 请求超时（秒）
+    TIMEOUT = 30
+    # 连接池大小，决定并发工作线程可复用的连接数
+    POOL_SIZE = 16
+    # 写操作速率上限（次/秒），GitHub 建议内容创建类请求间隔至少 1 秒
+    WRITE_RATE = 1.0
+    # 本地缓存目录（提交历史、索引、检查点等）
+    CACHE_DIR = os.environ.get(
+        "GITHUB_MANAGER_CACHE",
+        os.path.join(os.path.expanduser("~"), ".cache", "github_manager")
+    )
+    
     @staticmethod
     def get_token() -> Optional[str]:
         return os.environ.get("GITHUB_TOKEN")
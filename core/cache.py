@@ -0,0 +1,33 @@
+import threading
+from typing import Any, Dict, Optional, Tuple
+
+
+class ETagCache:
+    """
+    条件请求缓存：请求键 -> (ETag, 响应数据)
+    
+    命中 304 时直接复用缓存数据，304 响应不计入 GitHub 主速率限制。
+    """
+    
+    def __init__(self):
+        self._entries: Dict[str, Tuple[str, Any]] = {}
+        self._lock = threading.Lock()
+    
+    @staticmethod
+    def make_key(endpoint: str, params: Optional[Dict] = None) -> str:
+        """由端点和查询参数生成缓存键"""
+        if not params:
+            return endpoint
+        query = "&".join(f"{k}={params[k]}" for k in sorted(params))
+        return f"{endpoint}?{query}"
+    
+    def get(self, key: str) -> Optional[Tuple[str, Any]]:
+        with self._lock:
+            return self._entries.get(key)
+    
+    def set(self, key: str, etag: str, data: Any):
+        with self._lock:
+            self._entries[key] = (etag, data)
+    
+    def __len__(self) -> int:
+        return len(self._entries)
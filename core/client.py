@@ -1,14 +1,41 @@
 
+import os
+import time
 import requests
-from typing import Optional, Dict, Any
-from .exceptions import AuthenticationError, APIError
+from requests.adapters import HTTPAdapter
+from typing import Optional, Dict, Any, Iterator, List, Tuple
+from .exceptions import AuthenticationError, APIError, RateLimitError
+from .ratelimit import RateLimiter
+from .cache import ETagCache
 from config import Config
 
+# 只读请求不受写操作限速
+SAFE_METHODS = ("GET", "HEAD", "OPTIONS")
+
+# 重复发送不会产生额外副作用的方法，网络错误或 5xx 时可以直接重试
+IDEMPOTENT_METHODS = SAFE_METHODS + ("PUT", "DELETE")
+
 class GitHubClient:
-    def __init__(self, token: str, username: Optional[str] = None):
+    def __init__(self, token: str, username: Optional[str] = None,
+                 pool_size: int = Config.POOL_SIZE,
+                 write_rate: float = Config.WRITE_RATE):
         self.token = token
         self.base_url = Config.BASE_URL
         self.headers = Config.get_headers(token)
+        
+        # 所有 Manager 和工作线程共享同一个连接池
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+        self.session.headers.update(self.headers)
+        
+        # 写操作 (POST/PUT/PATCH/DELETE) 共享同一个节流器，避免触发 secondary rate limit
+        self.write_limiter = RateLimiter(write_rate)
+        
+        # 条件请求缓存，304 响应不计入主速率限制
+        self.etag_cache = ETagCache()
+        
         self.username = username or self._get_authenticated_user()
     
     def _get_authenticated_user(self) -> str:
@@ -16,6 +43,83 @@ class GitHubClient:
         response = self._request("GET", "/user")
         return response["login"]
     
+    def set_write_rate(self, rate: float):
+        """调整写操作速率上限（次/秒），rate <= 0 表示不限速"""
+        self.write_limiter = RateLimiter(rate)
+    
+    def _send(self, method: str, endpoint: str, **kwargs) -> requests.Response:
+        """
+        发送 HTTP 请求并返回原始响应
+        
+        Args:
+            method: HTTP 方法
+            endpoint: API 端点，或完整 URL（如分页的 next 链接）
+            **kwargs: 其他请求参数
+        
+        Returns:
+            requests.Response 对象
+        """
+        url = endpoint if endpoint.startswith("http") else f"{self.base_url}{endpoint}"
+        kwargs.setdefault("timeout", Config.TIMEOUT)
+        
+        if method.upper() not in SAFE_METHODS:
+            self.write_limiter.acquire()
+        
+        try:
+            return self.session.request(method=method, url=url, **kwargs)
+        except requests.exceptions.RequestException as e:
+            raise APIError(f"网络请求错误: {str(e)}")
+    
+    def _handle_response(self, response: requests.Response) -> Any:
+        """根据状态码返回响应数据或抛出异常"""
+        if response.status_code in [200, 201, 202]:
+            return response.json() if response.content else None
+        elif response.status_code == 204:
+            return None
+        elif response.status_code == 401:
+            raise AuthenticationError("认证失败，请检查 Token")
+        elif response.status_code == 404:
+            raise APIError("资源未找到", status_code=404)
+        elif self._is_rate_limited(response):
+            error_data = response.json() if response.content else {}
+            retry_after = self._retry_after(response)
+            raise RateLimitError(
+                f"触发速率限制，{retry_after:.0f} 秒后重试: {error_data.get('message', '')}",
+                retry_after=retry_after,
+                status_code=response.status_code,
+                response=error_data
+            )
+        else:
+            error_data = response.json() if response.content else {}
+            raise APIError(
+                f"API 请求失败: {error_data}",
+                status_code=response.status_code,
+                response=error_data
+            )
+    
+    @staticmethod
+    def _is_rate_limited(response: requests.Response) -> bool:
+        """判断 403/429 响应是否由速率限制引起"""
+        if response.status_code == 429:
+            return True
+        if response.status_code != 403:
+            return False
+        if "Retry-After" in response.headers:
+            return True
+        if response.headers.get("X-RateLimit-Remaining") == "0":
+            return True
+        return b"rate limit" in response.content.lower()
+    
+    @staticmethod
+    def _retry_after(response: requests.Response) -> float:
+        """按 GitHub 文档确定等待时间：Retry-After > X-RateLimit-Reset > 60 秒"""
+        if "Retry-After" in response.headers:
+            return float(response.headers["Retry-After"])
+        if response.headers.get("X-RateLimit-Remaining") == "0":
+            reset = float(response.headers.get("X-RateLimit-Reset", 0))
+            return max(reset - time.time(), 1.0)
+        return 60.0
+    
     def _request(self, method: str, endpoint: str, **kwargs) -> Any:
         """
         发送 HTTP 请求的通用方法
@@ -28,31 +132,176 @@ class GitHubClient:
         Returns:
             响应数据
         """
-        url = f"{self.base_url}{endpoint}"
+        response = self._send(method, endpoint, **kwargs)
+        return self._handle_response(response)
+    
+    def request_with_retry(self, method: str, endpoint: str,
+                           max_retries: int = 5, **kwargs) -> Any:
+        """
+        发送请求，遇到速率限制、网络错误或 5xx 时重试
         
-        try:
-            response = requests.request(
-                method=method,
-                url=url,
-                headers=self.headers,
-                **kwargs
-            )
+        速率限制按 Retry-After 暂停共享节流器，所有并发的写请求一起等待。
+        网络错误和 5xx 只对幂等方法重试：POST/PATCH 可能已在服务端生效而响应
+        丢失，盲目重发会产生重复记录，由调用方确认状态后再决定是否重发。
+        """
+        for attempt in range(max_retries + 1):
+            try:
+                return self._request(method, endpoint, **kwargs)
+            except RateLimitError as e:
+                if attempt == max_retries:
+                    raise
+                self.write_limiter.backoff(e.retry_after)
+                if method.upper() in SAFE_METHODS:
+                    time.sleep(e.retry_after)
+            except APIError as e:
+                if (attempt == max_retries or method.upper() not in IDEMPOTENT_METHODS
+                        or not (e.status_code is None or e.status_code >= 500)):
+                    raise
+                time.sleep(2 ** attempt)
+    
+    def conditional_get(self, endpoint: str,
+                        params: Optional[Dict] = None) -> Tuple[Any, bool]:
+        """
+        带 If-None-Match 的条件 GET 请求
+        
+        Args:
+            endpoint: API 端点
+            params: 查询参数
+        
+        Returns:
+            (响应数据, 是否有变化)，304 时返回缓存数据和 False
+        """
+        key = ETagCache.make_key(endpoint, params)
+        cached = self.etag_cache.get(key)
+        headers = {"If-None-Match": cached[0]} if cached else {}
+        
+        response = self._send("GET", endpoint, params=params, headers=headers)
+        if response.status_code == 304 and cached:
+            return cached[1], False
+        
+        data = self._handle_response(response)
+        etag = response.headers.get("ETag")
+        if etag:
+            self.etag_cache.set(key, etag, data)
+        return data, True
+    
+    def iter_pages(self, endpoint: str, params: Optional[Dict] = None,
+                   key: Optional[str] = None,
+                   headers: Optional[Dict] = None) -> Iterator[Tuple[requests.Response, List]]:
+        """
+        沿 Link 头逐页读取列表接口
+        
+        Args:
+            endpoint: API 端点
+            params: 查询参数（默认 per_page=100）
+            key: 响应为对象时列表所在字段（如 workflow_runs）
+            headers: 首页请求的额外请求头（如 If-None-Match）
+        
+        Returns:
+            (响应, 本页数据) 迭代器；首页返回 304 时只产出一次 (响应, [])
+        """
+        params = dict(params or {})
+        params.setdefault("per_page", 100)
+        
+        next_url = endpoint
+        while next_url:
+            response = self._send("GET", next_url, params=params, headers=headers)
+            if response.status_code == 304:
+                yield response, []
+                return
+            data = self._handle_response(response)
+            items = data.get(key, []) if key else data
+            yield response, items or []
             
-            # 处理不同的响应状态码
-            if response.status_code in [200, 201, 202]:
-                return response.json() if response.content else None
-            elif response.status_code == 204:
-                return None
-            elif response.status_code == 401:
-                raise AuthenticationError("认证失败，请检查 Token")
-            elif response.status_code == 404:
-                raise APIError("资源未找到", status_code=404)
-            else:
-                error_data = response.json() if response.content else {}
-                raise APIError(
-                    f"API 请求失败: {error_data}",
-                    status_code=response.status_code,
-                    response=error_data
-                )
-        except requests.exceptions.RequestException as e:
-            raise APIError(f"网络请求错误: {str(e)}")
+            # next 链接已携带全部查询参数
+            next_url = response.links.get("next", {}).get("url")
+            params = None
+            headers = None
+    
+    def paginate(self, endpoint: str, params: Optional[Dict] = None,
+                 key: Optional[str] = None) -> Iterator[Dict]:
+        """
+        沿 Link 头逐条读取列表接口
+        
+        Args:
+            endpoint: API 端点
+            params: 查询参数（默认 per_page=100）
+            key: 响应为对象时列表所在字段（如 workflow_runs）
+        
+        Returns:
+            逐条产出数据的迭代器
+        """
+        for _, items in self.iter_pages(endpoint, params, key):
+            yield from items
+    
+    def redirect_location(self, endpoint: str) -> str:
+        """请求返回 302 的下载接口（日志、制品等），返回临时下载地址"""
+        response = self._send("GET", endpoint, allow_redirects=False)
+        if response.status_code in (301, 302, 307):
+            return response.headers["Location"]
+        self._handle_response(response)
+        raise APIError(f"未返回下载地址: {response.status_code}", status_code=response.status_code)
+    
+    def download(self, endpoint: str, path: str, chunk_size: int = 1024 * 1024,
+                 max_retries: int = 5) -> int:
+        """
+        流式下载到文件，内存占用不超过 chunk_size
+        
+        数据先写入 path.part，连接中断后用 Range 从已写入的位置续传；
+        临时下载地址过期（401/403）时重新获取。上次中断留下的 .part 文件
+        会在下次调用时继续使用。
+        
+        Args:
+            endpoint: 返回 302 的 API 端点
+            path: 保存路径
+            chunk_size: 每次写入的块大小
+            max_retries: 最大重试次数
+        
+        Returns:
+            文件大小（字节）
+        """
+        part_path = f"{path}.part"
+        url = None
+        attempt = 0
+        while True:
+            offset = os.path.getsize(part_path) if os.path.exists(part_path) else 0
+            if url is None:
+                url = self.redirect_location(endpoint)
+            # 下载地址已带签名，不能把 API Token 发给存储服务
+            headers = {"Authorization": None}
+            if offset:
+                headers["Range"] = f"bytes={offset}-"
+            try:
+                with self.session.get(url, headers=headers, stream=True,
+                                      timeout=Config.TIMEOUT) as response:
+                    if response.status_code == 416:
+                        break
+                    if response.status_code in (401, 403) and attempt < max_retries:
+                        url = None
+                        attempt += 1
+                        continue
+                    if response.status_code not in (200, 206):
+                        raise APIError(f"下载失败: HTTP {response.status_code}",
+                                       status_code=response.status_code)
+                    if response.status_code == 200:
+                        offset = 0
+                    expected = response.headers.get("Content-Length")
+                    written = 0
+                    with open(part_path, "ab" if offset else "wb") as f:
+                        for chunk in response.iter_content(chunk_size):
+                            f.write(chunk)
+                            written += len(chunk)
+                    if expected is None or written >= int(expected):
+                        break
+                    raise requests.exceptions.ChunkedEncodingError(
+                        f"连接提前结束 ({written}/{expected})"
+                    )
+            except requests.exceptions.RequestException as e:
+                attempt += 1
+                if attempt > max_retries:
+                    raise APIError(f"下载中断，已保存 {part_path}，重新运行可续传: {e}")
+                print(f"  下载中断，{2 ** attempt} 秒后续传: {e}")
+                time.sleep(2 ** attempt)
+        
+        os.replace(part_path, path)
+        return os.path.getsize(path)
@@ -19,3 +19,16 @@ class APIError(GitHubManagerError):
         self.status_code = status_code
         self.response = response
         super().__init__(message)
+
+
+class PollTimeoutError(GitHubManagerError):
+    """轮询等待超时异常"""
+    pass
+
+
+class RateLimitError(APIError):
+    """触发 GitHub 主速率限制或 secondary rate limit"""
+    def __init__(self, message: str, retry_after: float, status_code: int = None,
+                 response: dict = None):
+        self.retry_after = retry_after
+        super().__init__(message, status_code=status_code, response=response)
@@ -0,0 +1,111 @@
+import heapq
+import itertools
+import time
+from typing import Any, Callable, Dict, Hashable, Optional
+from .exceptions import PollTimeoutError
+
+# check 函数返回 PENDING 表示尚未完成，需要继续轮询
+PENDING = object()
+
+
+class PollTask:
+    """单个轮询任务的调度状态"""
+    
+    def __init__(self, key: Hashable, check: Callable[["PollTask"], Any],
+                 interval: float, max_interval: float, factor: float,
+                 timeout: float):
+        self.key = key
+        self.check = check
+        self.interval = interval
+        self.max_interval = max_interval
+        self.factor = factor
+        self.deadline = time.monotonic() + timeout if timeout else None
+        self.attempts = 0
+        self._next_interval: Optional[float] = None
+    
+    def hold(self, seconds: float):
+        """指定下一次轮询的间隔（本轮跳过指数退避）"""
+        self._next_interval = seconds
+    
+    def advance(self) -> float:
+        """计算下一次轮询的间隔"""
+        if self._next_interval is not None:
+            self.interval = self._next_interval
+            self._next_interval = None
+        else:
+            self.interval = min(self.interval * self.factor, self.max_interval)
+        return self.interval
+
+
+class Poller:
+    """
+    单线程多路轮询调度器
+    
+    多个等待任务共享一个调度循环，按各自的下一次到期时间依次执行，
+    间隔从 interval 开始按 factor 指数退避，上限为 max_interval。
+    """
+    
+    def __init__(self):
+        self._heap = []
+        self._counter = itertools.count()
+        self.results: Dict[Hashable, Any] = {}
+        self.errors: Dict[Hashable, Exception] = {}
+    
+    def add(self, key: Hashable, check: Callable[[PollTask], Any],
+            interval: float = 1.0, max_interval: float = 30.0,
+            factor: float = 2.0, timeout: float = 300.0) -> PollTask:
+        """
+        添加轮询任务
+        
+        Args:
+            key: 任务标识
+            check: 检查函数，返回 PENDING 继续轮询，返回其他值表示完成
+            interval: 初始轮询间隔（秒）
+            max_interval: 最大轮询间隔（秒）
+            factor: 退避倍数
+            timeout: 超时时间（秒），0 表示不超时
+        """
+        task = PollTask(key, check, interval, max_interval, factor, timeout)
+        self._schedule(task, time.monotonic())
+        return task
+    
+    def pending(self) -> int:
+        """尚未完成的任务数"""
+        return len(self._heap)
+    
+    def run(self) -> Dict[Hashable, Any]:
+        """运行直到所有任务完成或超时，返回 key -> 结果"""
+        while self._heap:
+            due, _, task = heapq.heappop(self._heap)
+            delay = due - time.monotonic()
+            if delay > 0:
+                time.sleep(delay)
+            self._poll(task)
+        return self.results
+    
+    def _poll(self, task: PollTask):
+        task.attempts += 1
+        try:
+            result = task.check(task)
+        except Exception as e:
+            self.errors[task.key] = e
+            return
+        
+        if result is not PENDING:
+            self.results[task.key] = result
+            return
+        
+        now = time.monotonic()
+        if task.deadline is not None and now >= task.deadline:
+            self.errors[task.key] = PollTimeoutError(
+                f"等待超时: {task.key} (已轮询 {task.attempts} 次)"
+            )
+            return
+        
+        next_time = now + task.advance()
+        if task.deadline is not None:
+            next_time = min(next_time, task.deadline)
+        self._schedule(task, next_time)
+    
+    def _schedule(self, task: PollTask, when: float):
+        heapq.heappush(self._heap, (when, next(self._counter), task))
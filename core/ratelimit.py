@@ -0,0 +1,72 @@
+import threading
+import time
+from collections import deque
+
+
+class RateLimiter:
+    """
+    线程安全的请求节流器
+    
+    保证相邻两次请求之间至少间隔 1/rate 秒，多个工作线程共享同一实例时
+    整体速率不会超过 rate。rate <= 0 表示不限速。
+    """
+    
+    def __init__(self, rate: float):
+        self.interval = 1.0 / rate if rate > 0 else 0.0
+        self._lock = threading.Lock()
+        self._next_slot = 0.0
+    
+    def acquire(self):
+        """阻塞直到获得下一个请求时间片"""
+        with self._lock:
+            now = time.monotonic()
+            slot = max(now, self._next_slot)
+            self._next_slot = slot + self.interval
+        delay = slot - now
+        if delay > 0:
+            time.sleep(delay)
+    
+    def backoff(self, seconds: float):
+        """暂停所有共享该节流器的请求 seconds 秒（用于响应 Retry-After）"""
+        with self._lock:
+            self._next_slot = max(self._next_slot, time.monotonic() + seconds)
+
+
+class WindowBudget:
+    """
+    滑动窗口预算
+    
+    记录最近 window 秒内消耗的数量，总和不超过 limit。limit <= 0 表示不限。
+    """
+    
+    def __init__(self, limit: float, window: float = 3600.0):
+        self.limit = limit
+        self.window = window
+        self._spent = deque()
+        self._total = 0.0
+    
+    def _expire(self):
+        cutoff = time.monotonic() - self.window
+        while self._spent and self._spent[0][0] <= cutoff:
+            self._total -= self._spent.popleft()[1]
+    
+    def used(self) -> float:
+        """窗口内已消耗的数量"""
+        self._expire()
+        return self._total
+    
+    def allows(self, amount: float = 1) -> bool:
+        """再消耗 amount 是否仍在预算内"""
+        return self.limit <= 0 or self.used() + amount <= self.limit
+    
+    def spend(self, amount: float = 1):
+        self._expire()
+        self._spent.append((time.monotonic(), amount))
+        self._total += amount
+    
+    def wait_time(self) -> float:
+        """最早一笔消耗移出窗口还需的秒数"""
+        self._expire()
+        if not self._spent:
+            return 0.0
+        return max(self._spent[0][0] + self.window - time.monotonic(), 0.0)
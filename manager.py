@@ -797,10 +797,12 @@ class GitHubManager:
             download_url = response.headers.get("Location")
             
             if output_file:
-                # 下载并保存日志
-                log_response = requests.get(download_url)
-                with open(output_file, "wb") as f:
-                    f.write(log_response.content)
+                # 分块写入文件，避免整个 ZIP 驻留内存
+                with requests.get(download_url, stream=True, timeout=60) as log_response:
+                    log_response.raise_for_status()
+                    with open(output_file, "wb") as f:
+                        for chunk in log_response.iter_content(1024 * 1024):
+                            f.write(chunk)
                 print(f"✓ 日志已保存到: {output_file}")
                 return output_file
             else:
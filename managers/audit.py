@@ -0,0 +1,285 @@
+import glob
+import os
+import time
+from typing import Dict, List, Optional, Tuple
+from core.client import GitHubClient
+from core.exceptions import GitHubManagerError
+from utils.concurrency import run_concurrent
+from utils.progress import ProgressReporter
+from utils.storage import cache_path, read_json, write_json
+
+# 权限按从低到高编码，数值比较即可表示"至少拥有某权限"
+PERMISSION_LEVELS = ["none", "pull", "triage", "push", "maintain", "admin"]
+LEVEL_CODES = {name: code for code, name in enumerate(PERMISSION_LEVELS)}
+LEVEL_CODES.update({"read": LEVEL_CODES["pull"], "write": LEVEL_CODES["push"]})
+
+
+def permission_code(collaborator: Dict) -> int:
+    """协作者的权限编码：优先 role_name，自定义角色时取 permissions 中最高的一项"""
+    code = LEVEL_CODES.get(collaborator.get("role_name") or "")
+    if code is not None:
+        return code
+    granted = collaborator.get("permissions") or {}
+    for name in reversed(PERMISSION_LEVELS[1:]):
+        if granted.get(name):
+            return LEVEL_CODES[name]
+    return 0
+
+
+class AccessMatrix:
+    """
+    仓库 × 用户权限矩阵
+    
+    每个单元格 1 字节（PERMISSION_LEVELS 的下标，0 表示无权限），按仓库行优先
+    存放在 bytearray 中。快照保存为 .json 索引（仓库、用户、ETag）和 .bin 数据。
+    """
+    
+    def __init__(self, repos: List[str], users: List[str],
+                 cells: Optional[bytearray] = None,
+                 etags: Optional[Dict[str, str]] = None,
+                 taken_at: Optional[float] = None):
+        self.repos = repos
+        self.users = users
+        self.cells = cells if cells is not None else bytearray(len(repos) * len(users))
+        self.etags = etags or {}
+        self.taken_at = taken_at or time.time()
+        self._repo_index = {name: i for i, name in enumerate(repos)}
+        self._user_index = {name: i for i, name in enumerate(users)}
+    
+    @classmethod
+    def build(cls, rows: Dict[str, Dict[str, int]],
+              etags: Optional[Dict[str, str]] = None) -> "AccessMatrix":
+        """由 仓库 -> {用户: 权限编码} 构建矩阵"""
+        repos = sorted(rows)
+        users = sorted({user for row in rows.values() for user in row})
+        matrix = cls(repos, users, etags=etags)
+        width = len(users)
+        for r, repo in enumerate(repos):
+            for user, code in rows[repo].items():
+                matrix.cells[r * width + matrix._user_index[user]] = code
+        return matrix
+    
+    def get(self, repo: str, user: str) -> int:
+        r = self._repo_index.get(repo)
+        u = self._user_index.get(user)
+        if r is None or u is None:
+            return 0
+        return self.cells[r * len(self.users) + u]
+    
+    def row(self, repo: str) -> Dict[str, int]:
+        """某个仓库中有权限的用户"""
+        r = self._repo_index.get(repo)
+        if r is None:
+            return {}
+        width = len(self.users)
+        values = self.cells[r * width:(r + 1) * width]
+        return {self.users[u]: code for u, code in enumerate(values) if code}
+    
+    def repos_for(self, user: str, min_level: int = 1) -> List[Tuple[str, int]]:
+        """用户至少拥有 min_level 权限的仓库"""
+        u = self._user_index.get(user)
+        if u is None:
+            return []
+        column = self.cells[u::len(self.users)]
+        return [(self.repos[r], code) for r, code in enumerate(column) if code >= min_level]
+    
+    def users_for(self, repo: str, min_level: int = 1) -> List[Tuple[str, int]]:
+        """仓库中至少拥有 min_level 权限的用户"""
+        return sorted((user, code) for user, code in self.row(repo).items() if code >= min_level)
+    
+    def counts(self, min_level: int = 1) -> Dict[str, int]:
+        """每个用户至少拥有 min_level 权限的仓库数"""
+        width = len(self.users)
+        return {
+            user: sum(1 for code in self.cells[u::width] if code >= min_level)
+            for u, user in enumerate(self.users)
+            if width
+        }
+    
+    def diff(self, previous: "AccessMatrix") -> List[Dict]:
+        """与旧快照比较，返回权限发生变化的 (仓库, 用户, 旧权限, 新权限)"""
+        changes = []
+        for repo in sorted(set(self.repos) | set(previous.repos)):
+            old_row = previous.row(repo)
+            new_row = self.row(repo)
+            for user in sorted(set(old_row) | set(new_row)):
+                old = old_row.get(user, 0)
+                new = new_row.get(user, 0)
+                if old != new:
+                    changes.append({
+                        "repo": repo,
+                        "user": user,
+                        "from": PERMISSION_LEVELS[old],
+                        "to": PERMISSION_LEVELS[new],
+                    })
+        return changes
+    
+    def save(self, path: str):
+        """保存快照（path 不含扩展名）"""
+        tmp_path = f"{path}.bin.tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(self.cells)
+        os.replace(tmp_path, f"{path}.bin")
+        write_json(f"{path}.json", {
+            "taken_at": self.taken_at,
+            "repos": self.repos,
+            "users": self.users,
+            "etags": self.etags,
+        })
+    
+    @classmethod
+    def load(cls, path: str) -> "AccessMatrix":
+        index = read_json(f"{path}.json")
+        if index is None:
+            raise GitHubManagerError(f"快照不存在: {path}")
+        with open(f"{path}.bin", "rb") as f:
+            cells = bytearray(f.read())
+        return cls(index["repos"], index["users"], cells, index["etags"], index["taken_at"])
+
+
+class AuditManager:
+    """跨仓库权限审计，快照保存在本地缓存目录"""
+    
+    def __init__(self, client: GitHubClient):
+        self.client = client
+    
+    def snapshots(self) -> List[str]:
+        """本地快照路径（不含扩展名），按时间从旧到新"""
+        directory = os.path.dirname(cache_path("audit", self.client.username, "index"))
+        return sorted(path[:-len(".json")] for path in glob.glob(os.path.join(directory, "*.json")))
+    
+    def latest(self) -> Optional[AccessMatrix]:
+        paths = self.snapshots()
+        return AccessMatrix.load(paths[-1]) if paths else None
+    
+    def baseline(self, current: AccessMatrix, days: float = 7) -> Optional[AccessMatrix]:
+        """
+        用于比较的旧快照：早于 current 至少 days 天的最新快照，
+        没有足够旧的快照时使用最早的一份
+        """
+        cutoff = current.taken_at - days * 86400
+        older = []
+        for path in self.snapshots():
+            matrix = AccessMatrix.load(path)
+            if matrix.taken_at < current.taken_at:
+                older.append(matrix)
+        if not older:
+            return None
+        eligible = [m for m in older if m.taken_at <= cutoff]
+        return eligible[-1] if eligible else older[0]
+    
+    def snapshot(self, affiliation: str = "owner,collaborator,organization_member",
+                 max_workers: int = 8, keep: int = 12) -> AccessMatrix:
+        """
+        并发读取所有可访问仓库的协作者，生成新的权限矩阵快照
+        
+        协作者列表只有一页的仓库记录 ETag，下次带上它请求，未变化时只消耗一次
+        304 请求并沿用上一份快照中的行；多页的仓库不记录 ETag（首页的 ETag 不
+        反映后续页的变化），每次完整读取。无权读取协作者的仓库沿用旧数据并单独报告。
+        
+        Args:
+            affiliation: 仓库列表的 affiliation 参数
+            max_workers: 最大并发数
+            keep: 保留的快照数量
+        """
+        previous = self.latest()
+        # 不同所有者下可能有同名仓库，按 full_name 去重
+        repos = sorted(
+            {
+                repo["full_name"]: repo
+                for repo in self.client.paginate("/user/repos", params={"affiliation": affiliation})
+            }.values(),
+            key=lambda repo: repo["full_name"]
+        )
+        progress = ProgressReporter(len(repos), label="audit-access")
+        
+        def fetch(repo: Dict) -> Tuple[Optional[Dict[str, int]], Optional[str]]:
+            full_name = repo["full_name"]
+            etag = previous.etags.get(full_name) if previous else None
+            headers = {"If-None-Match": etag} if etag else None
+            row: Dict[str, int] = {}
+            new_etag = None
+            pages = 0
+            for response, collaborators in self.client.iter_pages(
+                f"/repos/{full_name}/collaborators", headers=headers
+            ):
+                if response.status_code == 304:
+                    return None, etag
+                pages += 1
+                new_etag = new_etag or response.headers.get("ETag")
+                for collaborator in collaborators:
+                    row[collaborator["login"].lower()] = permission_code(collaborator)
+            return row, new_etag if pages == 1 else None
+        
+        results = run_concurrent(
+            fetch,
+            repos,
+            max_workers=max_workers,
+            on_done=lambda r: progress.advance(ok=r[2] is None)
+        )
+        
+        rows: Dict[str, Dict[str, int]] = {}
+        etags: Dict[str, str] = {}
+        unchanged = 0
+        unreadable = []
+        for repo, outcome, error in results:
+            full_name = repo["full_name"]
+            if error:
+                unreadable.append((full_name, error))
+                if previous and full_name in previous.repos:
+                    rows[full_name] = previous.row(full_name)
+                continue
+            row, etag = outcome
+            if row is None:
+                unchanged += 1
+                row = previous.row(full_name)
+            rows[full_name] = row
+            if etag:
+                etags[full_name] = etag
+        
+        matrix = AccessMatrix.build(rows, etags)
+        path = cache_path("audit", self.client.username,
+                          time.strftime("%Y%m%dT%H%M%S", time.gmtime(matrix.taken_at)))
+        matrix.save(path)
+        for old_path in self.snapshots()[:-keep]:
+            for ext in (".json", ".bin"):
+                os.remove(old_path + ext)
+        
+        print(f"\n{progress.summary()}")
+        print(f"✓ 快照已保存: {len(matrix.repos)} 个仓库 × {len(matrix.users)} 个用户，"
+              f"{unchanged} 个仓库未变化 (304)")
+        for full_name, error in unreadable:
+            print(f"✗ 无法读取 {full_name} 的协作者: {error}")
+        return matrix
+    
+    @staticmethod
+    def print_summary(matrix: AccessMatrix, min_level: int):
+        counts = matrix.counts(min_level)
+        ranked = sorted(
+            ((user, count) for user, count in counts.items() if count),
+            key=lambda item: (-item[1], item[0])
+        )
+        print(f"\n{len(ranked)} 个用户拥有 {PERMISSION_LEVELS[min_level]} 及以上权限:")
+        for user, count in ranked:
+            print(f"  {user:<24} {count} 个仓库")
+    
+    @staticmethod
+    def print_user(matrix: AccessMatrix, user: str, min_level: int):
+        repos = matrix.repos_for(user.lower(), min_level)
+        print(f"\n{user} 在 {len(repos)} 个仓库拥有 {PERMISSION_LEVELS[min_level]} 及以上权限:")
+        for repo, code in repos:
+            print(f"  {repo:<48} {PERMISSION_LEVELS[code]}")
+    
+    @staticmethod
+    def print_repo(matrix: AccessMatrix, repo: str, min_level: int):
+        users = matrix.users_for(repo, min_level)
+        print(f"\n{repo} 中 {len(users)} 个用户拥有 {PERMISSION_LEVELS[min_level]} 及以上权限:")
+        for user, code in users:
+            print(f"  {user:<24} {PERMISSION_LEVELS[code]}")
+    
+    @staticmethod
+    def print_diff(changes: List[Dict], previous: AccessMatrix):
+        taken = time.strftime("%Y-%m-%d %H:%M", time.localtime(previous.taken_at))
+        print(f"\n与 {taken} 的快照相比，{len(changes)} 处权限变化:")
+        for change in changes:
+            print(f"  {change['repo']:<48} {change['user']:<24} {change['from']} -> {change['to']}")
@@ -0,0 +1,207 @@
+import fnmatch
+import math
+import time
+from typing import Dict, List, Tuple
+from core.client import GitHubClient
+from core.exceptions import APIError, PollTimeoutError, RateLimitError
+from core.poller import PENDING, Poller, PollTask
+from core.ratelimit import WindowBudget
+from managers.repository import RepositoryManager
+from utils.timeutil import parse_timestamp
+
+# 视为可能 flaky 的 job 结论；cancelled、startup_failure 等不会重试
+FLAKY_CONCLUSIONS = ("failure", "timed_out")
+
+
+def _matches(name: str, patterns: List[str]) -> bool:
+    return any(fnmatch.fnmatch(name, pattern) for pattern in patterns)
+
+
+class AutoRerunManager:
+    """监视多个仓库的失败运行，按策略自动重新运行 flaky 的失败 job"""
+    
+    def __init__(self, client: GitHubClient):
+        self.client = client
+        self.repo_manager = RepositoryManager(client)
+    
+    def watch(self, selector: str = "*", jobs: str = "*", workflows: str = "*",
+              max_attempts: int = 2, max_calls: int = 1000, max_minutes: float = 0,
+              interval: float = 30.0, max_interval: float = 300.0,
+              duration: float = 0) -> Dict:
+        """
+        监视失败运行并自动重新运行失败的 job
+        
+        一个单线程 Poller 为每个仓库维护一个轮询任务，每次对 status=completed 的
+        运行列表发一个条件请求（未变化时为 304），在本地按 FLAKY_CONCLUSIONS 筛选
+        失败和超时的运行（status=failure 不包含 timed_out）。启动后失败的运行中，
+        只有全部失败 job 都匹配 jobs 选择器时才调用 rerun-failed-jobs；有不匹配的
+        失败 job 视为真实失败，不重试。每个运行最多重试 max_attempts 次。
+        
+        API 调用数（含 304）和重跑消耗的 runner 分钟数各有每小时预算：调用预算
+        用完时暂停轮询，分钟预算不足时推迟重试，直到窗口内的消耗过期。重跑的
+        分钟数按失败 job 上一次的耗时估算。
+        
+        API 错误不会中断仓库的轮询：触发速率限制时该仓库的轮询暂停到限制解除，
+        网络错误和 5xx 在下一轮重试，重跑被拒绝（403/409 等）的运行记为出错并
+        不再处理。
+        
+        Args:
+            selector: 仓库选择器
+            jobs: 逗号分隔的 job 名称通配符
+            workflows: 逗号分隔的 workflow 名称通配符
+            max_attempts: 每个运行最多重试次数
+            max_calls: 每小时 API 调用上限，0 表示不限
+            max_minutes: 每小时重跑的 runner 分钟数上限，0 表示不限
+            interval: 有变化时的轮询间隔（秒）
+            max_interval: 无变化时退避的最大间隔（秒）
+            duration: 运行时长（秒），0 表示直到 Ctrl+C
+        
+        Returns:
+            统计 (reruns, skipped, exhausted, errors, calls, minutes)
+        """
+        job_patterns = [p.strip() for p in jobs.split(",") if p.strip()]
+        workflow_patterns = [p.strip() for p in workflows.split(",") if p.strip()]
+        calls = WindowBudget(max_calls)
+        minutes = WindowBudget(max_minutes)
+        started_at = time.time()
+        # (仓库, 运行 ID, 尝试次数) -> 处理结果 (rerun/skipped/exhausted/error)
+        handled: Dict[Tuple[str, int, int], str] = {}
+        # 因预算不足推迟的运行，下一轮重新判断
+        deferred = set()
+        assessed: Dict[Tuple[str, int, int], Tuple[List[Dict], float]] = {}
+        stats = {"reruns": [], "skipped": 0, "exhausted": 0, "errors": 0, "calls": 0, "minutes": 0.0}
+        
+        def call() -> bool:
+            if not calls.allows(1):
+                return False
+            calls.spend(1)
+            stats["calls"] += 1
+            return True
+        
+        def assess(repo: str, run: Dict, key: Tuple[str, int, int]):
+            """读取本次尝试的 job，返回 (失败 job, 估算分钟数)，不应重试时返回 None"""
+            if key in assessed:
+                return assessed[key]
+            data, _ = self.client.conditional_get(
+                f"/repos/{repo}/actions/runs/{run['id']}/attempts/{key[2]}/jobs",
+                params={"per_page": 100}
+            )
+            failed = [job for job in data.get("jobs", []) if job.get("conclusion") in FLAKY_CONCLUSIONS]
+            others = [job["name"] for job in failed if not _matches(job["name"], job_patterns)]
+            if not failed or others:
+                reason = f"失败 job 不匹配: {', '.join(others)}" if others else "没有可重试的失败 job"
+                print(f"- {repo} [{run['id']}] {run['name']}: {reason}，不重试")
+                handled[key] = "skipped"
+                stats["skipped"] += 1
+                return None
+            seconds = 0
+            for job in failed:
+                begin = parse_timestamp(job.get("started_at"))
+                end = parse_timestamp(job.get("completed_at"))
+                if begin is not None and end is not None:
+                    seconds += max(end - begin, 0)
+            assessed[key] = (failed, math.ceil(seconds / 60) or 1)
+            return assessed[key]
+        
+        def consider(repo: str, run: Dict) -> bool:
+            """处理一个失败运行，返回是否有进展；触发速率限制时抛出 RateLimitError"""
+            attempt = run.get("run_attempt") or 1
+            key = (repo, run["id"], attempt)
+            if key in handled:
+                return False
+            if attempt > max_attempts:
+                print(f"✗ {repo} [{run['id']}] {run['name']}: 已重试 {attempt - 1} 次，仍然失败")
+                handled[key] = "exhausted"
+                stats["exhausted"] += 1
+                return True
+            if key not in assessed and not call():
+                return False
+            try:
+                assessment = assess(repo, run, key)
+                if assessment is None:
+                    return True
+                failed, cost = assessment
+                if not minutes.allows(cost) or not call():
+                    if key not in deferred:
+                        print(f"  {repo} [{run['id']}]: 预算不足，推迟重试（预计 {cost} 分钟）")
+                        deferred.add(key)
+                    return False
+                self.client._request("POST", f"/repos/{repo}/actions/runs/{run['id']}/rerun-failed-jobs")
+            except RateLimitError:
+                deferred.add(key)
+                raise
+            except APIError as e:
+                if e.status_code is None or e.status_code >= 500:
+                    # 临时错误，下一轮重新判断
+                    print(f"  {repo} [{run['id']}]: {e}，稍后重试")
+                    deferred.add(key)
+                    return False
+                print(f"✗ {repo} [{run['id']}] {run['name']}: 无法重试: {e}")
+                handled[key] = "error"
+                stats["errors"] += 1
+                deferred.discard(key)
+                return True
+            deferred.discard(key)
+            minutes.spend(cost)
+            stats["minutes"] += cost
+            stats["reruns"].append({"repo": repo, "run_id": run["id"], "attempt": attempt + 1})
+            handled[key] = "rerun"
+            print(f"↻ {repo} [{run['id']}] {run['name']}: 第 {attempt} 次重试 "
+                  f"{', '.join(job['name'] for job in failed)}（约 {cost} 分钟）")
+            return True
+        
+        def watch_repo(repo: str):
+            endpoint = f"/repos/{repo}/actions/runs"
+            # 已完成的运行中混有成功的运行，多取一些以免失败运行被挤出首页
+            params = {"status": "completed", "per_page": 100}
+            
+            def check(task: PollTask):
+                if not call():
+                    task.hold(max(calls.wait_time(), interval))
+                    return PENDING
+                progressed = False
+                try:
+                    data, changed = self.client.conditional_get(endpoint, params=params)
+                    for run in data.get("workflow_runs", []):
+                        if run.get("conclusion") not in FLAKY_CONCLUSIONS:
+                            continue
+                        updated = parse_timestamp(run.get("updated_at"))
+                        if updated is None or updated < started_at:
+                            continue
+                        if not _matches(run["name"], workflow_patterns):
+                            continue
+                        progressed = consider(repo, run) or progressed
+                except RateLimitError as e:
+                    print(f"  {repo}: 触发速率限制，{e.retry_after:.0f} 秒后继续")
+                    task.hold(max(e.retry_after, interval))
+                    return PENDING
+                except APIError as e:
+                    # 仓库不存在时停止监视，其余错误按退避间隔重试
+                    if e.status_code == 404:
+                        raise
+                    print(f"✗ 读取 {repo} 的失败运行出错: {e}")
+                    return PENDING
+                if changed or progressed:
+                    task.hold(interval)
+                return PENDING
+            
+            poller.add(repo, check, interval=interval, max_interval=max_interval,
+                       factor=1.5, timeout=duration)
+        
+        repos = self.repo_manager.select(selector)
+        print(f"监视 {len(repos)} 个仓库的失败运行（job: {jobs}，最多重试 {max_attempts} 次）")
+        poller = Poller()
+        for repo in repos:
+            watch_repo(repo["full_name"])
+        try:
+            poller.run()
+        except KeyboardInterrupt:
+            print("\n已停止")
+        
+        for repo, error in poller.errors.items():
+            if not isinstance(error, PollTimeoutError):
+                print(f"✗ 监视 {repo} 失败: {error}")
+        print(f"\n重试 {len(stats['reruns'])} 次，跳过 {stats['skipped']} 个，"
+              f"{stats['exhausted']} 个达到重试上限，{stats['errors']} 个出错；API 调用 {stats['calls']} 次，"
+              f"约 {stats['minutes']:.0f} runner 分钟")
+        return stats
@@ -0,0 +1,223 @@
+import time
+from typing import Dict, List, Tuple
+from urllib.parse import quote
+from core.client import GitHubClient
+from core.exceptions import GitHubManagerError
+from utils.concurrency import run_concurrent
+from utils.progress import ProgressReporter
+from utils.storage import cache_path, read_json, write_json
+from utils.timeutil import parse_timestamp
+
+class BranchManager:
+    def __init__(self, client: GitHubClient):
+        self.client = client
+    
+    def create(self, repo_name: str, new_branch: str,
+               from_branch: str = "main") -> Dict:
+        """创建新分支"""
+        sha = self.resolve_ref(repo_name, from_branch)
+        return self._create_ref(repo_name, new_branch, sha)
+    
+    def create_many(self, pairs: List[Tuple[str, str]], from_branch: str = "main",
+                    max_workers: int = 8) -> List[Dict]:
+        """
+        批量创建分支
+        
+        每个仓库的源分支只解析一次 SHA，随后并发创建所有 ref，创建请求由客户端
+        写操作节流器统一限速（create-branches --rate）。
+        
+        Args:
+            pairs: (仓库名称, 新分支名称) 列表
+            from_branch: 基于哪个分支创建
+            max_workers: 最大并发数
+        
+        Returns:
+            每个分支的结果 (repo, branch, ok, error)
+        """
+        repos = sorted({repo for repo, _ in pairs})
+        print(f"解析 {len(repos)} 个仓库的源分支 {from_branch}...")
+        resolved = run_concurrent(
+            lambda repo: self.resolve_ref(repo, from_branch),
+            repos,
+            max_workers=max_workers
+        )
+        base_shas = {repo: sha for repo, sha, error in resolved if not error}
+        base_errors = {repo: error for repo, _, error in resolved if error}
+        
+        progress = ProgressReporter(len(pairs), label="create-branches")
+        
+        def create(pair: Tuple[str, str]) -> Dict:
+            repo, branch = pair
+            if repo in base_errors:
+                raise base_errors[repo]
+            return self._create_ref(repo, branch, base_shas[repo])
+        
+        results = run_concurrent(
+            create,
+            pairs,
+            max_workers=max_workers,
+            on_done=lambda r: progress.advance(ok=r[2] is None)
+        )
+        
+        report = []
+        for (repo, branch), _, error in results:
+            if error:
+                print(f"✗ {repo}:{branch} 创建失败: {error}")
+            report.append({
+                "repo": repo,
+                "branch": branch,
+                "ok": error is None,
+                "error": str(error) if error else None
+            })
+        print(f"\n{progress.summary()}")
+        return report
+    
+    def analyze(self, repo_name: str, stale_days: int = 90,
+                max_workers: int = 8) -> List[Dict]:
+        """
+        分析所有分支相对默认分支的领先/落后状态和最后提交时间
+        
+        compare 结果按 (默认分支 SHA, 分支 SHA) 缓存在本地，
+        两个 SHA 都未变化的分支重复分析时不再请求 API；缓存只保留本次用到的条目。
+        
+        不领先且落后于默认分支的分支视为已合并；与默认分支指向同一提交的分支
+        （例如刚创建的分支）按最后提交时间判断为过期或活跃。
+        
+        Returns:
+            分支信息列表，包含 ahead_by、behind_by、last_commit、state (merged/stale/active)
+        """
+        owner = self.client.username
+        repo = self.client._request("GET", f"/repos/{owner}/{repo_name}")
+        default_branch = repo["default_branch"]
+        branches = list(self.client.paginate(f"/repos/{owner}/{repo_name}/branches"))
+        base_sha = next(
+            (b["commit"]["sha"] for b in branches if b["name"] == default_branch), None
+        )
+        if base_sha is None:
+            raise GitHubManagerError(f"{repo_name} 中没有默认分支 {default_branch}（空仓库？）")
+        
+        cache_file = cache_path("compare", owner, f"{repo_name}.json")
+        cache = read_json(cache_file, default={})
+        candidates = [b for b in branches if b["name"] != default_branch]
+        misses = [
+            b for b in candidates
+            if f"{base_sha}...{b['commit']['sha']}" not in cache
+        ]
+        print(f"分析 {len(candidates)} 个分支（默认分支: {default_branch}，"
+              f"缓存命中 {len(candidates) - len(misses)}，需要请求 {len(misses)}）")
+        
+        results = run_concurrent(
+            lambda b: self._compare(repo_name, base_sha, b["commit"]["sha"]),
+            misses,
+            max_workers=max_workers
+        )
+        for branch, summary, error in results:
+            if error:
+                print(f"✗ {branch['name']} 比较失败: {error}")
+                continue
+            cache[f"{base_sha}...{branch['commit']['sha']}"] = summary
+        keys = {f"{base_sha}...{b['commit']['sha']}" for b in candidates}
+        cache = {key: summary for key, summary in cache.items() if key in keys}
+        write_json(cache_file, cache)
+        
+        cutoff = time.time() - stale_days * 86400
+        report = []
+        for branch in candidates:
+            summary = cache.get(f"{base_sha}...{branch['commit']['sha']}")
+            if not summary:
+                continue
+            if summary["ahead_by"] == 0 and summary["behind_by"] > 0:
+                state = "merged"
+            elif (parse_timestamp(summary["last_commit"]) or 0) < cutoff:
+                state = "stale"
+            else:
+                state = "active"
+            report.append({
+                "name": branch["name"],
+                "protected": branch.get("protected", False),
+                "state": state,
+                **summary
+            })
+        
+        report.sort(key=lambda b: b["last_commit"] or "")
+        print(f"\n  {'分支':<36} {'状态':<6} {'领先':>4} {'落后':>4}  最后提交")
+        for b in report:
+            lock = " 🔒" if b["protected"] else ""
+            print(f"  {b['name']:<38} {b['state']:<8} {b['ahead_by']:>6} "
+                  f"{b['behind_by']:>6}  {b['last_commit']}{lock}")
+        counts = {state: sum(1 for b in report if b["state"] == state)
+                  for state in ("merged", "stale", "active")}
+        print(f"\n已合并 {counts['merged']}，过期 {counts['stale']}，活跃 {counts['active']}")
+        return report
+    
+    def delete_many(self, repo_name: str, branches: List[str],
+                    max_workers: int = 8) -> List[Dict]:
+        """并发删除多个分支，删除请求由客户端写操作节流器统一限速"""
+        progress = ProgressReporter(len(branches), label="delete-branches")
+        results = run_concurrent(
+            lambda name: self.client._request(
+                "DELETE",
+                f"/repos/{self.client.username}/{repo_name}/git/refs/heads/{quote(name, safe='/')}"
+            ),
+            branches,
+            max_workers=max_workers,
+            on_done=lambda r: progress.advance(ok=r[2] is None)
+        )
+        for name, _, error in results:
+            if error:
+                print(f"✗ 删除分支失败: {name} ({error})")
+        print(f"\n{progress.summary()}")
+        return [
+            {"branch": name, "ok": error is None, "error": str(error) if error else None}
+            for name, _, error in results
+        ]
+    
+    def _compare(self, repo_name: str, base_sha: str, head_sha: str) -> Dict:
+        """比较两个 SHA，返回领先/落后数量和分支最后提交时间"""
+        endpoint = f"/repos/{self.client.username}/{repo_name}/compare/{base_sha}...{head_sha}"
+        data = self.client._request("GET", endpoint)
+        
+        commits = data.get("commits", [])
+        if data["ahead_by"] == 0:
+            # 分支已完全包含在默认分支中，分支头即合并基点
+            head_commit = data["merge_base_commit"]
+        elif len(commits) == data["ahead_by"]:
+            head_commit = commits[-1]
+        else:
+            head_commit = self.client._request(
+                "GET", f"/repos/{self.client.username}/{repo_name}/commits/{head_sha}"
+            )
+        return {
+            "status": data["status"],
+            "ahead_by": data["ahead_by"],
+            "behind_by": data["behind_by"],
+            "last_commit": head_commit["commit"]["committer"]["date"]
+        }
+    
+    def resolve_ref(self, repo_name: str, branch: str) -> str:
+        """获取分支当前指向的 SHA"""
+        ref_data = self.client._request(
+            "GET",
+            f"/repos/{self.client.username}/{repo_name}/git/refs/heads/{quote(branch, safe='/')}"
+        )
+        return ref_data["object"]["sha"]
+    
+    def list(self, repo_name: str) -> List[Dict]:
+        """列出所有分支"""
+        branches = list(self.client.paginate(
+            f"/repos/{self.client.username}/{repo_name}/branches"
+        ))
+        print(f"\n找到 {len(branches)} 个分支:")
+        for branch in branches:
+            print(f"  - {branch['name']}")
+        return branches
+    
+    def _create_ref(self, repo_name: str, new_branch: str, sha: str) -> Dict:
+        data = {"ref": f"refs/heads/{new_branch}", "sha": sha}
+        result = self.client._request(
+            "POST",
+            f"/repos/{self.client.username}/{repo_name}/git/refs",
+            json=data
+        )
+        print(f"✓ 分支创建成功: {repo_name}:{new_branch}")
+        return result
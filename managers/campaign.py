@@ -0,0 +1,183 @@
+import base64
+from typing import Callable, Dict, List, Optional, Tuple
+from core.client import GitHubClient
+from core.exceptions import APIError, GitHubManagerError
+from utils.concurrency import run_concurrent
+from utils.progress import ProgressReporter
+
+# 文件转换函数: 当前内容（文件不存在时为 None） -> 新内容（None 表示不修改）
+Transform = Callable[[Optional[str]], Optional[str]]
+
+
+class UnreadableFile(GitHubManagerError):
+    """目标文件无法作为文本读取（过大、二进制、符号链接等）"""
+
+
+class CampaignManager:
+    """在多个仓库中应用同一个文件修改并创建 Pull Request"""
+    
+    def __init__(self, client: GitHubClient):
+        self.client = client
+    
+    def run(self, repos: List[Dict], path: str, transform: Transform,
+            branch: str, title: str, message: Optional[str] = None,
+            body: str = "", max_workers: int = 4,
+            dry_run: bool = False) -> List[Dict]:
+        """
+        对每个仓库: 读取文件 -> 转换 -> 创建提交和分支 -> 创建 PR
+        
+        转换结果与原内容相同的仓库会被跳过。已有同一分支的打开 PR 的仓库标记为
+        exists，分支已存在但没有 PR 的仓库更新分支后创建 PR，因此部分失败后可以
+        直接重新运行。所有写请求共享客户端的节流器，遇到速率限制时所有工作线程
+        一起暂停。
+        
+        Args:
+            repos: 仓库信息列表（需包含 name、default_branch）
+            path: 仓库中的文件路径
+            transform: 文件转换函数
+            branch: 新分支名称
+            title: PR 标题
+            message: 提交信息（默认与 PR 标题相同）
+            body: PR 描述
+            max_workers: 最大并发数
+            dry_run: 只检查哪些仓库需要修改，不写入
+        
+        Returns:
+            每个仓库的结果 (repo, status, url, error)，status 为
+            opened/exists/changed/skipped/failed
+        """
+        progress = ProgressReporter(len(repos), label="campaign")
+        # 读取文件和创建 tree 条目使用同一个规范化路径
+        path = path.strip("/")
+        
+        def apply(repo: Dict) -> Dict:
+            return self._apply(repo, path, transform, branch, title,
+                               message or title, body, dry_run)
+        
+        results = run_concurrent(
+            apply,
+            repos,
+            max_workers=max_workers,
+            on_done=lambda r: progress.advance(ok=r[2] is None)
+        )
+        
+        report = []
+        for repo, outcome, error in results:
+            if error:
+                outcome = {"status": "failed", "url": None, "error": str(error)}
+            report.append({"repo": repo["name"], **outcome})
+        
+        print(f"\n  {'仓库':<36} 结果")
+        for item in report:
+            detail = item.get("url") or item.get("error") or ""
+            print(f"  {item['repo']:<38} {item['status']:<8} {detail}")
+        counts = {}
+        for item in report:
+            counts[item["status"]] = counts.get(item["status"], 0) + 1
+        print(f"\n{progress.summary()}")
+        print("  " + "，".join(f"{status} {count}" for status, count in sorted(counts.items())))
+        return report
+    
+    def _apply(self, repo: Dict, path: str, transform: Transform, branch: str,
+               title: str, message: str, body: str, dry_run: bool) -> Dict:
+        owner = repo.get("owner", {}).get("login") or self.client.username
+        base = f"/repos/{owner}/{repo['name']}"
+        default_branch = repo["default_branch"]
+        request = self.client.request_with_retry
+        
+        # 重新运行时已开 PR 的仓库直接跳过，保证幂等
+        pulls = request("GET", f"{base}/pulls", params={
+            "head": f"{owner}:{branch}", "base": default_branch, "state": "open"
+        })
+        if pulls:
+            return {"status": "exists", "url": pulls[0]["html_url"], "error": None}
+        
+        head = request("GET", f"{base}/git/refs/heads/{default_branch}")
+        base_sha = head["object"]["sha"]
+        base_commit = request("GET", f"{base}/git/commits/{base_sha}")
+        
+        try:
+            current, mode = self._read_file(base, base_commit["tree"]["sha"], path)
+        except UnreadableFile as e:
+            return {"status": "skipped", "url": None, "error": str(e)}
+        updated = transform(current)
+        if updated is None or updated == current:
+            return {"status": "skipped", "url": None, "error": None}
+        if dry_run:
+            return {"status": "changed", "url": None, "error": None}
+        
+        # 内容直接放入 tree 条目，由服务端创建 blob，省去单独的 blob 请求；
+        # 沿用原文件的 mode，保留可执行位等
+        tree = request("POST", f"{base}/git/trees", json={
+            "base_tree": base_commit["tree"]["sha"],
+            "tree": [{"path": path, "mode": mode, "type": "blob", "content": updated}]
+        })
+        commit = request("POST", f"{base}/git/commits", json={
+            "message": message,
+            "tree": tree["sha"],
+            "parents": [base_sha]
+        })
+        
+        # 上次运行已创建分支但未开 PR 时，把分支强制更新到新提交
+        if self._branch_exists(base, branch):
+            request("PATCH", f"{base}/git/refs/heads/{branch}", json={
+                "sha": commit["sha"],
+                "force": True
+            })
+        else:
+            request("POST", f"{base}/git/refs", json={
+                "ref": f"refs/heads/{branch}",
+                "sha": commit["sha"]
+            })
+        pull = request("POST", f"{base}/pulls", json={
+            "title": title,
+            "head": branch,
+            "base": default_branch,
+            "body": body
+        })
+        return {"status": "opened", "url": pull["html_url"], "error": None}
+    
+    def _branch_exists(self, base: str, branch: str) -> bool:
+        try:
+            self.client.request_with_retry("GET", f"{base}/git/refs/heads/{branch}")
+        except APIError as e:
+            if e.status_code == 404:
+                return False
+            raise
+        return True
+    
+    def _read_file(self, base: str, tree_sha: str, path: str) -> Tuple[Optional[str], str]:
+        """
+        沿 tree 逐级定位文件，通过 blob 接口读取内容
+        
+        /contents 接口不返回超过 1 MB 文件的内容，blob 接口没有这个限制，并且
+        tree 条目带有文件的 mode。
+        
+        Returns:
+            (内容, mode)，文件不存在时内容为 None、mode 为 100644
+        """
+        request = self.client.request_with_retry
+        parts = path.split("/")
+        entry = None
+        for depth, name in enumerate(parts):
+            tree = request("GET", f"{base}/git/trees/{tree_sha}")
+            entry = next((item for item in tree["tree"] if item["path"] == name), None)
+            if entry is None:
+                return None, "100644"
+            if depth < len(parts) - 1:
+                if entry["type"] != "tree":
+                    return None, "100644"
+                tree_sha = entry["sha"]
+        
+        if entry["type"] != "blob" or entry["mode"] == "120000":
+            raise UnreadableFile(f"{path} 不是普通文件")
+        try:
+            blob = request("GET", f"{base}/git/blobs/{entry['sha']}")
+        except APIError as e:
+            if e.status_code in (403, 413, 422):
+                raise UnreadableFile(f"{path} 过大，无法读取")
+            raise
+        try:
+            return base64.b64decode(blob["content"]).decode("utf-8"), entry["mode"]
+        except UnicodeDecodeError:
+            raise UnreadableFile(f"{path} 不是 UTF-8 文本")
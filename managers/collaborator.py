@@ -0,0 +1,209 @@
+from typing import Dict, List, Optional, Tuple
+from core.client import GitHubClient
+from core.exceptions import GitHubManagerError
+from managers.repository import RepositoryManager
+from utils.concurrency import run_concurrent
+from utils.progress import ProgressReporter
+
+VALID_PERMISSIONS = ["pull", "push", "admin", "maintain", "triage"]
+
+# 协作者 role_name / 邀请 permissions 使用 read/write，PUT 接口使用 pull/push
+ROLE_TO_PERMISSION = {
+    "read": "pull",
+    "write": "push",
+    "pull": "pull",
+    "push": "push",
+    "triage": "triage",
+    "maintain": "maintain",
+    "admin": "admin",
+}
+PERMISSION_TO_INVITATION = {
+    "pull": "read",
+    "push": "write",
+    "triage": "triage",
+    "maintain": "maintain",
+    "admin": "admin",
+}
+
+
+class CollaboratorManager:
+    def __init__(self, client: GitHubClient):
+        self.client = client
+    
+    def add(self, repo_name: str, username: str,
+            permission: str = "push") -> Dict:
+        """添加协作者"""
+        if permission not in VALID_PERMISSIONS:
+            raise ValueError(f"无效的权限级别。有效值: {', '.join(VALID_PERMISSIONS)}")
+        
+        result = self.client._request(
+            "PUT",
+            f"/repos/{self.client.username}/{repo_name}/collaborators/{username}",
+            json={"permission": permission}
+        )
+        if result:
+            print(f"✓ 成功添加协作者: {username} (权限: {permission})")
+            print("  用户将收到邀请邮件，需要接受邀请后才能访问仓库")
+            return {"status": "invited", "username": username, "permission": permission}
+        print(f"✓ 成功更新协作者权限: {username} (权限: {permission})")
+        return {"status": "updated", "username": username, "permission": permission}
+    
+    def list(self, repo_name: str) -> List[Dict]:
+        """列出所有协作者"""
+        collaborators = list(self.client.paginate(
+            f"/repos/{self.client.username}/{repo_name}/collaborators"
+        ))
+        print(f"\n找到 {len(collaborators)} 个协作者:")
+        for collab in collaborators:
+            print(f"  - {collab['login']} (权限: {collab.get('role_name', collab.get('permissions', {}))})")
+        return collaborators
+    
+    def remove(self, repo_name: str, username: str) -> bool:
+        """移除协作者"""
+        self.client._request(
+            "DELETE",
+            f"/repos/{self.client.username}/{repo_name}/collaborators/{username}"
+        )
+        print(f"✓ 成功移除协作者: {username}")
+        return True
+    
+    def resolve_policy(self, policy: Dict) -> Tuple[Dict[str, Dict[str, str]], Dict[str, bool]]:
+        """
+        将策略展开为每个仓库的期望权限
+        
+        策略格式:
+            prune: false                # 默认是否移除策略之外的协作者
+            policies:
+              - repos: "team-*,!team-legacy"
+                collaborators:
+                  alice: push
+                  bob: admin
+                prune: true
+        
+        多条策略匹配同一仓库时合并，后面的条目覆盖前面的权限。
+        
+        Returns:
+            (仓库名 -> {用户名: 权限}, 仓库名 -> 是否 prune)
+        """
+        repo_manager = RepositoryManager(self.client)
+        inventory = repo_manager.inventory()
+        default_prune = bool(policy.get("prune", False))
+        
+        desired: Dict[str, Dict[str, str]] = {}
+        prune: Dict[str, bool] = {}
+        for entry in policy.get("policies") or []:
+            collaborators = entry.get("collaborators") or {}
+            for user, perm in collaborators.items():
+                if perm not in VALID_PERMISSIONS:
+                    raise GitHubManagerError(
+                        f"无效的权限级别 {user}: {perm}。有效值: {', '.join(VALID_PERMISSIONS)}"
+                    )
+            for repo in repo_manager.select(entry["repos"], inventory=inventory):
+                desired.setdefault(repo["name"], {}).update(collaborators)
+                prune[repo["name"]] = prune.get(repo["name"], False) or bool(
+                    entry.get("prune", default_prune)
+                )
+        return desired, prune
+    
+    def current_access(self, repo_name: str) -> Tuple[Dict[str, str], Dict[str, Dict]]:
+        """
+        获取仓库当前的直接协作者和待接受邀请（完整分页）
+        
+        Returns:
+            (用户名 -> 权限, 用户名 -> {id, permission})，用户名统一为小写
+        """
+        base = f"/repos/{self.client.username}/{repo_name}"
+        collaborators = {
+            c["login"].lower(): ROLE_TO_PERMISSION.get(c.get("role_name"), c.get("role_name"))
+            for c in self.client.paginate(f"{base}/collaborators", params={"affiliation": "direct"})
+        }
+        invitations = {
+            inv["invitee"]["login"].lower(): {
+                "id": inv["id"],
+                "permission": ROLE_TO_PERMISSION.get(inv["permissions"], inv["permissions"])
+            }
+            for inv in self.client.paginate(f"{base}/invitations")
+            if inv.get("invitee")
+        }
+        return collaborators, invitations
+    
+    def plan_access(self, desired: Dict[str, Dict[str, str]], prune: Dict[str, bool],
+                    max_workers: int = 8) -> List[Dict]:
+        """
+        计算期望权限与现状之间的最小变更
+        
+        Args:
+            desired: 仓库名 -> {用户名: 权限}
+            prune: 仓库名 -> 是否移除策略之外的协作者和邀请
+            max_workers: 并发读取的仓库数
+        
+        Returns:
+            变更列表，action 为 add/update/update-invitation/remove/cancel-invitation
+        """
+        repos = sorted(desired)
+        print(f"读取 {len(repos)} 个仓库的协作者和邀请...")
+        results = run_concurrent(self.current_access, repos, max_workers=max_workers)
+        
+        changes = []
+        owner = self.client.username.lower()
+        for repo, current, error in results:
+            if error:
+                raise GitHubManagerError(f"读取 {repo} 的协作者失败: {error}")
+            collaborators, invitations = current
+            wanted = {user.lower(): perm for user, perm in desired[repo].items()}
+            
+            for user, perm in sorted(wanted.items()):
+                if user in collaborators:
+                    if collaborators[user] != perm:
+                        changes.append({"repo": repo, "user": user, "action": "update",
+                                        "permission": perm, "from": collaborators[user]})
+                elif user in invitations:
+                    if invitations[user]["permission"] != perm:
+                        changes.append({"repo": repo, "user": user, "action": "update-invitation",
+                                        "permission": perm, "from": invitations[user]["permission"],
+                                        "invitation_id": invitations[user]["id"]})
+                else:
+                    changes.append({"repo": repo, "user": user, "action": "add", "permission": perm})
+            
+            if not prune.get(repo):
+                continue
+            for user, perm in sorted(collaborators.items()):
+                if user not in wanted and user != owner:
+                    changes.append({"repo": repo, "user": user, "action": "remove", "from": perm})
+            for user, invitation in sorted(invitations.items()):
+                if user not in wanted:
+                    changes.append({"repo": repo, "user": user, "action": "cancel-invitation",
+                                    "from": invitation["permission"],
+                                    "invitation_id": invitation["id"]})
+        return changes
+    
+    def apply_access(self, changes: List[Dict], max_workers: int = 4) -> List[Dict]:
+        """并发执行权限变更，写请求由客户端统一限速"""
+        progress = ProgressReporter(len(changes), label="reconcile-access")
+        results = run_concurrent(
+            self._apply_change,
+            changes,
+            max_workers=max_workers,
+            on_done=lambda r: progress.advance(ok=r[2] is None)
+        )
+        report = []
+        for change, _, error in results:
+            if error:
+                print(f"✗ {change['repo']} {change['action']} {change['user']} 失败: {error}")
+            report.append({**change, "ok": error is None, "error": str(error) if error else None})
+        print(f"\n{progress.summary()}")
+        return report
+    
+    def _apply_change(self, change: Dict) -> Optional[Dict]:
+        base = f"/repos/{self.client.username}/{change['repo']}"
+        request = self.client.request_with_retry
+        action = change["action"]
+        if action in ("add", "update"):
+            return request("PUT", f"{base}/collaborators/{change['user']}",
+                           json={"permission": change["permission"]})
+        if action == "update-invitation":
+            return request("PATCH", f"{base}/invitations/{change['invitation_id']}",
+                           json={"permissions": PERMISSION_TO_INVITATION[change["permission"]]})
+        if action == "remove":
+            return request("DELETE", f"{base}/collaborators/{change['user']}")
+        return request("DELETE", f"{base}/invitations/{change['invitation_id']}")
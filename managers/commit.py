@@ -0,0 +1,189 @@
+import json
+import os
+from datetime import datetime, timezone
+from typing import Dict, List, Optional
+from core.client import GitHubClient
+from core.exceptions import APIError
+from utils.storage import cache_path, read_json, write_json
+
+
+class CommitStore:
+    """
+    单个仓库分支的本地提交历史
+    
+    提交按获取顺序（旧 -> 新）追加到 JSONL 文件，元数据文件记录
+    最后同步到的 head SHA。追加时按 SHA 去重，追加后、更新元数据前中断时
+    再次同步不会产生重复提交。
+    """
+    
+    def __init__(self, owner: str, repo_name: str, branch: str):
+        self.data_path = cache_path("commits", owner, repo_name, f"{branch}.jsonl")
+        self.meta_path = cache_path("commits", owner, repo_name, f"{branch}.meta.json")
+        self.meta = read_json(self.meta_path, default={})
+    
+    @property
+    def head_sha(self) -> Optional[str]:
+        return self.meta.get("head_sha")
+    
+    def append(self, commits: List[Dict], head_sha: str):
+        """追加提交（旧 -> 新，已存在的 SHA 跳过）并更新 head SHA"""
+        known = self._shas()
+        with open(self.data_path, "a", encoding="utf-8") as f:
+            for commit in commits:
+                if commit["sha"] in known:
+                    continue
+                known.add(commit["sha"])
+                f.write(json.dumps(commit, ensure_ascii=False) + "\n")
+        self._save_meta(head_sha, len(known))
+    
+    def replace(self, commits: List[Dict], head_sha: str):
+        """用完整历史（旧 -> 新）覆盖本地数据"""
+        tmp_path = f"{self.data_path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            for commit in commits:
+                f.write(json.dumps(commit, ensure_ascii=False) + "\n")
+        os.replace(tmp_path, self.data_path)
+        self._save_meta(head_sha, len(commits))
+    
+    def read(self, limit: Optional[int] = None) -> List[Dict]:
+        """读取本地历史（新 -> 旧），limit 为空时返回全部"""
+        if not os.path.exists(self.data_path):
+            return []
+        with open(self.data_path, "r", encoding="utf-8") as f:
+            lines = f.readlines()
+        lines.reverse()
+        if limit:
+            lines = lines[:limit]
+        return [json.loads(line) for line in lines]
+    
+    def _shas(self) -> set:
+        if not os.path.exists(self.data_path):
+            return set()
+        with open(self.data_path, "r", encoding="utf-8") as f:
+            return {json.loads(line)["sha"] for line in f if line.strip()}
+    
+    def _save_meta(self, head_sha: str, count: int):
+        self.meta = {
+            "head_sha": head_sha,
+            "count": count,
+            "synced_at": datetime.now(timezone.utc).isoformat()
+        }
+        write_json(self.meta_path, self.meta)
+
+
+class CommitManager:
+    def __init__(self, client: GitHubClient):
+        self.client = client
+    
+    def list(self, repo_name: str, branch: str = "main",
+             limit: int = 10) -> List[Dict]:
+        """列出提交历史"""
+        params = {"sha": branch, "per_page": limit}
+        commits = self.client._request(
+            "GET",
+            f"/repos/{self.client.username}/{repo_name}/commits",
+            params=params
+        )
+        self._print([self._compact(c) for c in commits])
+        return commits
+    
+    def sync(self, repo_name: str, branch: str = "main") -> int:
+        """
+        增量同步分支提交历史到本地
+        
+        先读取分支 ref 得到当前头部 SHA（未变化时不再请求），已有本地历史时
+        使用 compare API 只获取 上次 head...当前头部 之间的新提交；分支被强制
+        推送（历史不再包含上次 head，或上次 head 已不存在）时重新完整同步。
+        本地记录的 head 始终是分支 ref 指向的 SHA。
+        
+        Returns:
+            新增的提交数量
+        """
+        owner = self.client.username
+        store = CommitStore(owner, repo_name, branch)
+        
+        ref = self.client._request("GET", f"/repos/{owner}/{repo_name}/git/refs/heads/{branch}")
+        tip = ref["object"]["sha"]
+        
+        if store.head_sha == tip:
+            print(f"✓ 本地历史已是最新: {branch} ({store.meta.get('count', 0)} 个提交)")
+            return 0
+        if store.head_sha:
+            try:
+                comparison = self.client._request(
+                    "GET",
+                    f"/repos/{owner}/{repo_name}/compare/{store.head_sha}...{tip}",
+                    params={"per_page": 1}
+                )
+                status = comparison["status"]
+            except APIError as e:
+                # 强制推送后上次的 head 可能已被回收
+                if e.status_code != 404:
+                    raise
+                status = "missing"
+            if status == "ahead":
+                new_commits = self._compare_commits(
+                    repo_name, store.head_sha, tip, comparison["total_commits"]
+                )
+                store.append(new_commits, tip)
+                print(f"✓ 增量同步完成: {branch} 新增 {len(new_commits)} 个提交")
+                return len(new_commits)
+            print(f"分支历史已改写 ({status})，重新完整同步: {branch}")
+        
+        commits = [
+            self._compact(c)
+            for c in self.client.paginate(
+                f"/repos/{owner}/{repo_name}/commits",
+                params={"sha": tip}
+            )
+        ]
+        commits.reverse()
+        store.replace(commits, tip)
+        print(f"✓ 完整同步完成: {branch} 共 {len(commits)} 个提交")
+        return len(commits)
+    
+    def history(self, repo_name: str, branch: str = "main",
+                limit: Optional[int] = None, refresh: bool = True) -> List[Dict]:
+        """从本地存储读取提交历史（新 -> 旧），refresh=True 时先增量同步"""
+        if refresh:
+            self.sync(repo_name, branch)
+        commits = CommitStore(self.client.username, repo_name, branch).read(limit)
+        self._print(commits)
+        return commits
+    
+    def _compare_commits(self, repo_name: str, base: str, head: str,
+                         total: int) -> List[Dict]:
+        """分页读取 compare 结果中的提交（旧 -> 新）"""
+        endpoint = f"/repos/{self.client.username}/{repo_name}/compare/{base}...{head}"
+        commits = []
+        page = 1
+        while len(commits) < total:
+            data = self.client._request(
+                "GET", endpoint, params={"per_page": 100, "page": page}
+            )
+            batch = data.get("commits", [])
+            if not batch:
+                break
+            commits.extend(self._compact(c) for c in batch)
+            page += 1
+        return commits
+    
+    @staticmethod
+    def _compact(commit: Dict) -> Dict:
+        """只保留本地存储需要的字段"""
+        author = commit["commit"]["author"]
+        return {
+            "sha": commit["sha"],
+            "message": commit["commit"]["message"],
+            "author": author["name"],
+            "email": author.get("email"),
+            "date": author["date"],
+            "parents": [p["sha"] for p in commit.get("parents", [])]
+        }
+    
+    @staticmethod
+    def _print(commits: List[Dict]):
+        print(f"\n最近 {len(commits)} 次提交:")
+        for commit in commits:
+            message = commit["message"].split('\n')[0]
+            print(f"  {commit['sha'][:7]} - {message} ({commit['author']}, {commit['date']})")
@@ -0,0 +1,116 @@
+import time
+from typing import Dict, List, Optional, Tuple
+from core.client import GitHubClient
+from managers.repository import RepositoryManager
+from managers.workflow import status_icon
+from utils.concurrency import run_concurrent
+
+# (仓库, workflow ID) -> 最新运行摘要；workflow 名称可能重复或被改名，只用于显示
+Rows = Dict[Tuple[str, int], Dict]
+
+
+class DashboardManager:
+    """多仓库 Actions 状态看板：并发获取每个 workflow 的最新运行"""
+    
+    def __init__(self, client: GitHubClient):
+        self.client = client
+        self.repo_manager = RepositoryManager(client)
+    
+    def collect(self, repos: List[Dict], max_workers: int = 16) -> Rows:
+        """
+        并发获取各仓库每个启用的 workflow 的最新运行
+        
+        每个仓库读取 workflow 列表和最近 100 个运行（均为条件请求，未变化时为
+        304），只有最近运行中没有出现的 workflow 才单独查询最新一次运行。
+        """
+        results = run_concurrent(self._repo_rows, repos, max_workers=max_workers)
+        rows: Rows = {}
+        for repo, repo_rows, error in results:
+            if error:
+                rows[(repo["full_name"], 0)] = {"workflow": "-", "status": "error", "conclusion": None,
+                                                "branch": "", "updated_at": "", "error": str(error)}
+                continue
+            rows.update(repo_rows)
+        return rows
+    
+    def _repo_rows(self, repo: Dict) -> Rows:
+        base = f"/repos/{repo['full_name']}/actions"
+        workflows, _ = self.client.conditional_get(f"{base}/workflows", params={"per_page": 100})
+        active = [wf for wf in workflows.get("workflows", []) if wf["state"] == "active"]
+        if not active:
+            return {}
+        
+        recent, _ = self.client.conditional_get(f"{base}/runs", params={"per_page": 100})
+        latest: Dict[int, Dict] = {}
+        for run in recent.get("workflow_runs", []):
+            latest.setdefault(run["workflow_id"], run)
+        
+        rows: Rows = {}
+        for wf in active:
+            run = latest.get(wf["id"])
+            if run is None:
+                data, _ = self.client.conditional_get(
+                    f"{base}/workflows/{wf['id']}/runs", params={"per_page": 1}
+                )
+                runs = data.get("workflow_runs", [])
+                if not runs:
+                    continue
+                run = runs[0]
+            rows[(repo["full_name"], wf["id"])] = {
+                "workflow": wf["name"],
+                "status": run["status"],
+                "conclusion": run.get("conclusion"),
+                "branch": run.get("head_branch") or "",
+                "updated_at": run["updated_at"],
+                "run_id": run["id"],
+                "url": run["html_url"],
+            }
+        return rows
+    
+    def show(self, selector: str = "*", max_workers: int = 16,
+             refresh: Optional[float] = None, failing_only: bool = False) -> Rows:
+        """
+        输出看板；refresh 不为空时每隔 refresh 秒刷新，只输出变化的行（Ctrl+C 退出）
+        
+        仓库列表只在启动时获取一次，刷新时依赖 ETag，未变化的仓库只消耗 304 请求。
+        """
+        repos = self.repo_manager.select(selector)
+        print(f"看板: {len(repos)} 个仓库")
+        previous: Rows = {}
+        first = True
+        while True:
+            start = time.monotonic()
+            rows = self.collect(repos, max_workers=max_workers)
+            if failing_only:
+                rows = {key: row for key, row in rows.items()
+                        if row["status"] == "error"
+                        or row["conclusion"] not in (None, "success", "skipped", "neutral")}
+            changed = {key: row for key, row in rows.items() if previous.get(key) != row}
+            removed = [key for key in previous if key not in rows]
+            elapsed = time.monotonic() - start
+            
+            if first:
+                self._print_rows(rows)
+                print(f"\n{len(rows)} 个 workflow，耗时 {elapsed:.1f}s")
+            elif changed or removed:
+                print(f"\n[{time.strftime('%H:%M:%S')}] {len(changed)} 行变化:")
+                self._print_rows(changed)
+                for key in removed:
+                    print(f"  - {key[0]:<40} {previous[key]['workflow'][:32]:<32} (已移除)")
+            previous = rows
+            first = False
+            
+            if refresh is None:
+                return rows
+            time.sleep(max(refresh - elapsed, 0))
+    
+    @staticmethod
+    def _print_rows(rows: Rows):
+        ordered = sorted(rows.items(), key=lambda item: (item[0][0], item[1]["workflow"], item[0][1]))
+        for (repo, _), row in ordered:
+            if row["status"] == "error":
+                print(f"  ✗ {repo:<40} {'-':<32} 读取失败: {row['error']}")
+                continue
+            result = row["conclusion"] or row["status"]
+            print(f"  {status_icon(row['status'], row['conclusion'])} {repo:<40} "
+                  f"{row['workflow'][:32]:<32} {result:<12} {row['branch'][:20]:<20} {row['updated_at']}")
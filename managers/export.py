@@ -0,0 +1,140 @@
+import itertools
+import time
+from typing import Dict, Iterator, Optional
+from core.client import GitHubClient
+from managers.workflow import WorkflowManager
+from utils.columnar import ColumnarWriter, resolve_format
+from utils.timeutil import parse_timestamp
+
+COMMIT_SCHEMA = [
+    ("sha", "str"),
+    ("author", "dict"),
+    ("email", "dict"),
+    ("date", "int64"),
+    ("message", "str"),
+]
+
+RUN_SCHEMA = [
+    ("id", "int64"),
+    ("run_number", "int64"),
+    ("run_attempt", "int64"),
+    ("workflow_id", "int64"),
+    ("name", "dict"),
+    ("event", "dict"),
+    ("status", "dict"),
+    ("conclusion", "dict"),
+    ("head_branch", "dict"),
+    ("head_sha", "str"),
+    ("actor", "dict"),
+    ("created_at", "int64"),
+    ("run_started_at", "int64"),
+    ("updated_at", "int64"),
+]
+
+JOB_SCHEMA = [
+    ("id", "int64"),
+    ("run_id", "int64"),
+    ("run_attempt", "int64"),
+    ("name", "dict"),
+    ("status", "dict"),
+    ("conclusion", "dict"),
+    ("runner_name", "dict"),
+    ("created_at", "int64"),
+    ("started_at", "int64"),
+    ("completed_at", "int64"),
+]
+
+
+def commit_row(commit: Dict) -> Dict:
+    author = commit["commit"]["author"]
+    return {
+        "sha": commit["sha"],
+        "author": author["name"],
+        "email": author.get("email"),
+        "date": parse_timestamp(author["date"]),
+        "message": commit["commit"]["message"],
+    }
+
+
+def run_row(run: Dict) -> Dict:
+    return {
+        "id": run["id"],
+        "run_number": run.get("run_number"),
+        "run_attempt": run.get("run_attempt"),
+        "workflow_id": run.get("workflow_id"),
+        "name": run.get("name"),
+        "event": run.get("event"),
+        "status": run.get("status"),
+        "conclusion": run.get("conclusion"),
+        "head_branch": run.get("head_branch"),
+        "head_sha": run.get("head_sha"),
+        "actor": (run.get("actor") or {}).get("login"),
+        "created_at": parse_timestamp(run.get("created_at")),
+        "run_started_at": parse_timestamp(run.get("run_started_at")),
+        "updated_at": parse_timestamp(run.get("updated_at")),
+    }
+
+
+def job_row(job: Dict) -> Dict:
+    return {
+        "id": job["id"],
+        "run_id": job["run_id"],
+        "run_attempt": job.get("run_attempt"),
+        "name": job.get("name"),
+        "status": job.get("status"),
+        "conclusion": job.get("conclusion"),
+        "runner_name": job.get("runner_name"),
+        "created_at": parse_timestamp(job.get("created_at")),
+        "started_at": parse_timestamp(job.get("started_at")),
+        "completed_at": parse_timestamp(job.get("completed_at")),
+    }
+
+
+class ExportManager:
+    """将提交、运行记录和 jobs 流式导出为列式文件"""
+    
+    def __init__(self, client: GitHubClient):
+        self.client = client
+        self.workflow_manager = WorkflowManager(client)
+    
+    def export_commits(self, repo_name: str, output: str, branch: str = "main",
+                       limit: Optional[int] = None, fmt: str = "auto") -> int:
+        """导出分支提交历史"""
+        commits = self.client.paginate(
+            f"/repos/{self.client.username}/{repo_name}/commits",
+            params={"sha": branch}
+        )
+        rows = (commit_row(c) for c in itertools.islice(commits, limit))
+        return self._export("提交", rows, COMMIT_SCHEMA, output, fmt)
+    
+    def export_runs(self, repo_name: str, output: str,
+                    workflow_id: Optional[str] = None, status: Optional[str] = None,
+                    branch: Optional[str] = None, limit: Optional[int] = None,
+                    fmt: str = "auto") -> int:
+        """导出 workflow 运行记录"""
+        runs = self.workflow_manager.iter_runs(repo_name, workflow_id, status, branch)
+        rows = (run_row(r) for r in itertools.islice(runs, limit))
+        return self._export("运行记录", rows, RUN_SCHEMA, output, fmt)
+    
+    def export_jobs(self, repo_name: str, output: str,
+                    workflow_id: Optional[str] = None, status: Optional[str] = None,
+                    branch: Optional[str] = None, limit: Optional[int] = None,
+                    fmt: str = "auto") -> int:
+        """导出最近 limit 个运行中的全部 jobs（含历次重试）"""
+        runs = self.workflow_manager.iter_runs(repo_name, workflow_id, status, branch)
+        rows = (
+            job_row(job)
+            for run in itertools.islice(runs, limit)
+            for job in self.workflow_manager.iter_jobs(repo_name, run["id"], attempts="all")
+        )
+        return self._export("Job", rows, JOB_SCHEMA, output, fmt)
+    
+    def _export(self, label: str, rows: Iterator[Dict], schema, output: str,
+                fmt: str) -> int:
+        fmt = resolve_format(fmt)
+        start = time.monotonic()
+        with ColumnarWriter(output, schema, fmt=fmt) as writer:
+            count = writer.write_all(rows)
+        elapsed = time.monotonic() - start
+        print(f"✓ 已导出 {count} 条{label} ({fmt}): {output} ({elapsed:.1f}s)")
+        return count
@@ -0,0 +1,398 @@
+import csv
+import json
+import os
+import sqlite3
+import time
+from typing import Dict, Iterator, List, Optional
+from core.client import GitHubClient
+from core.exceptions import APIError, GitHubManagerError, RateLimitError
+from utils.progress import ProgressReporter
+from utils.storage import cache_path, read_json, write_json
+
+# 导入 Issue 时允许的字段
+ISSUE_FIELDS = ("title", "body", "labels", "assignees", "milestone")
+
+
+def read_issue_records(path: str) -> Iterator[Dict]:
+    """
+    流式读取待导入的 Issue 记录
+    
+    .jsonl: 每行一个 JSON 对象
+    .csv:   表头包含 title、body、labels、assignees、milestone，多个标签/负责人用 ; 分隔
+    
+    milestone 为里程碑编号（API 要求整数），非数字时报错。
+    """
+    with open(path, "r", encoding="utf-8", newline="") as f:
+        if path.endswith(".csv"):
+            for number, row in enumerate(csv.DictReader(f), 2):
+                record = {k: v for k, v in row.items() if k in ISSUE_FIELDS and v}
+                for field in ("labels", "assignees"):
+                    if field in record:
+                        record[field] = [x.strip() for x in record[field].split(";") if x.strip()]
+                yield _milestone_number(record, f"{path}:{number}")
+        else:
+            for number, line in enumerate(f, 1):
+                if line.strip():
+                    yield _milestone_number(json.loads(line), f"{path}:{number}")
+
+
+def _milestone_number(record: Dict, where: str) -> Dict:
+    milestone = record.get("milestone")
+    if milestone is None or isinstance(milestone, int):
+        return record
+    if not str(milestone).strip().isdigit():
+        raise GitHubManagerError(f"milestone 应为里程碑编号: {milestone!r} ({where})")
+    record["milestone"] = int(milestone)
+    return record
+
+
+class IssueStore:
+    """
+    仓库 Issue / PR / 评论的本地 SQLite 镜像
+    
+    meta 表记录增量同步的 since 水位和首页 ETag。
+    """
+    
+    def __init__(self, owner: str, repo_name: str):
+        self.path = cache_path("issues", owner, f"{repo_name}.sqlite")
+        self.db = sqlite3.connect(self.path)
+        self.db.row_factory = sqlite3.Row
+        self.db.executescript("""
+            CREATE TABLE IF NOT EXISTS issues (
+                number INTEGER PRIMARY KEY,
+                is_pr INTEGER NOT NULL,
+                state TEXT NOT NULL,
+                title TEXT,
+                author TEXT,
+                assignees TEXT,
+                comments INTEGER,
+                created_at TEXT,
+                updated_at TEXT,
+                closed_at TEXT,
+                merged_at TEXT,
+                body TEXT
+            );
+            CREATE TABLE IF NOT EXISTS issue_labels (
+                number INTEGER NOT NULL,
+                label TEXT NOT NULL,
+                PRIMARY KEY (number, label)
+            );
+            CREATE TABLE IF NOT EXISTS comments (
+                id INTEGER PRIMARY KEY,
+                number INTEGER NOT NULL,
+                author TEXT,
+                created_at TEXT,
+                updated_at TEXT,
+                body TEXT
+            );
+            CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT);
+            CREATE INDEX IF NOT EXISTS idx_issues_updated ON issues (updated_at);
+            CREATE INDEX IF NOT EXISTS idx_labels_label ON issue_labels (label);
+            CREATE INDEX IF NOT EXISTS idx_comments_number ON comments (number);
+        """)
+    
+    def get_meta(self, key: str) -> Optional[str]:
+        row = self.db.execute("SELECT value FROM meta WHERE key = ?", (key,)).fetchone()
+        return row["value"] if row else None
+    
+    def set_meta(self, key: str, value: Optional[str]):
+        self.db.execute("INSERT OR REPLACE INTO meta VALUES (?, ?)", (key, value))
+    
+    def upsert_issues(self, issues: List[Dict]):
+        for issue in issues:
+            pull = issue.get("pull_request") or {}
+            self.db.execute(
+                "INSERT OR REPLACE INTO issues VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (
+                    issue["number"],
+                    1 if "pull_request" in issue else 0,
+                    issue["state"],
+                    issue["title"],
+                    (issue.get("user") or {}).get("login"),
+                    ",".join(a["login"] for a in issue.get("assignees") or []),
+                    issue.get("comments", 0),
+                    issue["created_at"],
+                    issue["updated_at"],
+                    issue.get("closed_at"),
+                    pull.get("merged_at"),
+                    issue.get("body"),
+                )
+            )
+            self.db.execute("DELETE FROM issue_labels WHERE number = ?", (issue["number"],))
+            self.db.executemany(
+                "INSERT INTO issue_labels VALUES (?, ?)",
+                [(issue["number"], label["name"]) for label in issue.get("labels") or []]
+            )
+    
+    def upsert_comments(self, comments: List[Dict]):
+        self.db.executemany(
+            "INSERT OR REPLACE INTO comments VALUES (?, ?, ?, ?, ?, ?)",
+            [
+                (
+                    c["id"],
+                    int(c["issue_url"].rsplit("/", 1)[1]),
+                    (c.get("user") or {}).get("login"),
+                    c["created_at"],
+                    c["updated_at"],
+                    c.get("body"),
+                )
+                for c in comments
+            ]
+        )
+    
+    def query(self, state: str = "open", kind: str = "all",
+              label: Optional[str] = None, author: Optional[str] = None,
+              assignee: Optional[str] = None, search: Optional[str] = None,
+              updated_since: Optional[str] = None, limit: Optional[int] = None) -> List[sqlite3.Row]:
+        """按条件查询本地镜像，结果按更新时间倒序"""
+        sql = "SELECT * FROM issues WHERE 1 = 1"
+        params: List = []
+        if state != "all":
+            sql += " AND state = ?"
+            params.append(state)
+        if kind != "all":
+            sql += " AND is_pr = ?"
+            params.append(1 if kind == "pr" else 0)
+        if label:
+            sql += " AND number IN (SELECT number FROM issue_labels WHERE label = ?)"
+            params.append(label)
+        if author:
+            sql += " AND author = ?"
+            params.append(author)
+        if assignee:
+            sql += " AND (',' || assignees || ',') LIKE ?"
+            params.append(f"%,{assignee},%")
+        if search:
+            sql += " AND (title LIKE ? OR body LIKE ?)"
+            params.extend([f"%{search}%"] * 2)
+        if updated_since:
+            sql += " AND updated_at >= ?"
+            params.append(updated_since)
+        sql += " ORDER BY updated_at DESC"
+        if limit:
+            sql += " LIMIT ?"
+            params.append(limit)
+        return self.db.execute(sql, params).fetchall()
+    
+    def labels(self, number: int) -> List[str]:
+        rows = self.db.execute(
+            "SELECT label FROM issue_labels WHERE number = ? ORDER BY label", (number,)
+        )
+        return [row["label"] for row in rows]
+    
+    def commit(self):
+        self.db.commit()
+    
+    def close(self):
+        self.db.close()
+
+
+class IssuePRManager:
+    def __init__(self, client: GitHubClient):
+        self.client = client
+    
+    def create_issue(self, repo_name: str, title: str,
+                     body: str = "", labels: List[str] = None) -> Dict:
+        """创建 Issue"""
+        data = {"title": title, "body": body}
+        if labels:
+            data["labels"] = labels
+        
+        result = self.client._request(
+            "POST",
+            f"/repos/{self.client.username}/{repo_name}/issues",
+            json=data
+        )
+        print(f"✓ Issue 创建成功: {result['html_url']}")
+        return result
+    
+    def create_pull_request(self, repo_name: str, title: str,
+                            head: str, base: str = "main",
+                            body: str = "") -> Dict:
+        """创建 Pull Request"""
+        data = {"title": title, "head": head, "base": base, "body": body}
+        result = self.client._request(
+            "POST",
+            f"/repos/{self.client.username}/{repo_name}/pulls",
+            json=data
+        )
+        print(f"✓ Pull Request 创建成功: {result['html_url']}")
+        return result
+    
+    def sync(self, repo_name: str) -> int:
+        """
+        增量同步 Issue、PR 和评论到本地镜像
+        
+        Issue 和评论各自维护水位，使用 since=上次最大 updated_at、sort=updated
+        只获取变化的数据（编辑已有评论不会改变 Issue 的 updated_at，因此评论
+        单独同步）。since 是闭区间，updated_at 等于水位的数据是上次已同步的
+        边界数据，不计为变化。ETag 与签发它的查询参数一起保存，参数相同（水位
+        未移动）时首页带 If-None-Match，无变化时每个列表只消耗一次 304 请求。
+        
+        Returns:
+            本次更新的 Issue/PR 数量
+        """
+        owner = self.client.username
+        store = IssueStore(owner, repo_name)
+        try:
+            updated = self._sync_list(
+                store, f"/repos/{owner}/{repo_name}/issues",
+                {"state": "all", "sort": "updated", "direction": "asc"},
+                "since", "etag", store.upsert_issues
+            )
+            comments = self._sync_list(
+                store, f"/repos/{owner}/{repo_name}/issues/comments",
+                {"sort": "updated", "direction": "asc"},
+                "comments_since", "comments_etag", store.upsert_comments
+            )
+            store.commit()
+            if updated is None and comments is None:
+                print(f"✓ 本地镜像已是最新: {repo_name} (304)")
+                return 0
+            print(f"✓ 同步完成: {repo_name} 更新 {updated or 0} 个 Issue/PR，{comments or 0} 条评论")
+            return updated or 0
+        finally:
+            store.close()
+    
+    def _sync_list(self, store: IssueStore, endpoint: str, params: Dict,
+                   since_key: str, etag_key: str, upsert) -> Optional[int]:
+        """按水位增量同步一个列表接口，返回变化的条数，304 时返回 None"""
+        since = store.get_meta(since_key)
+        params = dict(params)
+        if since:
+            params["since"] = since
+        cached = json.loads(store.get_meta(etag_key) or "{}")
+        headers = None
+        if cached.get("etag") and cached.get("params") == params:
+            headers = {"If-None-Match": cached["etag"]}
+        
+        changed = 0
+        watermark = since
+        new_etag = None
+        for response, items in self.client.iter_pages(endpoint, params=params, headers=headers):
+            if response.status_code == 304:
+                return None
+            new_etag = new_etag or response.headers.get("ETag")
+            upsert(items)
+            for item in items:
+                if since and item["updated_at"] <= since:
+                    continue
+                changed += 1
+                watermark = max(watermark or "", item["updated_at"])
+        
+        store.set_meta(since_key, watermark)
+        store.set_meta(etag_key, json.dumps({"params": params, "etag": new_etag}) if new_etag else None)
+        return changed
+    
+    def query(self, repo_name: str, **filters) -> List[Dict]:
+        """查询本地镜像（不访问 API），filters 见 IssueStore.query"""
+        store = IssueStore(self.client.username, repo_name)
+        try:
+            rows = store.query(**filters)
+            results = []
+            print(f"\n找到 {len(rows)} 个 Issue/PR:")
+            for row in rows:
+                labels = store.labels(row["number"])
+                kind = "PR" if row["is_pr"] else "Issue"
+                label_text = f" [{', '.join(labels)}]" if labels else ""
+                print(f"  #{row['number']} ({kind}, {row['state']}) {row['title']}{label_text}")
+                print(f"      作者: {row['author']}  更新: {row['updated_at']}  评论: {row['comments']}")
+                results.append({**dict(row), "labels": labels})
+            return results
+        finally:
+            store.close()
+    
+    def import_issues(self, repo_name: str, source: str, restart: bool = False,
+                      max_retries: int = 5) -> Dict:
+        """
+        从 JSONL/CSV 文件批量导入 Issue
+        
+        记录按顺序逐条创建（保持 Issue 编号与源数据顺序一致），写请求由客户端
+        节流器统一限速；遇到速率限制时按 Retry-After 暂停后重试同一条记录。
+        每条记录完成后写入检查点，中断后再次运行会从断点继续。
+        
+        Returns:
+            检查点状态 (next, created, failed)
+        """
+        checkpoint_file = cache_path(
+            "checkpoints", "import-issues", self.client.username, repo_name,
+            f"{os.path.basename(source)}.json"
+        )
+        state = {} if restart else read_json(checkpoint_file, default={})
+        start = state.get("next", 0)
+        state.setdefault("created", 0)
+        state.setdefault("failed", [])
+        
+        total = sum(1 for _ in read_issue_records(source))
+        if start >= total:
+            print(f"✓ 已全部导入 ({total} 条)，使用 --restart 重新导入")
+            return state
+        if start:
+            print(f"从检查点继续: 第 {start + 1}/{total} 条")
+        
+        progress = ProgressReporter(total - start, label="import-issues")
+        for index, record in enumerate(read_issue_records(source)):
+            if index < start:
+                continue
+            
+            data = {k: record[k] for k in ISSUE_FIELDS if record.get(k)}
+            try:
+                issue = self._post_with_retry(repo_name, data, max_retries)
+                state["created"] += 1
+                state["last_issue"] = issue["number"]
+                ok = True
+            except RateLimitError:
+                raise
+            except APIError as e:
+                # 422 等数据错误不重试，记录后继续
+                if e.status_code is None:
+                    raise
+                state["failed"].append({"index": index, "title": data.get("title"), "error": str(e)})
+                print(f"✗ 第 {index + 1} 条导入失败: {e}")
+                ok = False
+            
+            state["next"] = index + 1
+            write_json(checkpoint_file, state)
+            progress.advance(ok=ok)
+        
+        print(f"\n{progress.summary()}")
+        print(f"检查点: {checkpoint_file}")
+        return state
+    
+    def _post_with_retry(self, repo_name: str, data: Dict,
+                         max_retries: int) -> Dict:
+        """
+        创建单个 Issue，速率限制或网络错误时退避重试
+        
+        网络错误或 5xx 时 Issue 可能已经创建而响应丢失，重发前先在本人最近
+        创建的 Issue 中按标题和正文查找，找到则视为已创建。
+        """
+        endpoint = f"/repos/{self.client.username}/{repo_name}/issues"
+        for attempt in range(max_retries + 1):
+            try:
+                return self.client.request_with_retry(
+                    "POST", endpoint, max_retries=max_retries, json=data
+                )
+            except RateLimitError:
+                raise
+            except APIError as e:
+                if attempt == max_retries or not (e.status_code is None or e.status_code >= 500):
+                    raise
+                time.sleep(2 ** attempt)
+                existing = self._find_created(repo_name, data)
+                if existing:
+                    print(f"  已存在刚创建的 Issue #{existing['number']}，不再重发")
+                    return existing
+    
+    def _find_created(self, repo_name: str, data: Dict) -> Optional[Dict]:
+        """在本人最近创建的 Issue 中查找标题和正文相同的一条"""
+        recent = self.client.request_with_retry(
+            "GET",
+            f"/repos/{self.client.username}/{repo_name}/issues",
+            params={"creator": self.client.username, "state": "all",
+                    "sort": "created", "direction": "desc", "per_page": 30}
+        )
+        for issue in recent:
+            if issue["title"] == data.get("title") and (issue.get("body") or "") == (data.get("body") or ""):
+                return issue
+        return None
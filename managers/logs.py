@@ -0,0 +1,257 @@
+import os
+import re
+import sqlite3
+from typing import Dict, Iterator, List, Optional, Tuple
+from core.client import GitHubClient
+from managers.workflow import WorkflowManager
+from utils.storage import cache_path
+
+# 作业日志每行以 ISO 时间戳开头，如 2024-05-01T12:00:01.1234567Z
+LINE_PATTERN = re.compile(r"^(\d{4}-\d\d-\d\dT\d\d:\d\d:\d\d)\S*Z (.*)$")
+
+# 需要高亮的错误行
+ERROR_PATTERN = re.compile(
+    r"##\[error\]|\b(error|errors|fail|failed|failure|fatal|exception|traceback|panic)\b",
+    re.IGNORECASE
+)
+
+FAILED_CONCLUSIONS = ("failure", "timed_out")
+
+
+def split_steps(path: str, steps: List[Dict]) -> Iterator[Tuple[int, Optional[int], str]]:
+    """
+    逐行读取作业日志，按时间戳把每行归到对应步骤
+    
+    步骤的 started_at/completed_at 只精确到秒，边界秒内的行归到先开始的步骤。
+    
+    Returns:
+        (行号, 步骤序号, 去掉时间戳的文本) 迭代器
+    """
+    windows = [
+        (step["started_at"][:19], step["completed_at"][:19], step["number"])
+        for step in steps
+        if step.get("started_at") and step.get("completed_at")
+    ]
+    current_step = None
+    with open(path, "r", encoding="utf-8", errors="replace") as f:
+        for lineno, line in enumerate(f, 1):
+            line = line.rstrip("\n").lstrip("\ufeff")
+            match = LINE_PATTERN.match(line)
+            if match:
+                second, line = match.groups()
+                current_step = next(
+                    (number for start, end, number in windows if start <= second <= end),
+                    current_step
+                )
+            yield lineno, current_step, line
+
+
+class LogIndex:
+    """
+    已下载作业日志的本地全文索引
+    
+    lines 表按作业保存日志行（带步骤序号），lines_fts 是以 lines 为外部内容的
+    SQLite FTS5 倒排索引。搜索和重复查看失败日志都不需要再次下载。
+    只有 logs failures 下载的失败作业日志会写入索引，get-logs 下载的整份
+    运行日志 ZIP 不会写入。
+    """
+    
+    def __init__(self, owner: str, repo_name: str):
+        self.path = cache_path("logs", owner, repo_name, "index.sqlite")
+        self.db = sqlite3.connect(self.path)
+        self.db.row_factory = sqlite3.Row
+        self.db.executescript("""
+            CREATE TABLE IF NOT EXISTS runs (
+                run_id INTEGER PRIMARY KEY,
+                name TEXT,
+                conclusion TEXT,
+                created_at TEXT
+            );
+            CREATE TABLE IF NOT EXISTS jobs (
+                job_id INTEGER PRIMARY KEY,
+                run_id INTEGER NOT NULL,
+                name TEXT
+            );
+            CREATE TABLE IF NOT EXISTS steps (
+                job_id INTEGER NOT NULL,
+                number INTEGER NOT NULL,
+                name TEXT,
+                PRIMARY KEY (job_id, number)
+            );
+            CREATE TABLE IF NOT EXISTS lines (
+                id INTEGER PRIMARY KEY,
+                job_id INTEGER NOT NULL,
+                step INTEGER,
+                lineno INTEGER NOT NULL,
+                text TEXT
+            );
+            CREATE VIRTUAL TABLE IF NOT EXISTS lines_fts USING fts5(
+                text, content='lines', content_rowid='id'
+            );
+            CREATE INDEX IF NOT EXISTS idx_lines_job ON lines (job_id, lineno);
+            CREATE INDEX IF NOT EXISTS idx_runs_created ON runs (created_at);
+        """)
+    
+    def has_job(self, job_id: int) -> bool:
+        row = self.db.execute("SELECT 1 FROM jobs WHERE job_id = ?", (job_id,)).fetchone()
+        return row is not None
+    
+    def add_run(self, run: Dict):
+        self.db.execute(
+            "INSERT OR REPLACE INTO runs VALUES (?, ?, ?, ?)",
+            (run["id"], run["name"], run.get("conclusion"), run["created_at"])
+        )
+    
+    def add_job(self, job: Dict, lines: Iterator[Tuple[int, Optional[int], str]]):
+        """写入作业及其日志行（已存在时替换）"""
+        self.db.execute(
+            "INSERT INTO lines_fts (lines_fts, rowid, text) "
+            "SELECT 'delete', id, text FROM lines WHERE job_id = ?",
+            (job["id"],)
+        )
+        self.db.execute("DELETE FROM lines WHERE job_id = ?", (job["id"],))
+        self.db.execute("INSERT OR REPLACE INTO jobs VALUES (?, ?, ?)",
+                        (job["id"], job["run_id"], job["name"]))
+        self.db.executemany(
+            "INSERT OR REPLACE INTO steps VALUES (?, ?, ?)",
+            [(job["id"], step["number"], step["name"]) for step in job.get("steps") or []]
+        )
+        self.db.executemany(
+            "INSERT INTO lines (job_id, step, lineno, text) VALUES (?, ?, ?, ?)",
+            ((job["id"], step, lineno, text) for lineno, step, text in lines)
+        )
+        self.db.execute(
+            "INSERT INTO lines_fts (rowid, text) SELECT id, text FROM lines WHERE job_id = ?",
+            (job["id"],)
+        )
+    
+    def step_lines(self, job_id: int, step: Optional[int] = None) -> List[sqlite3.Row]:
+        """读取作业（或其中一个步骤）的日志行"""
+        sql = "SELECT lineno, step, text FROM lines WHERE job_id = ?"
+        params: List = [job_id]
+        if step is not None:
+            sql += " AND step = ?"
+            params.append(step)
+        return self.db.execute(sql + " ORDER BY lineno", params).fetchall()
+    
+    def search(self, pattern: str, last: int = 200, limit: int = 100) -> List[sqlite3.Row]:
+        """在最近 last 个已索引的运行中按短语搜索日志行（新 -> 旧）"""
+        phrase = '"' + pattern.replace('"', '""') + '"'
+        return self.db.execute(
+            """
+            SELECT runs.run_id, runs.name AS run_name, runs.created_at,
+                   jobs.name AS job_name, steps.name AS step_name,
+                   lines.lineno, highlight(lines_fts, 0, '»', '«') AS text
+            FROM lines_fts
+            JOIN lines ON lines.id = lines_fts.rowid
+            JOIN jobs ON jobs.job_id = lines.job_id
+            JOIN runs ON runs.run_id = jobs.run_id
+            LEFT JOIN steps ON steps.job_id = lines.job_id AND steps.number = lines.step
+            WHERE lines_fts MATCH ?
+              AND runs.run_id IN (SELECT run_id FROM runs ORDER BY created_at DESC LIMIT ?)
+            ORDER BY runs.created_at DESC, lines.job_id, lines.lineno
+            LIMIT ?
+            """,
+            (phrase, last, limit)
+        ).fetchall()
+    
+    def run_count(self) -> int:
+        return self.db.execute("SELECT COUNT(*) FROM runs").fetchone()[0]
+    
+    def commit(self):
+        self.db.commit()
+    
+    def close(self):
+        self.db.close()
+
+
+class LogManager:
+    def __init__(self, client: GitHubClient):
+        self.client = client
+        self.workflow_manager = WorkflowManager(client)
+    
+    def failures(self, repo_name: str, run_id: int, tail: int = 30) -> List[Dict]:
+        """
+        只下载失败作业的日志，输出失败步骤的片段并高亮错误行
+        
+        作业元数据中的步骤时间用于把日志切分到步骤；每个失败步骤输出所有错误行
+        和最后 tail 行。下载的日志写入本地索引，已索引的作业不会重复下载。
+        
+        Returns:
+            失败步骤列表 (job, step, lines)
+        """
+        owner = self.client.username
+        run = self.client._request(
+            "GET", f"/repos/{owner}/{repo_name}/actions/runs/{run_id}"
+        )
+        jobs = [
+            job for job in self.workflow_manager.iter_jobs(repo_name, run_id)
+            if job.get("conclusion") in FAILED_CONCLUSIONS
+        ]
+        if not jobs:
+            print(f"✓ 运行 {run_id} 没有失败的 Job（结论: {run.get('conclusion')}）")
+            return []
+        
+        index = LogIndex(owner, repo_name)
+        try:
+            # 所有作业都已索引时也要更新运行记录（如重新运行后的结论）
+            index.add_run(run)
+            index.commit()
+            for job in jobs:
+                if index.has_job(job["id"]):
+                    continue
+                path = cache_path("logs", owner, repo_name, "jobs", f"{job['id']}.txt")
+                self.client.download(
+                    f"/repos/{owner}/{repo_name}/actions/jobs/{job['id']}/logs", path
+                )
+                index.add_job(job, split_steps(path, job.get("steps") or []))
+                index.commit()
+                os.remove(path)
+            
+            report = []
+            print(f"\n运行 {run_id} ({run['name']}) 有 {len(jobs)} 个失败的 Job:")
+            for job in jobs:
+                failed_steps = [
+                    step for step in job.get("steps") or []
+                    if step.get("conclusion") in FAILED_CONCLUSIONS
+                ]
+                # 作业超时或在步骤外失败时没有失败步骤，输出整个作业的日志尾部
+                sections = [(step["name"], step["number"]) for step in failed_steps] or [("(整个 Job)", None)]
+                for step_name, number in sections:
+                    lines = index.step_lines(job["id"], number)
+                    print(f"\n✗ {job['name']} › {step_name} ({len(lines)} 行)")
+                    self._print_section(lines, tail)
+                    report.append({"job": job["name"], "step": step_name,
+                                   "lines": [row["text"] for row in lines]})
+            return report
+        finally:
+            index.close()
+    
+    def search(self, repo_name: str, pattern: str, last: int = 200,
+               limit: int = 100) -> List[Dict]:
+        """在本地索引中搜索日志（不访问 API）"""
+        index = LogIndex(self.client.username, repo_name)
+        try:
+            rows = index.search(pattern, last=last, limit=limit)
+            print(f"\n在最近 {min(last, index.run_count())} 个已索引的运行中找到 {len(rows)} 行:")
+            for row in rows:
+                step = f" › {row['step_name']}" if row["step_name"] else ""
+                print(f"  [{row['run_id']}] {row['job_name']}{step}:{row['lineno']}")
+                print(f"      {row['text'].strip()}")
+            return [dict(row) for row in rows]
+        finally:
+            index.close()
+    
+    @staticmethod
+    def _print_section(lines: List[sqlite3.Row], tail: int):
+        """输出错误行和最后 tail 行，跳过的部分用 ... 表示"""
+        keep = set(range(max(len(lines) - tail, 0), len(lines)))
+        keep.update(i for i, row in enumerate(lines) if ERROR_PATTERN.search(row["text"]))
+        previous = -1
+        for i in sorted(keep):
+            if i > previous + 1:
+                print("      ...")
+            text = lines[i]["text"]
+            marker = "»" if ERROR_PATTERN.search(text) else " "
+            print(f"  {marker} {lines[i]['lineno']:>6} {text}")
+            previous = i
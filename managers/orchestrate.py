@@ -0,0 +1,262 @@
+import itertools
+import json
+import time
+import uuid
+from datetime import datetime, timedelta, timezone
+from typing import Dict, List
+from core.client import GitHubClient
+from core.exceptions import GitHubManagerError
+from core.poller import PENDING, Poller, PollTask
+from managers.workflow import CONCLUSION_EXIT_CODES, WorkflowManager, status_icon
+from utils.timeutil import parse_timestamp
+
+# 节点状态
+WAITING = "waiting"
+DISPATCHED = "dispatched"
+RUNNING = "running"
+SUCCESS = "success"
+FAILED = "failed"
+SKIPPED = "skipped"
+
+IN_FLIGHT = (DISPATCHED, RUNNING)
+
+STATE_ICONS = {SUCCESS: "✓", FAILED: "✗", SKIPPED: "-", WAITING: "·"}
+
+
+class OrchestrationManager:
+    """按计划文件编排跨仓库的 workflow DAG：依赖成功即触发，独立分支并行"""
+    
+    def __init__(self, client: GitHubClient):
+        self.client = client
+        self.workflow_manager = WorkflowManager(client)
+    
+    def load_plan(self, plan: Dict) -> Dict[str, Dict]:
+        """
+        校验并展开计划
+        
+        计划格式:
+            defaults: {ref: main, timeout: 3600}
+            nodes:
+              build:
+                repo: app
+                workflow: build.yml
+                inputs: {version: "1.2"}
+              test-b: {repo: svc-b, workflow: integration.yml, needs: build}
+              test-c: {repo: svc-c, workflow: integration.yml, needs: build}
+              deploy: {repo: deploy, workflow: deploy.yml, needs: [test-b, test-c]}
+        
+        correlation_input 默认为 correlation_id，workflow 需要声明该输入并在
+        run-name 或 job/步骤名称中使用；设为 null 时取触发后创建的第一个运行。
+        
+        Returns:
+            节点名 -> 展开后的节点配置
+        """
+        defaults = {"ref": "main", "timeout": 3600, "correlation_input": "correlation_id",
+                    **(plan.get("defaults") or {})}
+        entries = plan.get("nodes") or {}
+        if not entries:
+            raise GitHubManagerError("计划中没有 nodes")
+        
+        nodes = {}
+        for name, entry in entries.items():
+            spec = {**defaults, **(entry or {})}
+            for field in ("repo", "workflow"):
+                if not spec.get(field):
+                    raise GitHubManagerError(f"节点 {name} 缺少 {field}")
+            needs = spec.get("needs") or []
+            spec["needs"] = [needs] if isinstance(needs, str) else list(needs)
+            # workflow_dispatch 的输入值均为字符串
+            spec["inputs"] = {
+                key: value if isinstance(value, str) else json.dumps(value)
+                for key, value in (spec.get("inputs") or {}).items()
+            }
+            nodes[name] = spec
+        
+        for name, spec in nodes.items():
+            for dependency in spec["needs"]:
+                if dependency not in nodes:
+                    raise GitHubManagerError(f"节点 {name} 依赖不存在的节点: {dependency}")
+        self.stages(nodes)
+        return nodes
+    
+    @staticmethod
+    def stages(nodes: Dict[str, Dict]) -> List[List[str]]:
+        """按依赖分层（同一层的节点可并行），存在环时报错"""
+        remaining = {name: set(spec["needs"]) for name, spec in nodes.items()}
+        stages = []
+        while remaining:
+            ready = sorted(name for name, needs in remaining.items() if not needs)
+            if not ready:
+                raise GitHubManagerError(f"计划中存在循环依赖: {', '.join(sorted(remaining))}")
+            stages.append(ready)
+            for name in ready:
+                del remaining[name]
+            for needs in remaining.values():
+                needs.difference_update(ready)
+        return stages
+    
+    def run(self, nodes: Dict[str, Dict], interval: float = 2.0,
+            max_interval: float = 30.0) -> Dict[str, Dict]:
+        """
+        执行计划
+        
+        所有在途运行由一个单线程 Poller 跟踪：每个有在途节点的仓库一个轮询任务，
+        每次只对该仓库的 workflow_dispatch 运行列表发一个条件请求（未变化时为
+        304），既用于找到刚触发的运行，也用于判断运行是否结束，API 用量随仓库数
+        而不是节点数增长。节点结束时立即触发依赖已全部成功的下游节点；失败、
+        超时的节点的下游全部跳过，其余分支继续执行。
+        
+        Args:
+            nodes: load_plan 展开后的节点
+            interval: 有变化时的轮询间隔（秒）
+            max_interval: 无变化时退避的最大间隔（秒）
+        
+        Returns:
+            节点名 -> 状态 (state, run, error)
+        """
+        owner = self.client.username
+        # 允许本机与服务端之间几秒的时钟偏差
+        since = (datetime.now(timezone.utc) - timedelta(seconds=5)).strftime("%Y-%m-%dT%H:%M:%SZ")
+        states = {name: {"state": WAITING, "run": None, "error": None} for name in nodes}
+        dependents = {name: [] for name in nodes}
+        for name, spec in nodes.items():
+            for dependency in spec["needs"]:
+                dependents[dependency].append(name)
+        claimed = set()
+        watching = set()
+        poller = Poller()
+        counter = itertools.count()
+        
+        def dispatch(name: str):
+            spec = nodes[name]
+            state = states[name]
+            inputs = dict(spec["inputs"])
+            if spec["correlation_input"]:
+                state["correlation_id"] = uuid.uuid4().hex[:12]
+                inputs[spec["correlation_input"]] = state["correlation_id"]
+                state["matches"] = self.workflow_manager.run_matcher(spec["repo"], state["correlation_id"])
+            state["dispatched_at"] = time.time()
+            state["deadline"] = time.monotonic() + spec["timeout"] if spec["timeout"] else None
+            try:
+                self.client._request(
+                    "POST",
+                    f"/repos/{owner}/{spec['repo']}/actions/workflows/{spec['workflow']}/dispatches",
+                    json={"ref": spec["ref"], "inputs": inputs} if inputs else {"ref": spec["ref"]}
+                )
+            except Exception as e:
+                print(f"✗ {name}: 触发失败: {e}")
+                finish(name, FAILED, str(e))
+                return
+            state["state"] = DISPATCHED
+            print(f"▶ {name}: 已触发 {spec['repo']}/{spec['workflow']}@{spec['ref']}")
+            watch(spec["repo"])
+        
+        def finish(name: str, result: str, error: str = None):
+            states[name]["state"] = result
+            states[name]["error"] = error
+            for child in dependents[name]:
+                if states[child]["state"] != WAITING:
+                    continue
+                needs = [states[dependency]["state"] for dependency in nodes[child]["needs"]]
+                if any(state in (FAILED, SKIPPED) for state in needs):
+                    print(f"- {child}: 跳过（依赖 {name} 未成功）")
+                    finish(child, SKIPPED)
+                elif all(state == SUCCESS for state in needs):
+                    dispatch(child)
+        
+        def find_run(name: str, runs: List[Dict]):
+            spec = nodes[name]
+            state = states[name]
+            for run in sorted(runs, key=lambda r: r["created_at"]):
+                # dispatch 接口接受 workflow ID 或文件名
+                workflow = (str(run["workflow_id"]), (run.get("path") or "").rsplit("/", 1)[-1])
+                if run["id"] in claimed or str(spec["workflow"]) not in workflow:
+                    continue
+                if state.get("matches"):
+                    found = state["matches"](run)
+                else:
+                    created = parse_timestamp(run["created_at"])
+                    found = created is not None and created >= state["dispatched_at"] - 5
+                if found:
+                    claimed.add(run["id"])
+                    return run
+            return None
+        
+        def watch(repo: str):
+            if repo in watching:
+                return
+            watching.add(repo)
+            endpoint = f"/repos/{owner}/{repo}/actions/runs"
+            params = {"event": "workflow_dispatch", "actor": owner,
+                      "created": f">={since}", "per_page": 100}
+            
+            def check(task: PollTask):
+                data, changed = self.client.conditional_get(endpoint, params=params)
+                runs = data.get("workflow_runs", [])
+                by_id = {run["id"]: run for run in runs}
+                progressed = False
+                for name in [n for n in nodes if nodes[n]["repo"] == repo]:
+                    state = states[name]
+                    if state["state"] == DISPATCHED:
+                        run = find_run(name, runs)
+                        if run:
+                            state["state"] = RUNNING
+                            state["run"] = run
+                            progressed = True
+                            print(f"  {name}: 运行 [{run['id']}] {run['html_url']}")
+                    if state["state"] == RUNNING:
+                        run = by_id.get(state["run"]["id"])
+                        if run is None:
+                            # 超出运行列表首页时单独查询
+                            run, _ = self.client.conditional_get(f"{endpoint}/{state['run']['id']}")
+                        state["run"] = run
+                        if run["status"] == "completed":
+                            progressed = True
+                            ok = CONCLUSION_EXIT_CODES.get(run["conclusion"], 1) == 0
+                            print(f"{status_icon(run['status'], run['conclusion'])} {name}: {run['conclusion']}")
+                            finish(name, SUCCESS if ok else FAILED, None if ok else run["conclusion"])
+                            continue
+                    if state["state"] in IN_FLIGHT and state["deadline"] and time.monotonic() >= state["deadline"]:
+                        progressed = True
+                        print(f"✗ {name}: 超过 {nodes[name]['timeout']} 秒未完成")
+                        finish(name, FAILED, "timeout")
+                
+                if not any(states[n]["state"] in IN_FLIGHT for n in nodes if nodes[n]["repo"] == repo):
+                    watching.discard(repo)
+                    return repo
+                if progressed or changed:
+                    task.hold(interval)
+                return PENDING
+            
+            poller.add((repo, next(counter)), check, interval=interval,
+                       max_interval=max_interval, factor=1.5, timeout=0)
+        
+        started = time.monotonic()
+        for name in self.stages(nodes)[0]:
+            dispatch(name)
+        while True:
+            poller.run()
+            if not poller.errors:
+                break
+            # 轮询出错的仓库中仍在途的节点按失败处理，其下游可能触发新的轮询任务
+            errors, poller.errors = poller.errors, {}
+            for (repo, _), error in errors.items():
+                watching.discard(repo)
+                for name in nodes:
+                    if nodes[name]["repo"] == repo and states[name]["state"] in IN_FLIGHT:
+                        print(f"✗ {name}: 跟踪运行失败: {error}")
+                        finish(name, FAILED, str(error))
+        
+        self._print_summary(nodes, states, time.monotonic() - started)
+        return states
+    
+    def _print_summary(self, nodes: Dict[str, Dict], states: Dict[str, Dict], elapsed: float):
+        print(f"\n编排结束，耗时 {elapsed:.0f}s:")
+        for stage in self.stages(nodes):
+            for name in stage:
+                state = states[name]
+                run = state["run"]
+                detail = run["html_url"] if run else (state["error"] or "")
+                print(f"  {STATE_ICONS.get(state['state'], '?')} {name:<24} "
+                      f"{nodes[name]['repo'] + '/' + nodes[name]['workflow']:<40} "
+                      f"{state['state']:<8} {detail}")
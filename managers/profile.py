@@ -0,0 +1,182 @@
+import json
+from typing import Dict, List, Optional
+from core.client import GitHubClient
+from managers.workflow import WorkflowManager
+from utils.timeutil import parse_timestamp
+
+# 依赖推断的时间容差（秒）：job 在其依赖全部完成后才会被创建
+DEPENDENCY_TOLERANCE = 5
+
+GANTT_WIDTH = 60
+
+
+def _span(item: Dict, start: str, end: str) -> Optional[int]:
+    begin = parse_timestamp(item.get(start))
+    finish = parse_timestamp(item.get(end))
+    if begin is None or finish is None:
+        return None
+    return max(finish - begin, 0)
+
+
+def _format_seconds(seconds: Optional[int]) -> str:
+    if seconds is None:
+        return "-"
+    if seconds >= 60:
+        return f"{seconds // 60}m{seconds % 60:02d}s"
+    return f"{seconds}s"
+
+
+class ProfileManager:
+    """运行耗时剖析：步骤耗时、关键路径、排队时间，输出甘特图和 trace 文件"""
+    
+    def __init__(self, client: GitHubClient):
+        self.client = client
+        self.workflow_manager = WorkflowManager(client)
+    
+    def profile(self, repo_name: str, run_id: int, top_steps: int = 5,
+                trace_file: Optional[str] = None) -> Dict:
+        """
+        剖析运行中各 job 的时间分布
+        
+        Jobs API 不返回 needs 依赖，关键路径按时间推断: job 的前驱是在其创建时刻
+        之前（容差 DEPENDENCY_TOLERANCE 秒）最后完成的 job；从最后完成的 job 沿
+        前驱回溯得到关键路径。
+        
+        Args:
+            repo_name: 仓库名称
+            run_id: 运行 ID
+            top_steps: 每个 job 输出耗时最长的步骤数
+            trace_file: 写出 Chrome Trace Event 格式的 JSON（chrome://tracing、Perfetto 可打开）
+        
+        Returns:
+            剖析结果 (jobs, critical_path, queue_total)
+        """
+        jobs = [
+            self._job_profile(job)
+            for job in self.workflow_manager.iter_jobs(repo_name, run_id)
+            if job.get("started_at") and job.get("completed_at")
+        ]
+        if not jobs:
+            print(f"运行 {run_id} 没有已完成的 Job")
+            return {"jobs": [], "critical_path": [], "queue_total": 0}
+        jobs.sort(key=lambda j: (j["created"], j["started"]))
+        
+        path = self._critical_path(jobs)
+        on_path = {job["id"] for job in path}
+        result = {
+            "jobs": jobs,
+            "critical_path": [job["name"] for job in path],
+            "critical_seconds": path[-1]["completed"] - path[0]["created"],
+            "critical_queue": sum(job["queue"] for job in path),
+            "queue_total": sum(job["queue"] for job in jobs),
+        }
+        
+        self._print_gantt(jobs, on_path)
+        self._print_breakdown(jobs, top_steps)
+        print(f"\n关键路径 ({_format_seconds(result['critical_seconds'])}，"
+              f"其中排队 {_format_seconds(result['critical_queue'])}):")
+        print("  " + " → ".join(result["critical_path"]))
+        print(f"所有 Job 排队时间合计: {_format_seconds(result['queue_total'])}")
+        
+        if trace_file:
+            self._write_trace(run_id, jobs, on_path, trace_file)
+            print(f"✓ Trace 已保存到: {trace_file}")
+        return result
+    
+    @staticmethod
+    def _job_profile(job: Dict) -> Dict:
+        steps = [
+            {"name": step["name"], "number": step["number"],
+             "conclusion": step.get("conclusion"),
+             "started": parse_timestamp(step["started_at"]),
+             "seconds": _span(step, "started_at", "completed_at")}
+            for step in job.get("steps") or []
+            if step.get("started_at") and step.get("completed_at")
+        ]
+        created = parse_timestamp(job.get("created_at") or job["started_at"])
+        started = parse_timestamp(job["started_at"])
+        completed = parse_timestamp(job["completed_at"])
+        return {
+            "id": job["id"],
+            "name": job["name"],
+            "conclusion": job.get("conclusion"),
+            "runner": job.get("runner_name"),
+            "created": created,
+            "started": started,
+            "completed": completed,
+            "queue": max(started - created, 0),
+            "duration": max(completed - started, 0),
+            "steps": steps,
+        }
+    
+    @staticmethod
+    def _critical_path(jobs: List[Dict]) -> List[Dict]:
+        current = max(jobs, key=lambda j: j["completed"])
+        path = [current]
+        while True:
+            candidates = [
+                job for job in jobs
+                if job["completed"] <= current["created"] + DEPENDENCY_TOLERANCE
+                and job["id"] != current["id"] and job not in path
+            ]
+            if not candidates:
+                break
+            current = max(candidates, key=lambda j: j["completed"])
+            path.append(current)
+        path.reverse()
+        return path
+    
+    @staticmethod
+    def _print_gantt(jobs: List[Dict], on_path: set):
+        origin = min(job["created"] for job in jobs)
+        end = max(job["completed"] for job in jobs)
+        scale = max(end - origin, 1) / GANTT_WIDTH
+        name_width = min(max(len(job["name"]) for job in jobs), 36)
+        
+        print(f"\n时间线（每格 {scale:.0f}s，· 排队，█ 运行，* 关键路径）:")
+        for job in jobs:
+            queued_at = int((job["created"] - origin) / scale)
+            start_at = int((job["started"] - origin) / scale)
+            end_at = max(int((job["completed"] - origin) / scale), start_at + 1)
+            bar = " " * queued_at + "·" * (start_at - queued_at) + "█" * (end_at - start_at)
+            marker = "*" if job["id"] in on_path else " "
+            print(f"  {marker} {job['name'][:name_width]:<{name_width}} |{bar:<{GANTT_WIDTH}}| "
+                  f"{_format_seconds(job['duration'])}")
+    
+    @staticmethod
+    def _print_breakdown(jobs: List[Dict], top_steps: int):
+        print("\n各 Job 耗时分布:")
+        for job in sorted(jobs, key=lambda j: -j["duration"]):
+            print(f"  {job['name']}: 运行 {_format_seconds(job['duration'])}，"
+                  f"排队 {_format_seconds(job['queue'])}"
+                  + (f"，runner {job['runner']}" if job["runner"] else ""))
+            total = max(job["duration"], 1)
+            for step in sorted(job["steps"], key=lambda s: -(s["seconds"] or 0))[:top_steps]:
+                share = (step["seconds"] or 0) / total
+                bar = "█" * round(share * 20)
+                print(f"      {share:>6.1%} {bar:<20} {_format_seconds(step['seconds']):>7}  {step['name']}")
+    
+    @staticmethod
+    def _write_trace(run_id: int, jobs: List[Dict], on_path: set, path: str):
+        """Chrome Trace Event 格式: 每个 job 一条轨道，包含排队、job 和步骤区间"""
+        origin = min(job["created"] for job in jobs)
+        events = []
+        for tid, job in enumerate(jobs, 1):
+            events.append({"ph": "M", "name": "thread_name", "pid": run_id, "tid": tid,
+                           "args": {"name": job["name"]}})
+            if job["queue"]:
+                events.append({"ph": "X", "name": "queued", "cat": "queue", "pid": run_id,
+                               "tid": tid, "ts": (job["created"] - origin) * 1_000_000,
+                               "dur": job["queue"] * 1_000_000})
+            events.append({"ph": "X", "name": job["name"], "cat": "job", "pid": run_id,
+                           "tid": tid, "ts": (job["started"] - origin) * 1_000_000,
+                           "dur": job["duration"] * 1_000_000,
+                           "args": {"conclusion": job["conclusion"], "runner": job["runner"],
+                                    "critical": job["id"] in on_path}})
+            for step in job["steps"]:
+                events.append({"ph": "X", "name": step["name"], "cat": "step", "pid": run_id,
+                               "tid": tid, "ts": (step["started"] - origin) * 1_000_000,
+                               "dur": (step["seconds"] or 0) * 1_000_000,
+                               "args": {"conclusion": step["conclusion"]}})
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump({"traceEvents": events, "displayTimeUnit": "ms"}, f, ensure_ascii=False)
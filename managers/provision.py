@@ -0,0 +1,134 @@
+from typing import Dict, List, Optional
+from core.client import GitHubClient
+from core.exceptions import GitHubManagerError
+from managers.repository import RepositoryManager
+from utils.concurrency import run_concurrent
+from utils.progress import ProgressReporter
+
+# 清单中可与现有仓库比较并通过 PATCH 更新的字段
+UPDATABLE_FIELDS = ("description", "private")
+
+
+class ProvisionManager:
+    """根据清单批量创建 / 更新 / 删除 / Fork 仓库"""
+    
+    def __init__(self, client: GitHubClient):
+        self.client = client
+        self.repo_manager = RepositoryManager(client)
+    
+    def plan(self, manifest: Dict) -> List[Dict]:
+        """
+        对比清单与现有仓库，计算需要执行的操作
+        
+        清单格式:
+            defaults: {private: true}
+            repos:
+              - name: service-a
+                description: "服务 A"
+              - name: linux
+                fork: torvalds/linux
+              - name: legacy
+                state: absent
+        
+        Returns:
+            操作列表，每项包含 action (create/fork/update/delete)、name 及参数
+        """
+        defaults = manifest.get("defaults") or {}
+        entries = manifest.get("repos") or []
+        live = self.repo_manager.inventory()
+        
+        actions = []
+        seen = set()
+        for entry in entries:
+            spec = {**defaults, **entry}
+            name = spec.get("name")
+            if not name:
+                raise GitHubManagerError(f"清单条目缺少 name: {entry}")
+            if name in seen:
+                raise GitHubManagerError(f"清单中仓库重复: {name}")
+            seen.add(name)
+            
+            current = live.get(name)
+            if spec.get("state", "present") == "absent":
+                if current:
+                    actions.append({"action": "delete", "name": name})
+                continue
+            
+            if current is None:
+                action = "fork" if spec.get("fork") else "create"
+                actions.append({"action": action, "name": name, "spec": spec})
+                continue
+            
+            changes = {
+                field: spec[field]
+                for field in UPDATABLE_FIELDS
+                if field in spec and (current.get(field) or "") != (spec[field] or "")
+            }
+            if changes:
+                actions.append({"action": "update", "name": name, "changes": changes})
+        return actions
+    
+    def apply(self, actions: List[Dict], max_workers: int = 4,
+              wait_forks: bool = True, timeout: float = 300.0) -> List[Dict]:
+        """
+        在有界线程池上执行操作，写请求由客户端统一限速
+        
+        Fork 是异步操作，wait_forks 时在全部操作完成后统一等待新建的 Fork 就绪，
+        超时未就绪的 Fork 记为失败。
+        
+        Returns:
+            每个操作的执行结果 (action, name, ok, error)
+        """
+        progress = ProgressReporter(len(actions), label="apply-repos")
+        results = run_concurrent(
+            self._execute,
+            actions,
+            max_workers=max_workers,
+            on_done=lambda r: progress.advance(ok=r[2] is None)
+        )
+        
+        report = []
+        for action, _, error in results:
+            if error:
+                print(f"✗ {action['action']} {action['name']} 失败: {error}")
+            report.append({
+                "action": action["action"],
+                "name": action["name"],
+                "ok": error is None,
+                "error": str(error) if error else None
+            })
+        print(f"\n{progress.summary()}")
+        
+        forks = [result for action, result, error in results
+                 if action["action"] == "fork" and error is None]
+        if wait_forks and forks:
+            ready = self.repo_manager.wait_for_forks(forks, timeout=timeout)
+            pending = {fork["name"] for fork in forks if fork["full_name"] not in ready}
+            for entry in report:
+                if entry["action"] == "fork" and entry["name"] in pending:
+                    entry.update(ok=False, error="Fork 未就绪")
+        return report
+    
+    def _execute(self, action: Dict) -> Optional[Dict]:
+        """执行单个操作"""
+        name = action["name"]
+        kind = action["action"]
+        if kind == "delete":
+            return self.repo_manager.delete(name)
+        if kind == "update":
+            return self.repo_manager.update(name, **action["changes"])
+        
+        spec = action["spec"]
+        if kind == "fork":
+            owner, _, upstream = spec["fork"].partition("/")
+            if not owner or not upstream:
+                raise GitHubManagerError(f"fork 格式应为 owner/repo: {spec['fork']}")
+            return self.repo_manager.fork(
+                owner, upstream, name=name if name != upstream else None
+            )
+        return self.repo_manager.create(
+            name,
+            spec.get("description", ""),
+            spec.get("private", False),
+            spec.get("auto_init", True)
+        )
@@ -1,6 +1,9 @@
 
+import fnmatch
 from typing import Dict, List, Optional
 from core.client import GitHubClient
+from core.exceptions import APIError, PollTimeoutError
+from core.poller import Poller, PENDING
 
 class RepositoryManager:
     def __init__(self, client: GitHubClient):
@@ -29,16 +32,80 @@ class RepositoryManager:
         print(f"✓ 仓库删除成功: {repo_name}")
         return True
     
-    def fork(self, owner: str, repo_name: str) -> Dict:
-        """Fork 仓库"""
+    def update(self, repo_name: str, **fields) -> Dict:
+        """更新仓库设置（如 description、private）"""
+        result = self.client._request(
+            "PATCH",
+            f"/repos/{self.client.username}/{repo_name}",
+            json=fields
+        )
+        print(f"✓ 仓库更新成功: {repo_name} ({', '.join(fields)})")
+        return result
+    
+    def fork(self, owner: str, repo_name: str,
+             name: Optional[str] = None, wait: bool = False,
+             timeout: float = 300.0) -> Dict:
+        """Fork 仓库，wait=True 时等待 Fork 的 git refs 可用后再返回"""
+        data = {"name": name} if name else None
         result = self.client._request(
             "POST",
-            f"/repos/{owner}/{repo_name}/forks"
+            f"/repos/{owner}/{repo_name}/forks",
+            json=data
         )
         print(f"✓ 仓库 Fork 成功: {result['html_url']}")
-        print("请注意: Forking 是异步操作，可能需要一点时间才能完全可用。")
+        if wait:
+            ready = self.wait_for_forks([result], timeout=timeout)
+            if result["full_name"] not in ready:
+                raise PollTimeoutError(f"Fork 未在 {timeout:.0f} 秒内就绪: {result['full_name']}")
+        else:
+            print("请注意: Forking 是异步操作，可能需要一点时间才能完全可用。")
         return result
     
+    def wait_for_forks(self, forks: List[Dict], timeout: float = 300.0,
+                       interval: float = 1.0, max_interval: float = 15.0) -> Dict[str, Dict]:
+        """
+        等待一个或多个 Fork 就绪（git refs 可读取）
+        
+        所有 Fork 共享同一个单线程轮询调度器（fork-repo --wait 等待一个，
+        apply-repos 等待本次创建的全部 Fork），间隔从 interval 起指数退避。
+        
+        Returns:
+            full_name -> 分支 refs 列表；超时或失败的 Fork 不包含在内
+        """
+        poller = Poller()
+        for fork in forks:
+            full_name = fork["full_name"]
+            poller.add(
+                full_name,
+                lambda task, full_name=full_name: self._fork_refs(full_name),
+                interval=interval,
+                max_interval=max_interval,
+                timeout=timeout
+            )
+        
+        print(f"等待 {len(forks)} 个 Fork 就绪...")
+        ready = poller.run()
+        for full_name in ready:
+            print(f"✓ Fork 已就绪: {full_name}")
+        for full_name, error in poller.errors.items():
+            print(f"✗ Fork 未就绪: {full_name} ({error})")
+        return ready
+    
+    def _fork_refs(self, full_name: str):
+        """读取 Fork 的分支 refs，仓库尚未就绪时返回 PENDING"""
+        try:
+            refs = self.client._request(
+                "GET",
+                f"/repos/{full_name}/git/refs/heads",
+                params={"per_page": 1}
+            )
+        except APIError as e:
+            # 404: 仓库尚未创建；409: git 仓库仍为空
+            if e.status_code in (404, 409):
+                return PENDING
+            raise
+        return refs if refs else PENDING
+    
     def list(self, visibility: str = "all") -> List[Dict]:
         """列出用户的所有仓库"""
         params = {"visibility": visibility, "per_page": 100}
@@ -49,6 +116,44 @@ class RepositoryManager:
             print(f"  - {repo['name']} ({repo['html_url']})")
         return repos
     
+    def inventory(self, affiliation: str = "owner") -> Dict[str, Dict]:
+        """分页获取全部仓库，返回 名称 -> 仓库信息 的映射（不输出）"""
+        params = {"affiliation": affiliation}
+        return {
+            repo["name"]: repo
+            for repo in self.client.paginate("/user/repos", params=params)
+        }
+    
+    def select(self, selector: str, include_archived: bool = False,
+               inventory: Optional[Dict[str, Dict]] = None) -> List[Dict]:
+        """
+        按名称通配符选择仓库
+        
+        Args:
+            selector: 逗号分隔的通配符（如 "team-*,infra-?"），以 ! 开头表示排除
+            include_archived: 是否包含已归档仓库
+            inventory: 已获取的仓库映射（多次选择时复用，避免重复分页）
+        
+        Returns:
+            匹配的仓库列表（按名称排序）
+        """
+        patterns = [p.strip() for p in selector.split(",") if p.strip()]
+        includes = [p for p in patterns if not p.startswith("!")] or ["*"]
+        excludes = [p[1:] for p in patterns if p.startswith("!")]
+        
+        selected = []
+        if inventory is None:
+            inventory = self.inventory()
+        for name, repo in sorted(inventory.items()):
+            if repo.get("archived") and not include_archived:
+                continue
+            if not any(fnmatch.fnmatchcase(name, p) for p in includes):
+                continue
+            if any(fnmatch.fnmatchcase(name, p) for p in excludes):
+                continue
+            selected.append(repo)
+        return selected
+    
     def get_info(self, repo_name: str) -> Dict:
         """获取仓库详细信息"""
         repo = self.client._request(
@@ -56,7 +161,7 @@ class RepositoryManager:
             f"/repos/{self.client.username}/{repo_name}"
         )
         
-        print(f"\n仓库信息:")
+        print("\n仓库信息:")
         print(f"  名称: {repo['name']}")
         print(f"  描述: {repo['description']}")
         print(f"  URL: {repo['html_url']}")
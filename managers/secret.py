@@ -0,0 +1,182 @@
+import base64
+import re
+import threading
+import time
+from typing import Dict, List, Optional
+from core.client import GitHubClient
+from core.exceptions import APIError, GitHubManagerError
+from managers.repository import RepositoryManager
+from utils.concurrency import run_concurrent
+from utils.progress import ProgressReporter
+from utils.storage import cache_path, read_json, write_json
+from utils.timeutil import parse_timestamp
+
+SECRET_NAME = re.compile(r"^[A-Za-z_][A-Za-z0-9_]*$")
+
+
+def _nacl_public():
+    try:
+        from nacl import public
+    except ImportError:
+        raise GitHubManagerError("set-secret 的加密需要 PyNaCl (pip install pynacl)")
+    return public
+
+
+class SecretManager:
+    """跨仓库批量设置 Actions secrets"""
+    
+    def __init__(self, client: GitHubClient):
+        self.client = client
+        self.repo_manager = RepositoryManager(client)
+        self._keys_path = cache_path("secrets", client.username, "public-keys.json")
+        self._keys_lock = threading.Lock()
+    
+    def public_keys(self, repos: List[Dict], max_workers: int = 8,
+                    refresh: bool = False) -> Dict[str, Dict]:
+        """
+        读取各仓库的 secrets 公钥
+        
+        公钥（不含任何 secret）按仓库缓存在本地，只有缓存中没有的仓库才请求
+        API；加密失败后用 refresh 重新获取。
+        
+        Returns:
+            full_name -> {key_id, key}
+        """
+        with self._keys_lock:
+            cached = read_json(self._keys_path) or {}
+        missing = [repo["full_name"] for repo in repos if refresh or repo["full_name"] not in cached]
+        if missing:
+            results = run_concurrent(
+                lambda full_name: self.client.request_with_retry(
+                    "GET", f"/repos/{full_name}/actions/secrets/public-key"
+                ),
+                missing,
+                max_workers=max_workers
+            )
+            with self._keys_lock:
+                cached = read_json(self._keys_path) or {}
+                for full_name, key, error in results:
+                    if error:
+                        print(f"✗ 无法获取 {full_name} 的公钥: {error}")
+                        cached.pop(full_name, None)
+                    else:
+                        cached[full_name] = {"key_id": key["key_id"], "key": key["key"]}
+                write_json(self._keys_path, cached)
+        return {repo["full_name"]: cached[repo["full_name"]]
+                for repo in repos if repo["full_name"] in cached}
+    
+    @staticmethod
+    def encrypt(value: str, keys: Dict[str, Dict]) -> Dict[str, str]:
+        """
+        用 sealed box 加密 secret，共用同一公钥 (key_id) 的仓库只加密一次
+        
+        Returns:
+            key_id -> base64 密文
+        """
+        public = _nacl_public()
+        plaintext = value.encode("utf-8")
+        encrypted = {}
+        for key in keys.values():
+            if key["key_id"] not in encrypted:
+                box = public.SealedBox(public.PublicKey(base64.b64decode(key["key"])))
+                encrypted[key["key_id"]] = base64.b64encode(box.encrypt(plaintext)).decode("ascii")
+        return encrypted
+    
+    def set_secret(self, name: str, value: str, repos: List[Dict],
+                   max_workers: int = 8, verify: bool = True) -> List[Dict]:
+        """
+        在多个仓库中设置同一个 secret
+        
+        先批量读取公钥（有本地缓存）并在本地完成加密，然后在有界线程池上并发
+        PUT，写请求由客户端统一限速。公钥已轮换的仓库（请求被拒绝）会重新获取
+        公钥并重试一次。verify 时再并发读取每个仓库的 secret 列表，确认该
+        secret 存在且更新时间不早于本次设置。
+        
+        Args:
+            name: secret 名称
+            value: secret 值
+            repos: 仓库列表（需包含 full_name）
+            max_workers: 最大并发数
+            verify: 是否回读校验
+        
+        Returns:
+            每个仓库的结果 (repo, ok, verified, error)
+        """
+        if not SECRET_NAME.match(name) or name.upper().startswith("GITHUB_"):
+            raise GitHubManagerError(f"无效的 secret 名称: {name}")
+        _nacl_public()
+        
+        started = time.time()
+        keys = self.public_keys(repos, max_workers=max_workers)
+        encrypted = self.encrypt(value, keys)
+        print(f"已加密 {name}: {len(keys)} 个仓库，{len(encrypted)} 个不同的公钥")
+        
+        def put(full_name: str):
+            key = keys[full_name]
+            try:
+                self._put(full_name, name, key["key_id"], encrypted[key["key_id"]])
+            except APIError as e:
+                if e.status_code not in (400, 422):
+                    raise
+                # 公钥已轮换：重新获取并单独加密
+                fresh = self.public_keys([{"full_name": full_name}], refresh=True)[full_name]
+                ciphertext = self.encrypt(value, {full_name: fresh})[fresh["key_id"]]
+                self._put(full_name, name, fresh["key_id"], ciphertext)
+        
+        progress = ProgressReporter(len(keys), label="set-secret")
+        results = run_concurrent(
+            put,
+            list(keys),
+            max_workers=max_workers,
+            on_done=lambda r: progress.advance(ok=r[2] is None)
+        )
+        print(f"\n{progress.summary()}")
+        
+        report = {repo["full_name"]: {"repo": repo["full_name"], "ok": False, "verified": None,
+                                      "error": "无法获取公钥"}
+                  for repo in repos}
+        for full_name, _, error in results:
+            report[full_name].update(ok=error is None, error=str(error) if error else None)
+        
+        if verify:
+            written = [full_name for full_name, entry in report.items() if entry["ok"]]
+            checks = run_concurrent(
+                lambda full_name: self._updated_at(full_name, name),
+                written,
+                max_workers=max_workers
+            )
+            for full_name, updated_at, error in checks:
+                updated = parse_timestamp(updated_at)
+                # 允许本机与服务端之间几秒的时钟偏差
+                verified = error is None and updated is not None and updated >= started - 5
+                report[full_name]["verified"] = verified
+                if not verified:
+                    report[full_name]["error"] = str(error) if error else "回读校验未通过"
+        
+        self._print_report(name, list(report.values()))
+        return list(report.values())
+    
+    def _put(self, full_name: str, name: str, key_id: str, encrypted_value: str):
+        self.client.request_with_retry(
+            "PUT",
+            f"/repos/{full_name}/actions/secrets/{name}",
+            json={"encrypted_value": encrypted_value, "key_id": key_id}
+        )
+    
+    def _updated_at(self, full_name: str, name: str) -> Optional[str]:
+        """从仓库的 secret 列表中读取 name 的更新时间，不存在时为 None"""
+        for secret in self.client.paginate(f"/repos/{full_name}/actions/secrets", key="secrets"):
+            if secret["name"] == name.upper():
+                return secret["updated_at"]
+        return None
+    
+    @staticmethod
+    def _print_report(name: str, report: List[Dict]):
+        failed = [entry for entry in report if not entry["ok"] or entry["verified"] is False]
+        print(f"\n{name}: {len(report) - len(failed)}/{len(report)} 个仓库设置成功")
+        for entry in sorted(report, key=lambda e: e["repo"]):
+            if entry in failed:
+                print(f"  ✗ {entry['repo']}: {entry['error']}")
+            else:
+                check = "（已校验）" if entry["verified"] else ""
+                print(f"  ✓ {entry['repo']}{check}")
@@ -0,0 +1,317 @@
+import glob
+import os
+from typing import Dict, List, Optional
+from core.client import GitHubClient
+from core.exceptions import GitHubManagerError
+from managers.export import JOB_SCHEMA, RUN_SCHEMA, job_row, run_row
+from managers.workflow import WorkflowManager
+from utils.columnar import ColumnarTable, ColumnarWriter, resolve_format
+from utils.concurrency import run_concurrent
+from utils.progress import ProgressReporter
+from utils.storage import cache_path, read_json, write_json
+from utils.timeutil import parse_timestamp
+
+FAILED_CONCLUSIONS = ("failure", "timed_out")
+
+# 已缓存的运行可能在之后被重新运行（新增尝试），同步时回看这段时间内创建的运行
+RERUN_LOOKBACK = 7 * 24 * 3600
+
+
+def _numpy():
+    try:
+        import numpy as np
+    except ImportError:
+        raise GitHubManagerError("actions-stats 的统计计算需要 numpy (pip install numpy)")
+    return np
+
+
+class RunStatsCache:
+    """
+    运行记录和 jobs 的本地列式缓存
+    
+    每次同步把新完成的运行及其全部 jobs 写成一对新的分段文件
+    (runs-NNNNNN / jobs-NNNNNN)，已有分段不会重写。重新运行过的运行在新分段
+    中再写一行（加载时以最后写入的一行为准），jobs 只追加新增尝试的部分。
+    meta.json 记录分段数、已同步到的最新创建时间，以及上次同步时仍未完成的
+    最早运行。
+    """
+    
+    def __init__(self, owner: str, repo_name: str):
+        self.directory = os.path.dirname(cache_path("actions-stats", owner, repo_name, "meta.json"))
+        self.meta_path = os.path.join(self.directory, "meta.json")
+        self.meta = read_json(self.meta_path, default={"segments": 0})
+    
+    def segments(self, kind: str) -> List[str]:
+        paths = glob.glob(os.path.join(self.directory, f"{kind}-*"))
+        return sorted(p for p in paths if not p.endswith(".tmp"))
+    
+    def run_attempts(self) -> Dict[int, int]:
+        """已缓存的运行 ID -> 已缓存的最大尝试次数"""
+        attempts: Dict[int, int] = {}
+        for path in self.segments("runs"):
+            columns = ColumnarTable.load(path, ["id", "run_attempt"]).columns
+            for run_id, attempt in zip(columns["id"], columns["run_attempt"]):
+                attempts[int(run_id)] = max(attempts.get(int(run_id), 0), int(attempt))
+        return attempts
+    
+    def append(self, runs: List[Dict], jobs: List[Dict], fmt: str):
+        """写入一对新分段（运行 + jobs）"""
+        number = self.meta["segments"] + 1
+        suffix = ".parquet" if fmt == "parquet" else ""
+        for kind, schema, rows in (("jobs", JOB_SCHEMA, jobs), ("runs", RUN_SCHEMA, runs)):
+            path = os.path.join(self.directory, f"{kind}-{number:06d}{suffix}")
+            with ColumnarWriter(path, schema, fmt=fmt) as writer:
+                writer.write_all(rows)
+        self.meta["segments"] = number
+    
+    def save_meta(self):
+        write_json(self.meta_path, self.meta)
+    
+    def load(self, kind: str, columns: List[str]) -> Dict:
+        """
+        加载全部分段并合并为 numpy 数组
+        
+        各分段的字典编码不同，合并时重新映射到统一的编码。包含 id 列时，同一
+        ID 只保留最后写入的一行（重新运行后更新的运行记录）。
+        
+        Returns:
+            列名 -> ndarray，字典列另有 "<列名>:values" 保存取值列表
+        """
+        np = _numpy()
+        tables = [ColumnarTable.load(path, columns) for path in self.segments(kind)]
+        merged: Dict = {}
+        for name in columns:
+            kind_of = tables[0].types[name] if tables else "int64"
+            if kind_of == "dict":
+                values: Dict[str, int] = {}
+                parts = []
+                for table in tables:
+                    lookup = np.array(
+                        [values.setdefault(v, len(values)) for v in table.dictionaries[name]] + [-1],
+                        dtype=np.int64
+                    )
+                    # 缺失值 -1 正好映射到 lookup 的最后一项 (-1)
+                    parts.append(lookup[np.asarray(table.columns[name], dtype=np.int64)])
+                merged[name] = np.concatenate(parts) if parts else np.zeros(0, dtype=np.int64)
+                merged[f"{name}:values"] = sorted(values, key=values.get)
+            else:
+                parts = [np.asarray(table.columns[name], dtype=np.int64) for table in tables]
+                merged[name] = np.concatenate(parts) if parts else np.zeros(0, dtype=np.int64)
+        
+        if "id" in merged:
+            ids = merged["id"]
+            _, last = np.unique(ids[::-1], return_index=True)
+            if len(last) < len(ids):
+                keep = np.sort(len(ids) - 1 - last)
+                for name in columns:
+                    merged[name] = merged[name][keep]
+        return merged
+
+
+class ActionsStatsManager:
+    """Workflow 运行耗时、排队时间和失败/不稳定率统计"""
+    
+    def __init__(self, client: GitHubClient):
+        self.client = client
+        self.workflow_manager = WorkflowManager(client)
+    
+    def sync(self, repo_name: str, max_runs: int = 2000, max_workers: int = 8,
+             fmt: str = "auto") -> int:
+        """
+        增量同步已完成的运行及其 jobs 到本地列式缓存
+        
+        从最新的运行向前分页，越过上次同步的最新创建时间之前 RERUN_LOOKBACK
+        （以及上次仍未完成的最早运行）后停止，因此每周只读取新运行和最近一周
+        的运行列表。已缓存的运行中 run_attempt 大于缓存值的（之后被重新运行）
+        重新读取，只追加新增尝试的 jobs。首次同步最多读取 max_runs 个运行。
+        
+        Returns:
+            新增和更新的运行数量
+        """
+        cache = RunStatsCache(self.client.username, repo_name)
+        fmt = cache.meta.setdefault("format", resolve_format(fmt))
+        cached = cache.run_attempts()
+        newest_created = cache.meta.get("newest_created")
+        stop_at = min(
+            (t for t in (newest_created and newest_created - RERUN_LOOKBACK,
+                         cache.meta.get("oldest_pending")) if t),
+            default=None
+        )
+        
+        new_runs = []
+        oldest_pending = None
+        for run in self.workflow_manager.iter_runs(repo_name):
+            created = parse_timestamp(run["created_at"])
+            if stop_at is not None and created < stop_at:
+                break
+            if stop_at is None and len(new_runs) >= max_runs:
+                break
+            if (run.get("run_attempt") or 1) <= cached.get(run["id"], 0):
+                continue
+            if run["status"] != "completed":
+                oldest_pending = created
+                continue
+            new_runs.append(run)
+            newest_created = max(newest_created or 0, created)
+        
+        if new_runs:
+            print(f"读取 {len(new_runs)} 个新运行或新尝试的 jobs...")
+            progress = ProgressReporter(len(new_runs), label="actions-stats")
+            results = run_concurrent(
+                lambda run: list(self.workflow_manager.iter_jobs(repo_name, run["id"], attempts="all")),
+                new_runs,
+                max_workers=max_workers,
+                on_done=lambda r: progress.advance(ok=r[2] is None)
+            )
+            # jobs 读取失败的运行不写入缓存，下次同步重试
+            runs, jobs = [], []
+            for run, run_jobs, error in results:
+                if error:
+                    print(f"✗ 读取运行 {run['id']} 的 jobs 失败: {error}")
+                    oldest_pending = min(oldest_pending or parse_timestamp(run["created_at"]),
+                                         parse_timestamp(run["created_at"]))
+                    continue
+                known = cached.get(run["id"], 0)
+                runs.append(run_row(run))
+                jobs.extend(job_row(job) for job in run_jobs if (job.get("run_attempt") or 1) > known)
+            cache.append(runs, jobs, fmt)
+            print(f"\n{progress.summary()}")
+        
+        cache.meta["newest_created"] = newest_created
+        cache.meta["oldest_pending"] = oldest_pending
+        cache.save_meta()
+        refreshed = sum(1 for run in new_runs if run["id"] in cached)
+        total = len(cached) + len(new_runs) - refreshed
+        print(f"✓ 同步完成: 新增 {len(new_runs) - refreshed} 个运行，更新 {refreshed} 个，缓存共 {total} 个")
+        return len(new_runs)
+    
+    def stats(self, repo_name: str, last: int = 2000,
+              workflow: Optional[str] = None) -> Dict:
+        """
+        基于本地缓存计算最近 last 个运行的统计（不访问 API）
+        
+        运行: 按 workflow 统计次数、成功率、耗时 p50/p95
+        Jobs: 按 job 名称统计耗时和排队时间 (created -> started) 的 p50/p95、
+              失败率（最后一次尝试失败），以及不稳定率（同一运行中先失败、
+              重试后成功）
+        """
+        np = _numpy()
+        cache = RunStatsCache(self.client.username, repo_name)
+        runs = cache.load("runs", ["id", "name", "conclusion", "created_at",
+                                   "run_started_at", "updated_at"])
+        if not len(runs["id"]):
+            raise GitHubManagerError("本地缓存为空，请先不带 --offline 运行一次")
+        
+        mask = np.ones(len(runs["id"]), dtype=bool)
+        if workflow:
+            names = runs["name:values"]
+            if workflow not in names:
+                raise GitHubManagerError(f"缓存中没有 workflow: {workflow}")
+            mask &= runs["name"] == names.index(workflow)
+        order = np.argsort(-runs["created_at"][mask], kind="stable")[:last]
+        selected = np.flatnonzero(mask)[order]
+        run_ids = runs["id"][selected]
+        
+        report = {
+            "runs": self._run_stats(np, runs, selected),
+            "jobs": self._job_stats(np, cache, run_ids),
+        }
+        self._print(report, len(selected))
+        return report
+    
+    @staticmethod
+    def _percentiles(np, values) -> List[float]:
+        values = values[values >= 0]
+        if not len(values):
+            return [0.0, 0.0]
+        return [float(v) for v in np.percentile(values, [50, 95])]
+    
+    def _run_stats(self, np, runs: Dict, selected) -> List[Dict]:
+        names = runs["name:values"]
+        conclusions = runs["conclusion:values"]
+        success = conclusions.index("success") if "success" in conclusions else -2
+        name_codes = runs["name"][selected]
+        duration = runs["updated_at"][selected] - runs["run_started_at"][selected]
+        ok = runs["conclusion"][selected] == success
+        
+        rows = []
+        for code in np.unique(name_codes):
+            group = name_codes == code
+            p50, p95 = self._percentiles(np, duration[group])
+            rows.append({
+                "workflow": names[code] if code >= 0 else "-",
+                "runs": int(group.sum()),
+                "success_rate": float(ok[group].mean()),
+                "duration_p50": p50,
+                "duration_p95": p95,
+            })
+        return sorted(rows, key=lambda r: -r["runs"])
+    
+    def _job_stats(self, np, cache: RunStatsCache, run_ids) -> List[Dict]:
+        jobs = cache.load("jobs", ["run_id", "run_attempt", "name", "conclusion",
+                                   "created_at", "started_at", "completed_at"])
+        keep = np.isin(jobs["run_id"], run_ids)
+        names = jobs["name:values"]
+        conclusions = jobs["conclusion:values"]
+        failed_codes = [conclusions.index(c) for c in FAILED_CONCLUSIONS if c in conclusions]
+        success = conclusions.index("success") if "success" in conclusions else -2
+        
+        run_id = jobs["run_id"][keep]
+        attempt = jobs["run_attempt"][keep]
+        name = jobs["name"][keep]
+        failed = np.isin(jobs["conclusion"][keep], failed_codes)
+        passed = jobs["conclusion"][keep] == success
+        started = jobs["started_at"][keep]
+        duration = np.where(started > 0, jobs["completed_at"][keep] - started, -1)
+        queue = np.where(started > 0, started - jobs["created_at"][keep], -1)
+        
+        # (运行, job 名称) 分组: 最后一次尝试的结果决定失败，先失败后成功记为不稳定
+        group_key = run_id * (len(names) + 1) + (name + 1)
+        groups, inverse = np.unique(group_key, return_inverse=True)
+        last_attempt = np.zeros(len(groups), dtype=np.int64)
+        np.maximum.at(last_attempt, inverse, attempt)
+        is_last = attempt == last_attempt[inverse]
+        any_failed = np.zeros(len(groups), dtype=bool)
+        np.logical_or.at(any_failed, inverse, failed)
+        final_failed = np.zeros(len(groups), dtype=bool)
+        np.logical_or.at(final_failed, inverse, failed & is_last)
+        final_passed = np.zeros(len(groups), dtype=bool)
+        np.logical_or.at(final_passed, inverse, passed & is_last)
+        group_name = groups % (len(names) + 1) - 1
+        
+        rows = []
+        for code in np.unique(name):
+            in_group = group_name == code
+            total = int(in_group.sum())
+            d50, d95 = self._percentiles(np, duration[name == code])
+            q50, q95 = self._percentiles(np, queue[name == code])
+            rows.append({
+                "job": names[code] if code >= 0 else "-",
+                "runs": total,
+                "failure_rate": float(final_failed[in_group].mean()) if total else 0.0,
+                "flaky_rate": float((any_failed & final_passed)[in_group].mean()) if total else 0.0,
+                "duration_p50": d50,
+                "duration_p95": d95,
+                "queue_p50": q50,
+                "queue_p95": q95,
+            })
+        return sorted(rows, key=lambda r: -r["runs"])
+    
+    @staticmethod
+    def _print(report: Dict, run_count: int):
+        def fmt(seconds: float) -> str:
+            return f"{seconds / 60:.1f}m" if seconds >= 60 else f"{seconds:.0f}s"
+        
+        print(f"\n最近 {run_count} 个运行:")
+        print(f"  {'Workflow':<32} {'次数':>6} {'成功率':>7} {'p50':>8} {'p95':>8}")
+        for row in report["runs"]:
+            print(f"  {row['workflow'][:32]:<32} {row['runs']:>8} {row['success_rate']:>9.1%}"
+                  f" {fmt(row['duration_p50']):>8} {fmt(row['duration_p95']):>8}")
+        
+        print("\nJobs:")
+        print(f"  {'Job':<32} {'次数':>6} {'失败率':>7} {'不稳定':>7} {'耗时p50':>8} {'耗时p95':>8}"
+              f" {'排队p50':>8} {'排队p95':>8}")
+        for row in report["jobs"]:
+            print(f"  {row['job'][:32]:<32} {row['runs']:>8} {row['failure_rate']:>9.1%}"
+                  f" {row['flaky_rate']:>9.1%} {fmt(row['duration_p50']):>10} {fmt(row['duration_p95']):>10}"
+                  f" {fmt(row['queue_p50']):>10} {fmt(row['queue_p95']):>10}")
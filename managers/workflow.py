@@ -1,5 +1,71 @@
-from typing import Dict, List, Optional
+import fnmatch
+import hashlib
+import itertools
+import os
+import re
+import shutil
+import time
+import uuid
+import zipfile
+from datetime import datetime, timedelta, timezone
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
 from core.client import GitHubClient
+from core.exceptions import APIError, GitHubManagerError, PollTimeoutError, RateLimitError
+from core.poller import PENDING, Poller, PollTask
+from utils.concurrency import run_concurrent
+from utils.progress import ProgressReporter
+from utils.storage import cache_path, read_json, write_json
+
+# watch-run 退出码：按运行结论区分，便于脚本判断
+CONCLUSION_EXIT_CODES = {
+    "success": 0,
+    "neutral": 0,
+    "skipped": 0,
+    "failure": 1,
+    "startup_failure": 1,
+    "cancelled": 2,
+    "timed_out": 3,
+    "action_required": 4,
+}
+
+# 带过滤条件的运行列表查询最多返回 1000 条
+RUN_QUERY_LIMIT = 1000
+
+STATUS_ICONS = {"in_progress": "⟳", "queued": "○", "waiting": "○", "pending": "○"}
+
+
+def status_icon(status: str, conclusion: Optional[str]) -> str:
+    if status == "completed":
+        return "✓" if conclusion in ("success", "skipped", "neutral") else "✗"
+    return STATUS_ICONS.get(status, "?")
+
+
+# 仓库 Actions 缓存的默认容量上限
+CACHE_LIMIT = 10 * 1024 ** 3
+
+# 缓存快照保存的字段
+CACHE_FIELDS = ("id", "key", "ref", "size_in_bytes", "created_at", "last_accessed_at")
+
+# 缓存键末尾的哈希或版本号段，如 Linux-node-<hashFiles 结果>
+CACHE_KEY_HASH = re.compile(r"^([0-9a-f]{7,}|\d+)$", re.IGNORECASE)
+
+
+def cache_prefix(key: str, depth: Optional[int] = None) -> str:
+    """缓存键的前缀：前 depth 段（按 - 分隔），默认去掉末尾的哈希/数字段"""
+    parts = key.split("-")
+    if depth:
+        return "-".join(parts[:depth])
+    while len(parts) > 1 and CACHE_KEY_HASH.match(parts[-1]):
+        parts.pop()
+    return "-".join(parts)
+
+
+def _format_size(size: float) -> str:
+    for unit in ("B", "KB", "MB"):
+        if size < 1024:
+            return f"{size:.0f} {unit}" if unit == "B" else f"{size:.1f} {unit}"
+        size /= 1024
+    return f"{size:.2f} GB"
 
 class WorkflowManager:
     def __init__(self, client: GitHubClient):
@@ -53,6 +119,168 @@ class WorkflowManager:
             print(f"      分支: {run['head_branch']}")
         return runs
     
+    def iter_runs(self, repo_name: str, workflow_id: Optional[str] = None,
+                  status: Optional[str] = None, branch: Optional[str] = None,
+                  **filters) -> Iterator[Dict]:
+        """分页遍历运行记录（新 -> 旧，不输出），filters 为其他查询参数（如 created）"""
+        params = dict(filters)
+        if status:
+            params["status"] = status
+        if branch:
+            params["branch"] = branch
+        
+        if workflow_id:
+            endpoint = f"/repos/{self.client.username}/{repo_name}/actions/workflows/{workflow_id}/runs"
+        else:
+            endpoint = f"/repos/{self.client.username}/{repo_name}/actions/runs"
+        return self.client.paginate(endpoint, params=params, key="workflow_runs")
+    
+    def get_run(self, repo_name: str, run_id: int) -> Dict:
+        """获取特定运行的详细信息"""
+        run = self.client._request(
+            "GET",
+            f"/repos/{self.client.username}/{repo_name}/actions/runs/{run_id}"
+        )
+        print("\n运行详情:")
+        print(f"  ID: {run['id']}")
+        print(f"  名称: {run['name']}")
+        print(f"  状态: {run['status']}")
+        print(f"  结论: {run.get('conclusion') or 'N/A'}")
+        print(f"  分支: {run['head_branch']}")
+        print(f"  SHA: {run['head_sha'][:7]}")
+        print(f"  触发事件: {run['event']}")
+        print(f"  触发者: {run['actor']['login']}")
+        print(f"  创建时间: {run['created_at']}")
+        print(f"  更新时间: {run['updated_at']}")
+        print(f"  URL: {run['html_url']}")
+        return run
+    
+    def watch_run(self, repo_name: str, run_id: int, interval: float = 2.0,
+                  max_interval: float = 30.0, timeout: float = 0) -> Dict:
+        """
+        持续跟踪运行状态直到完成，只输出变化的 job 和步骤
+        
+        运行和 jobs 首页都使用 If-None-Match 条件请求，未变化时返回 304，不计入速率
+        限制；jobs 超过一页时其余页逐页读取。5xx、网络错误和速率限制视为临时错误，
+        等待后继续轮询。
+        轮询间隔随状态自适应: 有 job/步骤状态变化时保持 interval；整体仍在排队时
+        使用 max_interval；运行中但无变化时按指数退避逐步放慢。
+        
+        Args:
+            repo_name: 仓库名称
+            run_id: 运行 ID
+            interval: 最短轮询间隔（秒）
+            max_interval: 最长轮询间隔（秒）
+            timeout: 超时时间（秒），0 表示一直等待
+        
+        Returns:
+            完成后的运行详情
+        """
+        base = f"/repos/{self.client.username}/{repo_name}/actions/runs/{run_id}"
+        seen: Dict[Tuple, Tuple] = {}
+        
+        def render(key: Tuple, label: str, status: str, conclusion: Optional[str],
+                   indent: str) -> bool:
+            state = (status, conclusion)
+            if seen.get(key) == state:
+                return False
+            seen[key] = state
+            stamp = time.strftime("%H:%M:%S")
+            result = f" ({conclusion})" if conclusion else ""
+            print(f"[{stamp}] {indent}{status_icon(status, conclusion)} {label}: {status}{result}")
+            return True
+        
+        def check(task: PollTask):
+            try:
+                run, run_changed = self.client.conditional_get(base)
+                jobs_data, jobs_changed = self.client.conditional_get(
+                    f"{base}/jobs", params={"per_page": 100}
+                )
+                jobs = jobs_data.get("jobs", [])
+                if jobs_data.get("total_count", 0) > len(jobs):
+                    # 首页的 ETag 不反映后续页的变化，超过一页时每轮读取其余页
+                    jobs = jobs + list(self.client.paginate(
+                        f"{base}/jobs", params={"per_page": 100, "page": 2}, key="jobs"
+                    ))
+                    jobs_changed = True
+            except RateLimitError as e:
+                print(f"  触发速率限制，{e.retry_after:.0f} 秒后继续")
+                task.hold(max(e.retry_after, interval))
+                return PENDING
+            except APIError as e:
+                if e.status_code is not None and e.status_code < 500:
+                    raise
+                print(f"  {e}，稍后重试")
+                return PENDING
+            if not seen:
+                print(f"跟踪运行: {run['name']} #{run.get('run_number', run_id)} ({run['head_branch']})")
+                print(f"  {run['html_url']}")
+            
+            changed = False
+            if run_changed:
+                changed = render(("run",), "运行", run["status"], run.get("conclusion"), "")
+            
+            if jobs_changed:
+                for job in jobs:
+                    changed |= render(("job", job["id"]), job["name"],
+                                      job["status"], job.get("conclusion"), "  ")
+                    for step in job.get("steps") or []:
+                        if step["status"] == "queued" and ("step", job["id"], step["number"]) not in seen:
+                            continue
+                        changed |= render(("step", job["id"], step["number"]),
+                                          f"{job['name']} › {step['name']}",
+                                          step["status"], step.get("conclusion"), "      ")
+            
+            if run["status"] == "completed":
+                return run
+            
+            active = any(job["status"] == "in_progress" for job in jobs)
+            if changed:
+                task.hold(interval)
+            elif not active:
+                task.hold(max_interval)
+            return PENDING
+        
+        poller = Poller()
+        poller.add(run_id, check, interval=interval, max_interval=max_interval,
+                   factor=1.5, timeout=timeout)
+        poller.run()
+        if run_id in poller.errors:
+            raise poller.errors[run_id]
+        
+        run = poller.results[run_id]
+        print(f"\n{status_icon(run['status'], run.get('conclusion'))} 运行结束: {run.get('conclusion')}")
+        return run
+    
+    def iter_jobs(self, repo_name: str, run_id: int,
+                  attempts: str = "latest") -> Iterator[Dict]:
+        """分页遍历运行中的 jobs（不输出），attempts=all 时包含历次重试"""
+        return self.client.paginate(
+            f"/repos/{self.client.username}/{repo_name}/actions/runs/{run_id}/jobs",
+            params={"filter": attempts},
+            key="jobs"
+        )
+    
+    def list_jobs(self, repo_name: str, run_id: int) -> List[Dict]:
+        """列出 workflow 运行中的所有 jobs 及其步骤"""
+        jobs = list(self.iter_jobs(repo_name, run_id))
+        print(f"\n运行 {run_id} 包含 {len(jobs)} 个 Job:")
+        for job in jobs:
+            conclusion = f" ({job['conclusion']})" if job.get("conclusion") else ""
+            print(f"  {status_icon(job['status'], job.get('conclusion'))} [{job['id']}] {job['name']}")
+            print(f"      状态: {job['status']}{conclusion}")
+            if job.get("started_at"):
+                print(f"      开始: {job['started_at']}")
+            if job.get("completed_at"):
+                print(f"      完成: {job['completed_at']}")
+            
+            steps = job.get("steps", [])
+            if steps:
+                print("      步骤:")
+                for step in steps:
+                    print(f"        {status_icon(step['status'], step.get('conclusion'))} {step['name']}")
+        return jobs
+    
     def trigger(self, repo_name: str, workflow_id: str,
                 ref: str = "main", inputs: Optional[Dict] = None) -> bool:
         """手动触发 workflow 运行"""
@@ -65,11 +293,475 @@ class WorkflowManager:
             f"/repos/{self.client.username}/{repo_name}/actions/workflows/{workflow_id}/dispatches",
             json=data
         )
-        print(f"✓ Workflow 触发成功")
+        print("✓ Workflow 触发成功")
         print(f"  Workflow: {workflow_id}")
         print(f"  分支: {ref}")
         return True
     
+    def run_matcher(self, repo_name: str, correlation_id: str) -> Callable[[Dict], bool]:
+        """
+        返回判断运行是否带有关联标识的函数
+        
+        先在运行标题中查找；没有时检查该运行的 job/步骤名称，每个运行只检查一次
+        （job 尚未生成时下次再检查）。
+        """
+        inspected = set()
+        
+        def matches(run: Dict) -> bool:
+            if correlation_id in (run.get("display_title") or "") or correlation_id in (run.get("name") or ""):
+                return True
+            if run["id"] in inspected:
+                return False
+            inspected.add(run["id"])
+            data, _ = self.client.conditional_get(
+                f"/repos/{self.client.username}/{repo_name}/actions/runs/{run['id']}/jobs"
+            )
+            for job in data.get("jobs", []):
+                names = [job["name"]] + [step["name"] for step in job.get("steps") or []]
+                if any(correlation_id in name for name in names):
+                    return True
+            if not data.get("jobs"):
+                inspected.discard(run["id"])
+            return False
+        
+        return matches
+    
+    def trigger_and_find(self, repo_name: str, workflow_id: str, ref: str = "main",
+                         inputs: Optional[Dict] = None,
+                         correlation_input: Optional[str] = "correlation_id",
+                         timeout: float = 120.0) -> Dict:
+        """
+        触发 workflow 并找到本次触发产生的运行
+        
+        dispatch 接口只返回 204，没有运行 ID。触发时在 correlation_input 输入中放入
+        随机标识，然后用 event=workflow_dispatch、分支、触发者和 created>= 过滤的
+        条件请求轮询运行列表（未变化时为 304），在运行标题中匹配该标识；标题中
+        没有时再检查候选运行的 job/步骤名称（每个候选只检查一次）。
+        correlation_input 为空时取触发之后创建的最早一个运行。
+        
+        Returns:
+            匹配到的运行
+        """
+        inputs = dict(inputs or {})
+        correlation_id = None
+        if correlation_input:
+            correlation_id = uuid.uuid4().hex[:12]
+            inputs[correlation_input] = correlation_id
+        
+        # 允许本机与服务端之间几秒的时钟偏差
+        since = datetime.now(timezone.utc) - timedelta(seconds=5)
+        self.trigger(repo_name, workflow_id, ref, inputs or None)
+        if correlation_id:
+            print(f"  关联标识: {correlation_id}")
+        
+        endpoint = f"/repos/{self.client.username}/{repo_name}/actions/workflows/{workflow_id}/runs"
+        params = {
+            "event": "workflow_dispatch",
+            "branch": ref,
+            "actor": self.client.username,
+            "created": f">={since.strftime('%Y-%m-%dT%H:%M:%SZ')}",
+            "per_page": 20,
+        }
+        matches = self.run_matcher(repo_name, correlation_id)
+        
+        def check(task: PollTask):
+            data, _ = self.client.conditional_get(endpoint, params=params)
+            runs = sorted(data.get("workflow_runs", []), key=lambda r: r["created_at"])
+            for run in runs:
+                if correlation_id is None or matches(run):
+                    return run
+            return PENDING
+        
+        poller = Poller()
+        poller.add("dispatch", check, interval=1.0, max_interval=10.0,
+                   factor=1.5, timeout=timeout)
+        poller.run()
+        if "dispatch" in poller.errors:
+            error = poller.errors["dispatch"]
+            if isinstance(error, PollTimeoutError):
+                raise PollTimeoutError(
+                    f"{timeout:.0f} 秒内未找到本次触发的运行"
+                    + (f"（关联标识 {correlation_id}）" if correlation_id else "")
+                )
+            raise error
+        
+        run = poller.results["dispatch"]
+        print(f"✓ 找到运行: [{run['id']}] {run.get('display_title') or run['name']}")
+        print(f"  {run['html_url']}")
+        return run
+    
+    def get_logs(self, repo_name: str, run_id: int, output: Optional[str] = None,
+                 only: Optional[List[str]] = None,
+                 extract_dir: Optional[str] = None) -> str:
+        """
+        流式下载运行日志（ZIP），可只解压指定的 job/步骤日志
+        
+        Args:
+            repo_name: 仓库名称
+            run_id: 运行 ID
+            output: ZIP 保存路径（默认保存到本地缓存目录）
+            only: 要解压的日志路径通配符（如 "build/*"、"*/3_Run tests.txt"）
+            extract_dir: 解压目录（默认: logs-<run_id>）
+        
+        Returns:
+            ZIP 路径，指定 only 时为解压目录
+        """
+        owner = self.client.username
+        path = output or cache_path("logs", owner, repo_name, f"{run_id}.zip")
+        if os.path.exists(path) and not output:
+            print(f"✓ 使用已下载的日志: {path}")
+        else:
+            size = self.client.download(
+                f"/repos/{owner}/{repo_name}/actions/runs/{run_id}/logs", path
+            )
+            print(f"✓ 日志已保存到: {path} ({size / 1024 / 1024:.1f} MB)")
+        
+        if not only:
+            return path
+        return self.extract_logs(path, only, extract_dir or f"logs-{run_id}")
+    
+    @staticmethod
+    def extract_logs(zip_path: str, patterns: List[str], target_dir: str) -> str:
+        """
+        从日志 ZIP 中只解压匹配的文件
+        
+        通过中央目录定位成员，逐个流式解压，其余成员不会被读取。
+        """
+        extracted = 0
+        with zipfile.ZipFile(zip_path) as archive:
+            for info in archive.infolist():
+                if info.is_dir() or not any(fnmatch.fnmatch(info.filename, p) for p in patterns):
+                    continue
+                target = os.path.join(target_dir, *info.filename.split("/"))
+                os.makedirs(os.path.dirname(target), exist_ok=True)
+                with archive.open(info) as src, open(target, "wb") as dst:
+                    shutil.copyfileobj(src, dst, 1024 * 1024)
+                print(f"  {info.filename} ({info.file_size} 字节)")
+                extracted += 1
+        if not extracted:
+            print(f"✗ 没有匹配 {', '.join(patterns)} 的日志文件")
+        else:
+            print(f"✓ 已解压 {extracted} 个日志文件到: {target_dir}")
+        return target_dir
+    
+    def iter_artifacts(self, repo_name: str, run_id: Optional[int] = None,
+                       name: Optional[str] = None) -> Iterator[Dict]:
+        """分页遍历运行（或整个仓库）的构建产物，name 为精确名称过滤"""
+        base = f"/repos/{self.client.username}/{repo_name}/actions"
+        endpoint = f"{base}/runs/{run_id}/artifacts" if run_id else f"{base}/artifacts"
+        params = {"name": name} if name else None
+        return self.client.paginate(endpoint, params=params, key="artifacts")
+    
+    def list_artifacts(self, repo_name: str, run_id: Optional[int] = None,
+                       name: Optional[str] = None) -> List[Dict]:
+        """列出构建产物"""
+        artifacts = list(self.iter_artifacts(repo_name, run_id, name))
+        scope = f"运行 {run_id}" if run_id else repo_name
+        print(f"\n{scope} 共有 {len(artifacts)} 个构建产物:")
+        for artifact in artifacts:
+            expired = " (已过期)" if artifact.get("expired") else ""
+            run = (artifact.get("workflow_run") or {}).get("id", "-")
+            print(f"  [{artifact['id']}] {artifact['name']}{expired}")
+            print(f"      大小: {artifact['size_in_bytes'] / 1024 / 1024:.1f} MB  运行: {run}  "
+                  f"创建: {artifact['created_at']}")
+            if artifact.get("digest"):
+                print(f"      摘要: {artifact['digest']}")
+        return artifacts
+    
+    def get_artifacts(self, repo_name: str, run_ids: List[int],
+                      patterns: Optional[List[str]] = None, output_dir: str = "artifacts",
+                      extract: bool = False, max_workers: int = 4) -> List[Dict]:
+        """
+        并发下载多个运行的构建产物
+        
+        每个产物保存为 <output_dir>/<run_id>/<name>.zip，在有界线程池上流式写入
+        .part 文件并用 Range 续传（重新运行即可继续中断的下载），已存在的文件
+        直接跳过。摘要 (digest) 相同的产物只下载一次，其余位置使用硬链接（不支持
+        时复制）；下载完成后校验 sha256 摘要。
+        
+        Args:
+            repo_name: 仓库名称
+            run_ids: 运行 ID 列表
+            patterns: 产物名称通配符，默认全部
+            output_dir: 保存目录
+            extract: 下载后逐个成员流式解压到 <output_dir>/<run_id>/<name>/
+            max_workers: 最大并发数
+        
+        Returns:
+            每个产物的结果 (artifact, path, downloaded, error)
+        """
+        listed = run_concurrent(
+            lambda run_id: list(self.iter_artifacts(repo_name, run_id)),
+            run_ids,
+            max_workers=max_workers
+        )
+        artifacts = []
+        for run_id, found, error in listed:
+            if error:
+                print(f"✗ 无法列出运行 {run_id} 的构建产物: {error}")
+                continue
+            for artifact in found:
+                if patterns and not any(fnmatch.fnmatch(artifact["name"], p) for p in patterns):
+                    continue
+                if artifact.get("expired"):
+                    print(f"- [{run_id}] {artifact['name']}: 已过期，跳过")
+                    continue
+                artifact["path"] = os.path.join(output_dir, str(run_id), f"{artifact['name']}.zip")
+                artifacts.append(artifact)
+        
+        # 按摘要分组，每组只下载第一个，没有摘要的产物单独成组
+        groups: Dict[str, List[Dict]] = {}
+        for artifact in artifacts:
+            groups.setdefault(artifact.get("digest") or f"id:{artifact['id']}", []).append(artifact)
+        unique = [group[0] for group in groups.values()]
+        total = sum(artifact["size_in_bytes"] for artifact in unique)
+        print(f"\n{len(artifacts)} 个构建产物，去重后下载 {len(unique)} 个 "
+              f"({total / 1024 / 1024:.1f} MB)")
+        
+        progress = ProgressReporter(len(unique), label="get-artifacts")
+        results = run_concurrent(
+            lambda artifact: self._download_artifact(repo_name, artifact),
+            unique,
+            max_workers=max_workers,
+            on_done=lambda r: progress.advance(ok=r[2] is None)
+        )
+        
+        report = []
+        for artifact, downloaded, error in results:
+            group = groups[artifact.get("digest") or f"id:{artifact['id']}"]
+            if error:
+                print(f"✗ {artifact['name']} [{artifact['id']}]: {error}")
+                report.extend({"artifact": a, "path": None, "downloaded": False, "error": str(error)}
+                              for a in group)
+                continue
+            for copy in group:
+                if copy is not artifact and not os.path.exists(copy["path"]):
+                    os.makedirs(os.path.dirname(copy["path"]), exist_ok=True)
+                    try:
+                        os.link(artifact["path"], copy["path"])
+                    except OSError:
+                        shutil.copyfile(artifact["path"], copy["path"])
+                if extract:
+                    self.extract_artifact(copy["path"], copy["path"][:-len(".zip")])
+                report.append({"artifact": copy, "path": copy["path"],
+                               "downloaded": copy is artifact and downloaded, "error": None})
+        
+        print(f"\n{progress.summary()}")
+        print(f"✓ 构建产物已保存到: {output_dir}")
+        return report
+    
+    def _download_artifact(self, repo_name: str, artifact: Dict) -> bool:
+        """下载单个产物并校验摘要，返回是否实际下载（已存在时为 False）"""
+        path = artifact["path"]
+        if os.path.exists(path):
+            print(f"  = {artifact['name']}: 已存在 {path}")
+            return False
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        start = time.monotonic()
+        size = self.client.download(
+            f"/repos/{self.client.username}/{repo_name}/actions/artifacts/{artifact['id']}/zip",
+            path
+        )
+        elapsed = time.monotonic() - start
+        
+        digest = artifact.get("digest") or ""
+        if digest.startswith("sha256:"):
+            sha256 = hashlib.sha256()
+            with open(path, "rb") as f:
+                for chunk in iter(lambda: f.read(1024 * 1024), b""):
+                    sha256.update(chunk)
+            if sha256.hexdigest() != digest[len("sha256:"):]:
+                os.remove(path)
+                raise APIError(f"摘要不匹配，已删除 {path}")
+        
+        rate = size / elapsed / 1024 / 1024 if elapsed > 0 else 0.0
+        print(f"  ✓ {artifact['name']} [{artifact['id']}] {size / 1024 / 1024:.1f} MB，"
+              f"{elapsed:.1f}s，{rate:.1f} MB/s")
+        return True
+    
+    @staticmethod
+    def extract_artifact(zip_path: str, target_dir: str) -> str:
+        """逐个成员流式解压产物 ZIP，跳过越出目标目录的路径"""
+        root = os.path.realpath(target_dir)
+        with zipfile.ZipFile(zip_path) as archive:
+            for info in archive.infolist():
+                target = os.path.realpath(os.path.join(root, *info.filename.split("/")))
+                if not target.startswith(root + os.sep):
+                    continue
+                if info.is_dir():
+                    os.makedirs(target, exist_ok=True)
+                    continue
+                os.makedirs(os.path.dirname(target), exist_ok=True)
+                with archive.open(info) as src, open(target, "wb") as dst:
+                    shutil.copyfileobj(src, dst, 1024 * 1024)
+        return target_dir
+    
+    def delete_run(self, repo_name: str, run_id: int) -> bool:
+        """删除 workflow 运行记录"""
+        self.client._request(
+            "DELETE",
+            f"/repos/{self.client.username}/{repo_name}/actions/runs/{run_id}"
+        )
+        print(f"✓ 运行记录已删除: {run_id}")
+        return True
+    
+    def iter_runs_before(self, repo_name: str, before: str,
+                         workflow_id: Optional[str] = None,
+                         status: Optional[str] = None) -> Iterator[Dict]:
+        """
+        分页遍历 before 之前创建的运行（新 -> 旧）
+        
+        带过滤条件的查询最多返回 1000 条，达到上限后以已读到的最早创建时间为
+        新的上界继续查询，同一秒创建的运行按 ID 去重。
+        """
+        upper = f"<{before}"
+        boundary_ids = set()
+        while True:
+            count = 0
+            oldest = None
+            oldest_ids = set()
+            for run in self.iter_runs(repo_name, workflow_id, status, created=upper):
+                count += 1
+                if run["id"] in boundary_ids:
+                    continue
+                if run["created_at"] != oldest:
+                    oldest = run["created_at"]
+                    oldest_ids = set()
+                oldest_ids.add(run["id"])
+                yield run
+            if count < RUN_QUERY_LIMIT or oldest is None:
+                return
+            upper = f"<={oldest}"
+            boundary_ids = oldest_ids
+    
+    def prune_runs(self, repo_name: str, older_than: int, keep_last: int = 0,
+                   status: Optional[str] = "completed",
+                   workflow_id: Optional[str] = None, dry_run: bool = False,
+                   max_workers: int = 4, restart: bool = False) -> Dict:
+        """
+        按保留策略批量删除运行记录
+        
+        先保护最新的 keep_last 个运行（只读取需要的页数），再只分页读取早于
+        截止时间的运行并流式选出待删除的 ID，写入检查点后在有界线程池上删除；
+        删除请求由客户端写操作节流器统一限速。已删除的 ID 逐条追加到检查点，
+        中断后以相同条件再次运行会跳过选择阶段并只删除剩余部分。
+        
+        Args:
+            repo_name: 仓库名称
+            older_than: 只删除早于该秒数之前创建的运行
+            keep_last: 始终保留最新的运行数量
+            status: 运行状态过滤（如 completed）
+            workflow_id: 只处理指定的 workflow
+            dry_run: 只统计待删除数量
+            max_workers: 并发删除数
+            restart: 忽略检查点，重新选择
+        
+        Returns:
+            统计信息 (selected, deleted, failed)
+        """
+        owner = self.client.username
+        criteria = {"older_than": older_than, "keep_last": keep_last,
+                    "status": status, "workflow": workflow_id}
+        meta_path = cache_path("checkpoints", "prune-runs", owner, repo_name, "meta.json")
+        victims_path = cache_path("checkpoints", "prune-runs", owner, repo_name, "victims.txt")
+        done_path = cache_path("checkpoints", "prune-runs", owner, repo_name, "done.txt")
+        
+        meta = read_json(meta_path, default={})
+        resume = (not dry_run and not restart and not meta.get("complete")
+                  and meta.get("criteria") == criteria)
+        if resume:
+            with open(victims_path, "r") as f:
+                victims = [int(line) for line in f if line.strip()]
+            print(f"从检查点继续: 已选出 {len(victims)} 个运行")
+        else:
+            victims = self._select_prune_victims(
+                repo_name, older_than, keep_last, status, workflow_id, dry_run
+            )
+            if dry_run:
+                return {"selected": len(victims), "deleted": 0, "failed": 0}
+            with open(victims_path, "w") as f:
+                f.writelines(f"{run_id}\n" for run_id in victims)
+            open(done_path, "w").close()
+            write_json(meta_path, {"criteria": criteria, "selected": len(victims)})
+        
+        with open(done_path, "r") as f:
+            done = {int(line) for line in f if line.strip()}
+        pending = [run_id for run_id in victims if run_id not in done]
+        if not pending:
+            write_json(meta_path, {"criteria": criteria, "selected": len(victims), "complete": True})
+            print(f"✓ 没有需要删除的运行（已删除 {len(done)} 个）")
+            return {"selected": len(victims), "deleted": len(done), "failed": 0}
+        
+        endpoint = f"/repos/{owner}/{repo_name}/actions/runs"
+        
+        def delete(run_id: int):
+            try:
+                self.client.request_with_retry("DELETE", f"{endpoint}/{run_id}")
+            except APIError as e:
+                # 已被删除的运行视为完成
+                if e.status_code != 404:
+                    raise
+        
+        progress = ProgressReporter(len(pending), label="prune-runs")
+        failed = 0
+        with open(done_path, "a") as done_file:
+            def on_done(result):
+                nonlocal failed
+                run_id, _, error = result
+                if error:
+                    failed += 1
+                    print(f"✗ 删除 {run_id} 失败: {error}")
+                else:
+                    done_file.write(f"{run_id}\n")
+                    done_file.flush()
+                progress.advance(ok=error is None)
+            
+            # 分批提交，避免一次性创建大量 future
+            batch_size = 500
+            for start in range(0, len(pending), batch_size):
+                run_concurrent(delete, pending[start:start + batch_size],
+                               max_workers=max_workers, on_done=on_done)
+        
+        print(f"\n{progress.summary()}")
+        deleted = len(pending) - failed + len(done)
+        if failed:
+            print(f"{failed} 个删除失败，再次运行相同命令会重试")
+        else:
+            write_json(meta_path, {"criteria": criteria, "selected": len(victims), "complete": True})
+        return {"selected": len(victims), "deleted": deleted, "failed": failed}
+    
+    def _select_prune_victims(self, repo_name: str, older_than: int, keep_last: int,
+                              status: Optional[str], workflow_id: Optional[str],
+                              verbose: bool) -> List[int]:
+        """流式选出待删除的运行 ID（只保留 ID，不保留运行详情）"""
+        protected = {
+            run["id"]
+            for run in itertools.islice(
+                self.iter_runs(repo_name, workflow_id, status, per_page=min(max(keep_last, 1), 100)),
+                keep_last
+            )
+        }
+        cutoff = datetime.now(timezone.utc) - timedelta(seconds=older_than)
+        before = cutoff.strftime("%Y-%m-%dT%H:%M:%SZ")
+        
+        victims = []
+        by_workflow: Dict[str, int] = {}
+        oldest = None
+        for run in self.iter_runs_before(repo_name, before, workflow_id, status):
+            if run["id"] in protected:
+                continue
+            victims.append(run["id"])
+            by_workflow[run["name"]] = by_workflow.get(run["name"], 0) + 1
+            oldest = run["created_at"]
+        
+        print(f"\n{before} 之前创建的运行中有 {len(victims)} 个待删除"
+              f"（保留最新 {keep_last} 个）")
+        if verbose and victims:
+            for name, count in sorted(by_workflow.items(), key=lambda item: -item[1]):
+                print(f"  {name:<40} {count}")
+            print(f"  最早: {oldest}")
+        return victims
+    
     def cancel_run(self, repo_name: str, run_id: int) -> bool:
         """取消正在运行的 workflow"""
         self.client._request(
@@ -78,3 +770,309 @@ class WorkflowManager:
         )
         print(f"✓ 已请求取消运行: {run_id}")
         return True
+    
+    def rerun(self, repo_name: str, run_id: int, failed_only: bool = False) -> bool:
+        """重新运行 workflow（failed_only 时只重新运行失败的 jobs）"""
+        action = "rerun-failed-jobs" if failed_only else "rerun"
+        self.client._request(
+            "POST",
+            f"/repos/{self.client.username}/{repo_name}/actions/runs/{run_id}/{action}"
+        )
+        mode = "失败的 jobs" if failed_only else "全部"
+        print(f"✓ 已触发重新运行 ({mode}): {run_id}")
+        return True
+    
+    def set_state(self, repo_name: str, workflow_id: str, enabled: bool) -> bool:
+        """启用或禁用 workflow"""
+        action = "enable" if enabled else "disable"
+        self.client._request(
+            "PUT",
+            f"/repos/{self.client.username}/{repo_name}/actions/workflows/{workflow_id}/{action}"
+        )
+        print(f"✓ Workflow 已{'启用' if enabled else '禁用'}: {workflow_id}")
+        return True
+    
+    def _fetch_workflow_ids(self, full_name: str) -> Dict[str, int]:
+        """仓库中 workflow 文件名和显示名称 -> ID"""
+        ids = {}
+        for workflow in self.client.paginate(f"/repos/{full_name}/actions/workflows", key="workflows"):
+            ids[workflow["path"].rsplit("/", 1)[-1]] = workflow["id"]
+            ids[workflow["name"]] = workflow["id"]
+        return ids
+    
+    def resolve_workflow_ids(self, repos: List[Dict], name: str, max_workers: int = 16,
+                             refresh: bool = False) -> Dict[str, Optional[int]]:
+        """
+        按文件名或显示名称解析各仓库的 workflow ID
+        
+        名称 -> ID 的映射按仓库保存在本地，缓存中已有该名称的仓库不再请求 API；
+        缓存中没有的仓库（可能是新增的 workflow）重新读取 workflow 列表。
+        
+        Returns:
+            full_name -> workflow ID，仓库中没有该 workflow 时为 None
+        """
+        path = cache_path("workflows", self.client.username, "ids.json")
+        cached = read_json(path) or {}
+        stale = [repo["full_name"] for repo in repos
+                 if refresh or name not in cached.get(repo["full_name"], {})]
+        if stale:
+            results = run_concurrent(self._fetch_workflow_ids, stale, max_workers=max_workers)
+            for full_name, ids, error in results:
+                if error:
+                    print(f"✗ 无法读取 {full_name} 的 workflow 列表: {error}")
+                    continue
+                cached[full_name] = ids
+            write_json(path, cached)
+        return {repo["full_name"]: cached.get(repo["full_name"], {}).get(name) for repo in repos}
+    
+    def bulk_set_state(self, repos: List[Dict], name: str, enabled: bool,
+                       max_workers: int = 16, refresh: bool = False,
+                       dry_run: bool = False) -> Dict:
+        """
+        在多个仓库中并发启用或禁用同名 workflow
+        
+        先用本地映射解析 workflow ID，再在连接池客户端上并发发送 enable/disable
+        请求；缓存的 ID 已失效（404）的仓库重新解析后重试一次。从开始解析到最后
+        一个请求完成的时间作为总用时输出。
+        
+        Args:
+            repos: 仓库列表（需包含 full_name）
+            name: workflow 文件名（如 deploy.yml）或显示名称
+            enabled: True 启用，False 禁用
+            max_workers: 最大并发数
+            refresh: 忽略本地映射，重新读取 workflow 列表
+            dry_run: 只输出解析结果
+        
+        Returns:
+            统计 (changed, missing, failed, seconds)
+        """
+        started = time.monotonic()
+        ids = self.resolve_workflow_ids(repos, name, max_workers=max_workers, refresh=refresh)
+        resolved = time.monotonic() - started
+        targets = [(full_name, workflow_id) for full_name, workflow_id in ids.items() if workflow_id]
+        missing = sorted(full_name for full_name, workflow_id in ids.items() if not workflow_id)
+        verb = "启用" if enabled else "禁用"
+        print(f"{len(targets)} 个仓库中有 {name}，{len(missing)} 个没有（解析用时 {resolved:.1f}s）")
+        if dry_run:
+            for full_name, workflow_id in targets:
+                print(f"  {full_name}: {workflow_id}")
+            return {"changed": 0, "missing": len(missing), "failed": 0, "seconds": resolved}
+        
+        action = "enable" if enabled else "disable"
+        
+        def apply(target: Tuple[str, int]):
+            full_name, workflow_id = target
+            self.client.request_with_retry(
+                "PUT", f"/repos/{full_name}/actions/workflows/{workflow_id}/{action}"
+            )
+        
+        progress = ProgressReporter(len(targets), label=f"{action}-workflows")
+        results = run_concurrent(apply, targets, max_workers=max_workers,
+                                 on_done=lambda r: progress.advance(ok=r[2] is None))
+        
+        # 缓存的 ID 失效（workflow 被删除后重建等）时重新解析并重试一次
+        stale = [{"full_name": target[0]} for target, _, error in results
+                 if isinstance(error, APIError) and error.status_code == 404]
+        failed = {target[0]: error for target, _, error in results if error}
+        vanished = 0
+        if stale:
+            fresh = self.resolve_workflow_ids(stale, name, max_workers=max_workers, refresh=True)
+            retry = [(full_name, workflow_id) for full_name, workflow_id in fresh.items() if workflow_id]
+            for full_name, workflow_id in fresh.items():
+                if not workflow_id:
+                    failed.pop(full_name, None)
+                    vanished += 1
+            for target, _, error in run_concurrent(apply, retry, max_workers=max_workers):
+                if error:
+                    failed[target[0]] = error
+                else:
+                    failed.pop(target[0], None)
+        elapsed = time.monotonic() - started
+        
+        for full_name, error in sorted(failed.items()):
+            print(f"✗ {full_name}: {error}")
+        changed = len(targets) - len(failed) - vanished
+        print(f"\n✓ 已在 {changed} 个仓库{verb} {name}，失败 {len(failed)} 个，"
+              f"总用时 {elapsed:.1f}s（解析 {resolved:.1f}s）")
+        return {"changed": changed, "missing": len(missing) + vanished, "failed": len(failed),
+                "seconds": elapsed}
+    
+    def iter_caches(self, repo_name: str, key: Optional[str] = None,
+                    ref: Optional[str] = None) -> Iterator[Dict]:
+        """分页遍历 Actions 缓存，key 为前缀过滤，ref 为分支引用（如 refs/heads/main）"""
+        params = {"sort": "last_accessed_at", "direction": "desc"}
+        if key:
+            params["key"] = key
+        if ref:
+            params["ref"] = ref
+        return self.client.paginate(
+            f"/repos/{self.client.username}/{repo_name}/actions/caches",
+            params=params,
+            key="actions_caches"
+        )
+    
+    def _cache_snapshot_path(self, repo_name: str) -> str:
+        return cache_path("caches", self.client.username, repo_name, "snapshot.json")
+    
+    def list_caches(self, repo_name: str, key: Optional[str] = None,
+                    ref: Optional[str] = None) -> List[Dict]:
+        """
+        列出 Actions 缓存（按最近访问时间从新到旧）
+        
+        不带过滤条件时同时把完整列表保存为本地快照，供 caches usage --offline 使用。
+        """
+        caches = [
+            {field: cache.get(field) for field in CACHE_FIELDS}
+            for cache in self.iter_caches(repo_name, key, ref)
+        ]
+        if not key and not ref:
+            write_json(self._cache_snapshot_path(repo_name), {"taken_at": time.time(), "caches": caches})
+        
+        total = sum(cache["size_in_bytes"] for cache in caches)
+        print(f"\n{repo_name} 共有 {len(caches)} 个缓存，合计 {_format_size(total)}:")
+        for cache in caches:
+            print(f"  [{cache['id']}] {cache['key']}")
+            print(f"      {_format_size(cache['size_in_bytes']):>9}  {cache['ref']}  "
+                  f"最近访问: {cache['last_accessed_at']}")
+        return caches
+    
+    def cache_usage(self, repo_name: str, by: str = "prefix", depth: Optional[int] = None,
+                    top: int = 20, offline: bool = False) -> List[Dict]:
+        """
+        按键前缀或 ref 汇总缓存占用
+        
+        "可回收" 为同一前缀、同一 ref 下除最近访问的一个之外的旧版本缓存大小，
+        通常是键中哈希变化后留下、不会再被命中的缓存。
+        
+        Args:
+            repo_name: 仓库名称
+            by: 汇总维度 prefix 或 ref
+            depth: 前缀取键中前 depth 段（按 - 分隔），默认去掉末尾的哈希/数字段
+            top: 输出的分组数
+            offline: 使用本地快照，不访问 API
+        
+        Returns:
+            分组统计 (group, count, size, reclaimable, last_accessed)，按大小降序
+        """
+        path = self._cache_snapshot_path(repo_name)
+        if offline:
+            snapshot = read_json(path)
+            if snapshot is None:
+                raise GitHubManagerError(f"没有 {repo_name} 的缓存快照，请先运行 caches list {repo_name}")
+        else:
+            caches = [
+                {field: cache.get(field) for field in CACHE_FIELDS}
+                for cache in self.iter_caches(repo_name)
+            ]
+            snapshot = {"taken_at": time.time(), "caches": caches}
+            write_json(path, snapshot)
+        caches = snapshot["caches"]
+        
+        latest: Dict[Tuple[str, str], Dict] = {}
+        for cache in caches:
+            slot = (cache_prefix(cache["key"], depth), cache["ref"])
+            if slot not in latest or cache["last_accessed_at"] > latest[slot]["last_accessed_at"]:
+                latest[slot] = cache
+        
+        groups: Dict[str, Dict] = {}
+        for cache in caches:
+            prefix = cache_prefix(cache["key"], depth)
+            name = prefix if by == "prefix" else cache["ref"]
+            group = groups.setdefault(name, {"group": name, "count": 0, "size": 0,
+                                             "reclaimable": 0, "last_accessed": ""})
+            group["count"] += 1
+            group["size"] += cache["size_in_bytes"]
+            group["last_accessed"] = max(group["last_accessed"], cache["last_accessed_at"])
+            if latest[(prefix, cache["ref"])] is not cache:
+                group["reclaimable"] += cache["size_in_bytes"]
+        ranked = sorted(groups.values(), key=lambda g: -g["size"])
+        
+        total = sum(cache["size_in_bytes"] for cache in caches)
+        reclaimable = sum(group["reclaimable"] for group in ranked)
+        taken = time.strftime("%Y-%m-%d %H:%M", time.localtime(snapshot["taken_at"]))
+        print(f"\n{repo_name} 缓存占用 {_format_size(total)} / {_format_size(CACHE_LIMIT)} "
+              f"({total / CACHE_LIMIT:.0%})，{len(caches)} 个缓存，快照时间 {taken}")
+        print(f"可回收（旧版本）: {_format_size(reclaimable)}")
+        print(f"\n  {'前缀' if by == 'prefix' else 'ref':<48} {'数量':>6} {'大小':>10} {'占比':>6} "
+              f"{'可回收':>10}  最近访问")
+        for group in ranked[:top]:
+            share = group["size"] / total if total else 0
+            print(f"  {group['group'][:48]:<48} {group['count']:>6} {_format_size(group['size']):>10} "
+                  f"{share:>6.1%} {_format_size(group['reclaimable']):>10}  {group['last_accessed'][:19]}")
+        if len(ranked) > top:
+            print(f"  ... 另有 {len(ranked) - top} 个分组")
+        return ranked
+    
+    def evict_caches(self, repo_name: str, prefix: Optional[str] = None,
+                     ref: Optional[str] = None, older_than: Optional[int] = None,
+                     dry_run: bool = False, max_workers: int = 8) -> Dict:
+        """
+        按键前缀、ref、最近访问时间批量删除缓存
+        
+        候选缓存在删除前重新列出（前缀和 ref 由服务端过滤），在有界线程池上并发
+        删除，写请求由客户端统一限速；已不存在的缓存视为删除成功。完成后同步
+        更新本地快照。
+        
+        Args:
+            repo_name: 仓库名称
+            prefix: 键前缀
+            ref: 分支引用（如 refs/heads/feature-x）
+            older_than: 只删除超过 older_than 秒未被访问的缓存
+            dry_run: 只输出将要删除的缓存
+            max_workers: 最大并发数
+        
+        Returns:
+            统计 (selected, deleted, failed, freed)
+        """
+        if not (prefix or ref or older_than):
+            raise GitHubManagerError("至少需要指定 --prefix、--ref 或 --older-than 之一")
+        
+        cutoff = None
+        if older_than:
+            cutoff = (datetime.now(timezone.utc) - timedelta(seconds=older_than)).strftime("%Y-%m-%dT%H:%M:%SZ")
+        victims = [
+            cache for cache in self.iter_caches(repo_name, prefix, ref)
+            if cutoff is None or cache["last_accessed_at"][:19] + "Z" < cutoff
+        ]
+        freed = sum(cache["size_in_bytes"] for cache in victims)
+        print(f"\n选中 {len(victims)} 个缓存，合计 {_format_size(freed)}")
+        if dry_run:
+            for cache in victims:
+                print(f"  [{cache['id']}] {cache['key']}  {cache['ref']}  "
+                      f"{_format_size(cache['size_in_bytes'])}  最近访问: {cache['last_accessed_at']}")
+            return {"selected": len(victims), "deleted": 0, "failed": 0, "freed": 0}
+        if not victims:
+            return {"selected": 0, "deleted": 0, "failed": 0, "freed": 0}
+        
+        endpoint = f"/repos/{self.client.username}/{repo_name}/actions/caches"
+        
+        def delete(cache: Dict):
+            try:
+                self.client.request_with_retry("DELETE", f"{endpoint}/{cache['id']}")
+            except APIError as e:
+                if e.status_code != 404:
+                    raise
+        
+        progress = ProgressReporter(len(victims), label="evict-caches")
+        results = run_concurrent(
+            delete,
+            victims,
+            max_workers=max_workers,
+            on_done=lambda r: progress.advance(ok=r[2] is None)
+        )
+        deleted = {cache["id"] for cache, _, error in results if error is None}
+        for cache, _, error in results:
+            if error:
+                print(f"✗ 删除缓存 {cache['key']} 失败: {error}")
+        
+        path = self._cache_snapshot_path(repo_name)
+        snapshot = read_json(path)
+        if snapshot is not None:
+            snapshot["caches"] = [cache for cache in snapshot["caches"] if cache["id"] not in deleted]
+            write_json(path, snapshot)
+        
+        freed = sum(cache["size_in_bytes"] for cache in victims if cache["id"] in deleted)
+        print(f"\n{progress.summary()}")
+        print(f"✓ 已释放 {_format_size(freed)}")
+        return {"selected": len(victims), "deleted": len(deleted),
+                "failed": len(victims) - len(deleted), "freed": freed}
@@ -0,0 +1,83 @@
+import hashlib
+import json
+import os
+import sys
+from typing import Any, Callable, Dict, List, Optional, Tuple, Union
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from config import Config  # noqa: E402
+
+
+class StubResponse:
+    def __init__(self, status_code: int, headers: Dict[str, str]):
+        self.status_code = status_code
+        self.headers = headers
+
+
+class StubClient:
+    """
+    测试用的 GitHubClient 替身
+    
+    pages: 端点 -> 列表或 (params -> 列表) 的函数，paginate/iter_pages 把其中的
+           数据作为一页返回；
+    responses: (方法, 端点) -> 返回值或 (params, json) -> 返回值的函数。
+    conditional_get 同样读取 responses，数据与上一次相同时视为 304。
+    所有请求记录在 calls 中。
+    """
+    
+    def __init__(self, username: str = "me"):
+        self.username = username
+        self.pages: Dict[str, Union[List[Dict], Callable[[Dict], List[Dict]]]] = {}
+        self.responses: Dict[tuple, Any] = {}
+        self.calls: List[tuple] = []
+        self._conditional: Dict[tuple, Any] = {}
+    
+    def iter_pages(self, endpoint: str, params: Optional[Dict] = None,
+                   key: Optional[str] = None, headers: Optional[Dict] = None):
+        """整个列表作为一页返回；ETag 由参数和数据计算，If-None-Match 匹配时返回 304"""
+        self.calls.append(("GET", endpoint, dict(params or {})))
+        source = self.pages.get(endpoint, [])
+        items = list(source(dict(params or {})) if callable(source) else source)
+        etag = '"%s"' % hashlib.md5(json.dumps([params, items], sort_keys=True).encode()).hexdigest()
+        if (headers or {}).get("If-None-Match") == etag:
+            yield StubResponse(304, {}), []
+            return
+        yield StubResponse(200, {"ETag": etag}), items
+    
+    def paginate(self, endpoint: str, params: Optional[Dict] = None,
+                 key: Optional[str] = None):
+        for _, items in self.iter_pages(endpoint, params, key):
+            yield from items
+    
+    def _request(self, method: str, endpoint: str, **kwargs) -> Any:
+        self.calls.append((method, endpoint, kwargs.get("params") or kwargs.get("json")))
+        response = self.responses.get((method, endpoint))
+        if callable(response):
+            return response(kwargs.get("params"), kwargs.get("json"))
+        return response
+    
+    def conditional_get(self, endpoint: str, params: Optional[Dict] = None) -> Tuple[Any, bool]:
+        data = self._request("GET", endpoint, params=params)
+        key = (endpoint, json.dumps(params, sort_keys=True))
+        changed = self._conditional.get(key) != data
+        self._conditional[key] = data
+        return data, changed
+    
+    def request_with_retry(self, method: str, endpoint: str, **kwargs) -> Any:
+        return self._request(method, endpoint, **kwargs)
+
+
+@pytest.fixture
+def stub_client() -> StubClient:
+    return StubClient()
+
+
+@pytest.fixture(autouse=True)
+def cache_dir(tmp_path, monkeypatch) -> str:
+    """每个测试使用独立的本地缓存目录"""
+    path = str(tmp_path / "cache")
+    monkeypatch.setattr(Config, "CACHE_DIR", path)
+    return path
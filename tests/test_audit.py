@@ -0,0 +1,72 @@
+import pytest
+
+from core.exceptions import GitHubManagerError
+from managers.audit import LEVEL_CODES, AccessMatrix, permission_code
+
+
+@pytest.mark.parametrize("collaborator, level", [
+    ({"role_name": "admin"}, "admin"),
+    ({"role_name": "write"}, "push"),
+    ({"role_name": "read"}, "pull"),
+    ({"role_name": "security-reviewer", "permissions": {"pull": True, "triage": True}}, "triage"),
+    ({"permissions": {"pull": True, "push": True, "admin": False}}, "push"),
+    ({}, "none"),
+])
+def test_permission_code(collaborator, level):
+    assert permission_code(collaborator) == LEVEL_CODES[level]
+
+
+@pytest.fixture
+def matrix() -> AccessMatrix:
+    return AccessMatrix.build({
+        "api": {"alice": LEVEL_CODES["admin"], "bob": LEVEL_CODES["pull"]},
+        "web": {"bob": LEVEL_CODES["push"]},
+        "docs": {},
+    })
+
+
+def test_build_and_lookup(matrix):
+    assert matrix.repos == ["api", "docs", "web"]
+    assert matrix.users == ["alice", "bob"]
+    assert matrix.get("api", "alice") == LEVEL_CODES["admin"]
+    assert matrix.get("web", "alice") == 0
+    assert matrix.get("missing", "alice") == 0
+    assert matrix.row("docs") == {}
+    assert matrix.row("web") == {"bob": LEVEL_CODES["push"]}
+
+
+def test_queries_by_level(matrix):
+    push = LEVEL_CODES["push"]
+    assert matrix.repos_for("bob") == [("api", LEVEL_CODES["pull"]), ("web", push)]
+    assert matrix.repos_for("bob", push) == [("web", push)]
+    assert matrix.repos_for("carol") == []
+    assert matrix.users_for("api", push) == [("alice", LEVEL_CODES["admin"])]
+    assert matrix.counts() == {"alice": 1, "bob": 2}
+    assert matrix.counts(LEVEL_CODES["admin"]) == {"alice": 1, "bob": 0}
+
+
+def test_diff(matrix):
+    current = AccessMatrix.build({
+        "api": {"alice": LEVEL_CODES["admin"]},
+        "web": {"bob": LEVEL_CODES["admin"], "carol": LEVEL_CODES["pull"]},
+    })
+    assert current.diff(matrix) == [
+        {"repo": "api", "user": "bob", "from": "pull", "to": "none"},
+        {"repo": "web", "user": "bob", "from": "push", "to": "admin"},
+        {"repo": "web", "user": "carol", "from": "none", "to": "pull"},
+    ]
+    assert matrix.diff(matrix) == []
+
+
+def test_save_and_load(matrix, tmp_path):
+    matrix.etags = {"api": '"e1"'}
+    path = str(tmp_path / "snapshot")
+    matrix.save(path)
+    loaded = AccessMatrix.load(path)
+    assert loaded.repos == matrix.repos
+    assert loaded.users == matrix.users
+    assert loaded.cells == matrix.cells
+    assert loaded.etags == {"api": '"e1"'}
+    assert loaded.taken_at == matrix.taken_at
+    with pytest.raises(GitHubManagerError):
+        AccessMatrix.load(str(tmp_path / "missing"))
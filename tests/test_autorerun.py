@@ -0,0 +1,39 @@
+from managers.autorerun import AutoRerunManager
+
+RUNS = "/repos/me/r/actions/runs"
+LATER = "2999-01-01T00:00:00Z"
+
+
+def _run(run_id, conclusion, name="CI"):
+    return {"id": run_id, "name": name, "status": "completed", "conclusion": conclusion,
+            "run_attempt": 1, "updated_at": LATER}
+
+
+def _job(name, conclusion):
+    return {"name": name, "conclusion": conclusion,
+            "started_at": "2024-01-01T00:00:00Z", "completed_at": "2024-01-01T00:02:30Z"}
+
+
+def test_watch_reruns_failed_and_timed_out_runs(stub_client):
+    stub_client.pages["/user/repos"] = [{"name": "r", "full_name": "me/r"}]
+    stub_client.responses[("GET", RUNS)] = {"workflow_runs": [
+        _run(1, "failure"), _run(2, "timed_out"), _run(3, "success"),
+        _run(4, "cancelled"), _run(5, "failure"), _run(6, "failure", name="Deploy"),
+    ]}
+    jobs = {
+        1: [_job("test (3.11)", "failure"), _job("lint", "success")],
+        2: [_job("test (3.12)", "timed_out")],
+        5: [_job("test (3.11)", "failure"), _job("build", "failure")],
+    }
+    for run_id, run_jobs in jobs.items():
+        stub_client.responses[("GET", f"{RUNS}/{run_id}/attempts/1/jobs")] = {"jobs": run_jobs}
+    
+    stats = AutoRerunManager(stub_client).watch("r", jobs="test*", workflows="CI",
+                                                interval=0.001, max_interval=0.005, duration=0.05)
+    assert [rerun["run_id"] for rerun in stats["reruns"]] == [1, 2]
+    assert stats["skipped"] == 1
+    assert stats["minutes"] == 6
+    params = next(c[2] for c in stub_client.calls if c[1] == RUNS)
+    assert params["status"] == "completed"
+    posts = [c[1] for c in stub_client.calls if c[0] == "POST"]
+    assert posts == [f"{RUNS}/1/rerun-failed-jobs", f"{RUNS}/2/rerun-failed-jobs"]
@@ -0,0 +1,98 @@
+import pytest
+
+from core.exceptions import APIError, GitHubManagerError
+from cli.parser import create_parser
+from managers.branch import BranchManager
+from utils.storage import cache_path, read_json
+
+
+def test_create_many_resolves_each_base_once(stub_client):
+    stub_client.responses[("GET", "/repos/me/a/git/refs/heads/release/1.x")] = {"object": {"sha": "A"}}
+    stub_client.responses[("GET", "/repos/me/b/git/refs/heads/release/1.x")] = {"object": {"sha": "B"}}
+    
+    def missing(params, body):
+        raise APIError("资源未找到", status_code=404)
+    stub_client.responses[("GET", "/repos/me/c/git/refs/heads/release/1.x")] = missing
+    for repo in "abc":
+        stub_client.responses[("POST", f"/repos/me/{repo}/git/refs")] = {}
+    
+    report = BranchManager(stub_client).create_many(
+        [("a", "x"), ("a", "y"), ("b", "x"), ("c", "x")], from_branch="release/1.x"
+    )
+    
+    assert [(r["repo"], r["branch"], r["ok"]) for r in report] == [
+        ("a", "x", True), ("a", "y", True), ("b", "x", True), ("c", "x", False)
+    ]
+    resolves = [endpoint for method, endpoint, _ in stub_client.calls if endpoint.endswith("1.x")]
+    assert sorted(resolves) == sorted(set(resolves))
+    created = sorted((endpoint, body["ref"], body["sha"]) for method, endpoint, body in stub_client.calls
+                     if method == "POST")
+    assert created == [
+        ("/repos/me/a/git/refs", "refs/heads/x", "A"),
+        ("/repos/me/a/git/refs", "refs/heads/y", "A"),
+        ("/repos/me/b/git/refs", "refs/heads/x", "B"),
+    ]
+
+
+def test_resolve_ref_encodes_branch_name(stub_client):
+    stub_client.responses[("GET", "/repos/me/a/git/refs/heads/fix/%231")] = {"object": {"sha": "S"}}
+    assert BranchManager(stub_client).resolve_ref("a", "fix/#1") == "S"
+
+
+def test_create_branches_rate_option():
+    parser = create_parser()
+    assert parser.parse_args(["create-branches", "a:x"]).rate == 10.0
+    assert parser.parse_args(["create-branches", "a:x", "--rate", "0"]).rate == 0
+
+
+def _compare(ahead, behind, date):
+    commit = {"commit": {"committer": {"date": date}}}
+    return {"status": "x", "ahead_by": ahead, "behind_by": behind,
+            "merge_base_commit": commit, "commits": [commit] * ahead}
+
+
+def test_analyze_classifies_branches(stub_client):
+    stub_client.responses[("GET", "/repos/me/r")] = {"default_branch": "main"}
+    stub_client.pages["/repos/me/r/branches"] = [
+        {"name": "main", "commit": {"sha": "M"}},
+        {"name": "done", "commit": {"sha": "D"}},
+        {"name": "fresh", "commit": {"sha": "M"}},
+        {"name": "old", "commit": {"sha": "O"}},
+        {"name": "wip", "commit": {"sha": "W"}, "protected": True},
+    ]
+    compares = {
+        "D": _compare(0, 4, "2020-01-01T00:00:00Z"),
+        "M": _compare(0, 0, "2099-01-01T00:00:00Z"),
+        "O": _compare(2, 9, "2020-01-01T00:00:00Z"),
+        "W": _compare(1, 0, "2099-01-01T00:00:00Z"),
+    }
+    for sha, data in compares.items():
+        stub_client.responses[("GET", f"/repos/me/r/compare/M...{sha}")] = data
+    
+    manager = BranchManager(stub_client)
+    report = {b["name"]: b for b in manager.analyze("r")}
+    assert {name: b["state"] for name, b in report.items()} == {
+        "done": "merged", "fresh": "active", "old": "stale", "wip": "active"
+    }
+    assert report["wip"]["protected"] is True
+    
+    # 缓存命中时不再请求 compare；缓存只保留本次用到的条目
+    stub_client.calls.clear()
+    stub_client.pages["/repos/me/r/branches"] = stub_client.pages["/repos/me/r/branches"][:2]
+    manager.analyze("r")
+    assert not [c for c in stub_client.calls if "/compare/" in c[1]]
+    assert list(read_json(cache_path("compare", "me", "r.json"))) == ["M...D"]
+
+
+def test_analyze_without_default_branch(stub_client):
+    stub_client.responses[("GET", "/repos/me/empty")] = {"default_branch": "main"}
+    stub_client.pages["/repos/me/empty/branches"] = []
+    with pytest.raises(GitHubManagerError, match="默认分支"):
+        BranchManager(stub_client).analyze("empty")
+
+
+def test_delete_many_encodes_names(stub_client):
+    stub_client.responses[("DELETE", "/repos/me/r/git/refs/heads/feat/%231")] = None
+    report = BranchManager(stub_client).delete_many("r", ["feat/#1"])
+    assert report == [{"branch": "feat/#1", "ok": True, "error": None}]
+    assert create_parser().parse_args(["stale-branches", "r", "--rate", "2"]).rate == 2
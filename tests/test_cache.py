@@ -0,0 +1,18 @@
+from core.cache import ETagCache
+
+
+def test_make_key_sorts_params():
+    assert ETagCache.make_key("/repos/me/r") == "/repos/me/r"
+    assert (ETagCache.make_key("/x", {"b": 2, "a": 1})
+            == ETagCache.make_key("/x", {"a": 1, "b": 2})
+            == "/x?a=1&b=2")
+
+
+def test_get_and_set():
+    cache = ETagCache()
+    key = ETagCache.make_key("/x", {"page": 1})
+    assert cache.get(key) is None
+    cache.set(key, '"v1"', [1])
+    cache.set(key, '"v2"', [2])
+    assert cache.get(key) == ('"v2"', [2])
+    assert len(cache) == 1
@@ -0,0 +1,90 @@
+import base64
+
+from core.exceptions import APIError
+from managers.campaign import CampaignManager
+
+BASE = "/repos/me/r"
+REPO = {"name": "r", "default_branch": "main"}
+
+
+def _missing(params, body):
+    raise APIError("资源未找到", status_code=404)
+
+
+def _serve(client, content=b"old\n", mode="100755", branch_exists=False):
+    client.responses.update({
+        ("GET", f"{BASE}/pulls"): [],
+        ("GET", f"{BASE}/git/refs/heads/main"): {"object": {"sha": "base"}},
+        ("GET", f"{BASE}/git/commits/base"): {"tree": {"sha": "root"}},
+        ("GET", f"{BASE}/git/trees/root"): {"tree": [{"path": "scripts", "type": "tree", "sha": "sub"}]},
+        ("GET", f"{BASE}/git/trees/sub"): {"tree": [
+            {"path": "run.sh", "type": "blob", "mode": mode, "sha": "blob"}
+        ]},
+        ("GET", f"{BASE}/git/blobs/blob"): {"content": base64.b64encode(content).decode()},
+        ("GET", f"{BASE}/git/refs/heads/fix"): {"object": {"sha": "old"}} if branch_exists else _missing,
+        ("POST", f"{BASE}/git/trees"): {"sha": "tree"},
+        ("POST", f"{BASE}/git/commits"): {"sha": "commit"},
+        ("POST", f"{BASE}/git/refs"): {},
+        ("PATCH", f"{BASE}/git/refs/heads/fix"): {},
+        ("POST", f"{BASE}/pulls"): {"html_url": "https://github.com/me/r/pull/1"},
+    })
+
+
+def _run(client, transform=lambda text: text.replace("old", "new"), **kwargs):
+    return CampaignManager(client).run([REPO], "/scripts/run.sh/", transform, "fix", "Fix",
+                                       max_workers=1, **kwargs)
+
+
+def _writes(client):
+    return [(method, endpoint) for method, endpoint, _ in client.calls if method != "GET"]
+
+
+def test_campaign_opens_pull_with_normalized_path_and_mode(stub_client):
+    _serve(stub_client)
+    assert _run(stub_client) == [
+        {"repo": "r", "status": "opened", "url": "https://github.com/me/r/pull/1", "error": None}
+    ]
+    tree = next(body for method, endpoint, body in stub_client.calls if endpoint == f"{BASE}/git/trees")
+    assert tree["tree"] == [{"path": "scripts/run.sh", "mode": "100755", "type": "blob", "content": "new\n"}]
+    assert _writes(stub_client) == [
+        ("POST", f"{BASE}/git/trees"), ("POST", f"{BASE}/git/commits"),
+        ("POST", f"{BASE}/git/refs"), ("POST", f"{BASE}/pulls"),
+    ]
+
+
+def test_campaign_moves_existing_branch_without_pull(stub_client):
+    _serve(stub_client, branch_exists=True)
+    assert _run(stub_client)[0]["status"] == "opened"
+    assert ("PATCH", f"{BASE}/git/refs/heads/fix") in _writes(stub_client)
+    assert ("POST", f"{BASE}/git/refs") not in _writes(stub_client)
+
+
+def test_campaign_skips_repos_with_open_pull(stub_client):
+    _serve(stub_client)
+    stub_client.responses[("GET", f"{BASE}/pulls")] = [{"html_url": "https://github.com/me/r/pull/7"}]
+    assert _run(stub_client)[0]["status"] == "exists"
+    assert _writes(stub_client) == []
+
+
+def test_campaign_skips_unchanged_and_unreadable_files(stub_client):
+    _serve(stub_client)
+    assert _run(stub_client, transform=lambda text: text)[0]["status"] == "skipped"
+    
+    _serve(stub_client, content=b"\xff\xfe")
+    result = _run(stub_client)[0]
+    assert result["status"] == "skipped" and "UTF-8" in result["error"]
+    
+    _serve(stub_client)
+    
+    def too_large(params, body):
+        raise APIError("too large", status_code=403)
+    
+    stub_client.responses[("GET", f"{BASE}/git/blobs/blob")] = too_large
+    assert _run(stub_client)[0]["status"] == "skipped"
+    assert _writes(stub_client) == []
+
+
+def test_campaign_dry_run_reports_changes_without_writing(stub_client):
+    _serve(stub_client)
+    assert _run(stub_client, dry_run=True)[0]["status"] == "changed"
+    assert _writes(stub_client) == []
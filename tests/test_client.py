@@ -0,0 +1,66 @@
+import core.client as client_module
+from core.client import GitHubClient
+
+
+class FakeDownload:
+    """模拟存储服务的流式响应"""
+    
+    def __init__(self, status_code, body=b"", length=None):
+        self.status_code = status_code
+        self.body = body
+        self.headers = {"Content-Length": str(len(body) if length is None else length)}
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, *exc):
+        return False
+    
+    def iter_content(self, chunk_size):
+        for i in range(0, len(self.body), 2):
+            yield self.body[i:i + 2]
+
+
+def _client(monkeypatch, replies):
+    client = GitHubClient("token", username="me")
+    urls = iter(["https://storage/1", "https://storage/2"])
+    requests_seen = []
+    
+    def get(url, headers, stream, timeout):
+        requests_seen.append((url, headers.get("Range")))
+        return replies.pop(0)
+    
+    monkeypatch.setattr(client, "redirect_location", lambda endpoint: next(urls))
+    monkeypatch.setattr(client.session, "get", get)
+    monkeypatch.setattr(client_module.time, "sleep", lambda seconds: None)
+    return client, requests_seen
+
+
+def test_download_resumes_with_range_after_truncation(monkeypatch, tmp_path):
+    path = str(tmp_path / "logs.zip")
+    client, seen = _client(monkeypatch, [
+        FakeDownload(200, b"hello ", length=11),
+        FakeDownload(403),
+        FakeDownload(206, b"world"),
+    ])
+    assert client.download("/repos/me/r/actions/runs/5/logs", path) == 11
+    with open(path, "rb") as f:
+        assert f.read() == b"hello world"
+    # 中断后续传；签名地址过期时重新获取地址
+    assert seen == [("https://storage/1", None), ("https://storage/1", "bytes=6-"),
+                    ("https://storage/2", "bytes=6-")]
+
+
+def test_download_continues_leftover_part_file(monkeypatch, tmp_path):
+    path = str(tmp_path / "logs.zip")
+    with open(f"{path}.part", "wb") as f:
+        f.write(b"hello ")
+    client, seen = _client(monkeypatch, [FakeDownload(206, b"world")])
+    assert client.download("/repos/me/r/actions/runs/5/logs", path) == 11
+    assert seen == [("https://storage/1", "bytes=6-")]
+    
+    # 服务端忽略 Range 时从头写入
+    client, _ = _client(monkeypatch, [FakeDownload(200, b"fresh")])
+    with open(f"{path}.part", "wb") as f:
+        f.write(b"stale")
+    assert client.download("/repos/me/r/actions/runs/5/logs", path) == 5
@@ -0,0 +1,58 @@
+import pytest
+
+from core.exceptions import GitHubManagerError
+from managers.collaborator import CollaboratorManager
+
+
+def _serve(client):
+    client.pages.update({
+        "/user/repos": [{"name": name} for name in ("team-a", "team-b", "infra")],
+        "/repos/me/team-a/collaborators": [
+            {"login": "me", "role_name": "admin"},
+            {"login": "Alice", "role_name": "read"},
+            {"login": "eve", "role_name": "write"},
+        ],
+        "/repos/me/team-a/invitations": [
+            {"id": 7, "invitee": {"login": "bob"}, "permissions": "write"},
+            {"id": 8, "invitee": {"login": "mallory"}, "permissions": "read"},
+        ],
+        "/repos/me/team-b/collaborators": [{"login": "eve", "role_name": "write"}],
+    })
+
+
+def test_plan_access_computes_minimal_changes(stub_client):
+    _serve(stub_client)
+    manager = CollaboratorManager(stub_client)
+    desired, prune = manager.resolve_policy({"policies": [
+        {"repos": "team-*", "collaborators": {"alice": "push", "bob": "admin"}},
+        {"repos": "team-a", "collaborators": {"carol": "pull"}, "prune": True},
+    ]})
+    assert prune == {"team-a": True, "team-b": False}
+    
+    changes = manager.plan_access(desired, prune)
+    assert [(c["repo"], c["user"], c["action"]) for c in changes] == [
+        ("team-a", "alice", "update"),
+        ("team-a", "bob", "update-invitation"),
+        ("team-a", "carol", "add"),
+        ("team-a", "eve", "remove"),
+        ("team-a", "mallory", "cancel-invitation"),
+        ("team-b", "alice", "add"),
+        ("team-b", "bob", "add"),
+    ]
+    assert changes[0]["from"] == "pull"
+    assert changes[1]["invitation_id"] == 7 and changes[1]["from"] == "push"
+
+
+def test_plan_access_is_empty_when_policy_matches(stub_client):
+    _serve(stub_client)
+    manager = CollaboratorManager(stub_client)
+    desired = {"team-b": {"eve": "push"}}
+    assert manager.plan_access(desired, {"team-b": True}) == []
+
+
+def test_resolve_policy_rejects_unknown_permission(stub_client):
+    _serve(stub_client)
+    with pytest.raises(GitHubManagerError):
+        CollaboratorManager(stub_client).resolve_policy(
+            {"policies": [{"repos": "*", "collaborators": {"alice": "owner"}}]}
+        )
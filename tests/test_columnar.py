@@ -0,0 +1,52 @@
+import os
+
+import pytest
+
+from utils.columnar import ColumnarTable, ColumnarWriter
+
+SCHEMA = [("id", "int64"), ("status", "dict"), ("sha", "str")]
+ROWS = [
+    {"id": 1, "status": "success", "sha": "a1"},
+    {"id": 2, "status": None, "sha": "b2"},
+    {"id": None, "status": "failure", "sha": "c,3"},
+    {"id": 4, "status": "success", "sha": "d4"},
+]
+
+
+def _round_trip(path, fmt, batch_size):
+    with ColumnarWriter(path, SCHEMA, fmt=fmt, batch_size=batch_size) as writer:
+        assert writer.write_all(ROWS) == len(ROWS)
+    return ColumnarTable.load(path)
+
+
+@pytest.mark.parametrize("batch_size", [1, 3, 100])
+def test_npy_round_trip(tmp_path, batch_size):
+    table = _round_trip(str(tmp_path / "runs"), "npy", batch_size)
+    assert len(table) == 4
+    assert list(table.columns["id"]) == [1, 2, 0, 4]
+    assert table.decode("status") == ["success", None, "failure", "success"]
+    assert table.columns["sha"] == ["a1", "b2", "c,3", "d4"]
+    assert table.types == {"id": "int64", "status": "dict", "sha": "str"}
+    assert table.code("status", "failure") == table.dictionaries["status"].index("failure")
+    assert table.code("status", "cancelled") == -1
+
+
+def test_parquet_round_trip(tmp_path):
+    pytest.importorskip("pyarrow")
+    table = _round_trip(str(tmp_path / "runs.parquet"), "parquet", 3)
+    assert list(table.columns["id"]) == [1, 2, 0, 4]
+    assert table.decode("status") == ["success", None, "failure", "success"]
+    assert table.columns["sha"] == ["a1", "b2", "c,3", "d4"]
+
+
+def test_load_selected_columns(tmp_path):
+    path = str(tmp_path / "runs")
+    _round_trip(path, "npy", 100)
+    table = ColumnarTable.load(path, ["status"])
+    assert list(table.columns) == ["status"]
+    assert os.path.exists(os.path.join(path, "strings.csv"))
+
+
+def test_unknown_format(tmp_path):
+    with pytest.raises(ValueError):
+        ColumnarWriter(str(tmp_path / "x"), SCHEMA, fmt="csv")
@@ -0,0 +1,100 @@
+import json
+
+import pytest
+
+from core.exceptions import APIError
+from managers.commit import CommitManager, CommitStore
+
+BASE = "/repos/me/r"
+
+
+def _commit(sha: str, parent: str = None) -> dict:
+    return {
+        "sha": sha,
+        "commit": {"message": f"commit {sha}\n\nbody",
+                   "author": {"name": "dev", "email": "dev@example.com", "date": "2024-01-01T00:00:00Z"}},
+        "parents": [{"sha": parent}] if parent else [],
+    }
+
+
+class Branch:
+    """main 分支的提交（旧 -> 新）及对应的 stub 接口"""
+    
+    def __init__(self, client, shas):
+        self.client = client
+        self.shas = list(shas)
+        self.gone = set()
+        client.responses[("GET", f"{BASE}/git/refs/heads/main")] = (
+            lambda params, body: {"object": {"sha": self.shas[-1]}}
+        )
+        client.pages[f"{BASE}/commits"] = lambda params: [
+            _commit(sha) for sha in reversed(self.shas[:self.shas.index(params["sha"]) + 1])
+        ]
+    
+    def push(self, *shas):
+        self.shas.extend(shas)
+        self._compare()
+    
+    def force_push(self, *shas):
+        self.gone.update(self.shas)
+        self.shas = list(shas)
+        self._compare()
+    
+    def _compare(self):
+        base = CommitStore("me", "r", "main").head_sha
+        tip = self.shas[-1]
+        
+        def compare(params, body):
+            if base in self.gone:
+                raise APIError("资源未找到", status_code=404)
+            new = self.shas[self.shas.index(base) + 1:]
+            if params.get("per_page") == 1:
+                return {"status": "ahead", "total_commits": len(new)}
+            start = (params["page"] - 1) * params["per_page"]
+            # compare 按时间排序，最后一个不一定是分支头部
+            return {"commits": [_commit(sha) for sha in sorted(new)[start:start + params["per_page"]]]}
+        self.client.responses[("GET", f"{BASE}/compare/{base}...{tip}")] = compare
+
+
+@pytest.fixture
+def branch(stub_client):
+    return Branch(stub_client, ["a1", "b2"])
+
+
+def _history():
+    return [c["sha"] for c in CommitStore("me", "r", "main").read()]
+
+
+def test_full_then_incremental_sync(stub_client, branch):
+    manager = CommitManager(stub_client)
+    assert manager.sync("r") == 2
+    assert _history() == ["b2", "a1"]
+    
+    stub_client.calls.clear()
+    assert manager.sync("r") == 0
+    assert len(stub_client.calls) == 1
+    
+    branch.push("d4", "c3")
+    assert manager.sync("r") == 2
+    assert CommitStore("me", "r", "main").head_sha == "c3"
+    assert CommitStore("me", "r", "main").meta["count"] == 4
+
+
+def test_force_push_falls_back_to_full_sync(stub_client, branch):
+    manager = CommitManager(stub_client)
+    manager.sync("r")
+    branch.force_push("x1", "x2", "x3")
+    assert manager.sync("r") == 3
+    assert _history() == ["x3", "x2", "x1"]
+
+
+def test_append_skips_commits_already_written(stub_client, branch):
+    manager = CommitManager(stub_client)
+    manager.sync("r")
+    store = CommitStore("me", "r", "main")
+    # 模拟上次追加后、写入元数据前中断
+    with open(store.data_path, "a", encoding="utf-8") as f:
+        f.write(json.dumps(CommitManager._compact(_commit("c3"))) + "\n")
+    branch.push("c3", "d4")
+    manager.sync("r")
+    assert _history() == ["d4", "c3", "b2", "a1"]
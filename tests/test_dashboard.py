@@ -0,0 +1,51 @@
+from core.exceptions import APIError
+from managers.dashboard import DashboardManager
+
+BASE = "/repos/me/r/actions"
+
+
+def _run(run_id, workflow_id, conclusion="success"):
+    return {"id": run_id, "workflow_id": workflow_id, "status": "completed", "conclusion": conclusion,
+            "head_branch": "main", "updated_at": f"2024-01-0{run_id}T00:00:00Z",
+            "html_url": f"https://github.com/me/r/actions/runs/{run_id}"}
+
+
+def _missing(params, body):
+    raise APIError("资源未找到", status_code=404)
+
+
+def _serve(client):
+    client.responses.update({
+        ("GET", "/repos/me/gone/actions/workflows"): _missing,
+        ("GET", f"{BASE}/workflows"): {"workflows": [
+            {"id": 1, "name": "CI", "state": "active"},
+            {"id": 2, "name": "CI", "state": "active"},
+            {"id": 3, "name": "Nightly", "state": "active"},
+            {"id": 4, "name": "Old", "state": "disabled_manually"},
+        ]},
+        ("GET", f"{BASE}/runs"): {"workflow_runs": [_run(3, 2, "failure"), _run(2, 1), _run(1, 1)]},
+        ("GET", f"{BASE}/workflows/3/runs"): {"workflow_runs": [_run(4, 3)]},
+    })
+
+
+def test_collect_keys_rows_by_workflow_id(stub_client):
+    _serve(stub_client)
+    rows = DashboardManager(stub_client).collect([{"full_name": "me/r"}, {"full_name": "me/gone"}])
+    assert {key: (row["workflow"], row["run_id"]) for key, row in rows.items() if row["status"] != "error"} == {
+        ("me/r", 1): ("CI", 2),
+        ("me/r", 2): ("CI", 3),
+        ("me/r", 3): ("Nightly", 4),
+    }
+    assert rows[("me/gone", 0)]["error"] == "资源未找到"
+    # 最近运行中已出现的 workflow 不再单独查询
+    queried = [c[1] for c in stub_client.calls if c[1].startswith(f"{BASE}/workflows/")]
+    assert queried == [f"{BASE}/workflows/3/runs"]
+
+
+def test_show_prints_workflows_with_duplicate_names(stub_client, capsys):
+    _serve(stub_client)
+    stub_client.pages["/user/repos"] = [{"name": "r", "full_name": "me/r"}]
+    rows = DashboardManager(stub_client).show("r", failing_only=True)
+    assert list(rows) == [("me/r", 2)]
+    out = capsys.readouterr().out
+    assert "CI" in out and "failure" in out and "Nightly" not in out
@@ -0,0 +1,142 @@
+import json
+
+import pytest
+
+import managers.issue_pr as issue_pr
+from core.exceptions import APIError, GitHubManagerError, RateLimitError
+from managers.issue_pr import IssuePRManager, read_issue_records
+
+ISSUES = "/repos/me/r/issues"
+
+
+def test_read_csv_records(tmp_path):
+    path = tmp_path / "issues.csv"
+    path.write_text("title,body,labels,milestone,extra\n"
+                    "Bug,details,bug; p1 ,3,x\n"
+                    "Task,,,,\n", encoding="utf-8")
+    assert list(read_issue_records(str(path))) == [
+        {"title": "Bug", "body": "details", "labels": ["bug", "p1"], "milestone": 3},
+        {"title": "Task"},
+    ]
+
+
+def test_read_rejects_non_numeric_milestone(tmp_path):
+    path = tmp_path / "issues.jsonl"
+    path.write_text(json.dumps({"title": "a", "milestone": "7"}) + "\n"
+                    + json.dumps({"title": "b", "milestone": "v1.0"}) + "\n", encoding="utf-8")
+    records = read_issue_records(str(path))
+    assert next(records)["milestone"] == 7
+    with pytest.raises(GitHubManagerError, match="issues.jsonl:2"):
+        next(records)
+
+
+@pytest.fixture
+def source(tmp_path):
+    path = tmp_path / "issues.jsonl"
+    path.write_text("".join(json.dumps({"title": f"t{i}", "body": "b"}) + "\n" for i in range(4)),
+                    encoding="utf-8")
+    return str(path)
+
+
+def test_import_resumes_from_checkpoint(stub_client, source):
+    created = []
+    limited = {"t2"}
+    
+    def post(params, body):
+        if body["title"] in limited:
+            limited.discard(body["title"])
+            raise RateLimitError("rate limited", retry_after=1, status_code=403)
+        if body["title"] == "t1":
+            raise APIError("Validation Failed", status_code=422)
+        created.append(body["title"])
+        return {"number": len(created)}
+    stub_client.responses[("POST", ISSUES)] = post
+    
+    manager = IssuePRManager(stub_client)
+    with pytest.raises(RateLimitError):
+        manager.import_issues("r", source)
+    state = manager.import_issues("r", source)
+    
+    assert created == ["t0", "t2", "t3"]
+    assert state["next"] == 4
+    assert state["created"] == 3
+    assert [f["title"] for f in state["failed"]] == ["t1"]
+    assert manager.import_issues("r", source)["created"] == 3
+
+
+def test_lost_response_is_not_posted_twice(stub_client, source, monkeypatch):
+    monkeypatch.setattr(issue_pr.time, "sleep", lambda seconds: None)
+    issues = []
+    
+    def post(params, body):
+        issues.append({"number": len(issues) + 1, **body})
+        if len(issues) == 1:
+            raise APIError("网络请求错误", status_code=None)
+        return issues[-1]
+    stub_client.responses[("POST", ISSUES)] = post
+    stub_client.responses[("GET", ISSUES)] = lambda params, body: list(reversed(issues))
+    
+    state = IssuePRManager(stub_client).import_issues("r", source)
+    assert [issue["title"] for issue in issues] == ["t0", "t1", "t2", "t3"]
+    assert state["created"] == 4
+
+
+def _issue(number, updated, **extra):
+    return {"number": number, "state": "open", "title": f"issue {number}", "user": {"login": "dev"},
+            "labels": [], "assignees": [], "comments": 0, "created_at": "2024-01-01T00:00:00Z",
+            "updated_at": updated, "body": "", **extra}
+
+
+def _comment(comment_id, number, updated, body):
+    return {"id": comment_id, "issue_url": f"https://api.github.com/repos/me/r/issues/{number}",
+            "user": {"login": "dev"}, "created_at": "2024-01-01T00:00:00Z",
+            "updated_at": updated, "body": body}
+
+
+class Tracker:
+    """按 since（闭区间）过滤的 Issue 和评论列表"""
+    
+    def __init__(self, client):
+        self.issues = {}
+        self.comments = {}
+        client.pages[ISSUES] = lambda params: self._since(self.issues, params)
+        client.pages[f"{ISSUES}/comments"] = lambda params: self._since(self.comments, params)
+    
+    @staticmethod
+    def _since(items, params):
+        rows = sorted(items.values(), key=lambda item: item["updated_at"])
+        return [item for item in rows if item["updated_at"] >= params.get("since", "")]
+
+
+def _comment_bodies():
+    store = issue_pr.IssueStore("me", "r")
+    try:
+        return [row["body"] for row in store.db.execute("SELECT body FROM comments ORDER BY id")]
+    finally:
+        store.close()
+
+
+def test_sync_reaches_304_and_mirrors_comment_edits(stub_client):
+    tracker = Tracker(stub_client)
+    tracker.issues[1] = _issue(1, "2024-01-02T00:00:00Z", labels=[{"name": "bug"}])
+    tracker.issues[2] = _issue(2, "2024-01-03T00:00:00Z", pull_request={"merged_at": None})
+    tracker.comments[10] = _comment(10, 1, "2024-01-02T00:00:00Z", "first")
+    manager = IssuePRManager(stub_client)
+    
+    assert manager.sync("r") == 2
+    # 水位移动后的第一次同步只返回边界数据，不计为变化
+    assert manager.sync("r") == 0
+    stub_client.calls.clear()
+    assert manager.sync("r") == 0
+    assert len(stub_client.calls) == 2
+    
+    # 编辑评论不改变 Issue 的 updated_at
+    tracker.comments[10] = _comment(10, 1, "2024-01-05T00:00:00Z", "edited")
+    assert manager.sync("r") == 0
+    assert _comment_bodies() == ["edited"]
+    
+    tracker.issues[1] = _issue(1, "2024-01-06T00:00:00Z", state="closed")
+    assert manager.sync("r") == 1
+    rows = manager.query("r", state="all", kind="pr")
+    assert [row["number"] for row in rows] == [2]
+    assert manager.query("r", state="closed")[0]["labels"] == []
@@ -0,0 +1,88 @@
+from managers.logs import LogIndex, LogManager, split_steps
+
+RUN = "/repos/me/r/actions/runs/5"
+
+STEPS = [
+    {"number": 1, "name": "Set up job", "status": "completed", "conclusion": "success",
+     "started_at": "2024-01-01T00:00:00Z", "completed_at": "2024-01-01T00:00:01Z"},
+    {"number": 2, "name": "Run tests", "status": "completed", "conclusion": "failure",
+     "started_at": "2024-01-01T00:00:02Z", "completed_at": "2024-01-01T00:00:05Z"},
+]
+
+LOG = """\ufeff2024-01-01T00:00:00.1000000Z Prepare workflow
+2024-01-01T00:00:03.2000000Z collected 2 items
+continuation without timestamp
+2024-01-01T00:00:04.9000000Z FAILED tests/test_api.py::test_timeout - connection refused
+2024-01-01T00:00:05.0000000Z ##[error]Process completed with exit code 1.
+"""
+
+
+def _write_log(path):
+    with open(path, "w", encoding="utf-8") as f:
+        f.write(LOG)
+
+
+def test_split_steps_assigns_lines_by_timestamp(tmp_path):
+    path = str(tmp_path / "job.txt")
+    _write_log(path)
+    assert list(split_steps(path, STEPS)) == [
+        (1, 1, "Prepare workflow"),
+        (2, 2, "collected 2 items"),
+        (3, 2, "continuation without timestamp"),
+        (4, 2, "FAILED tests/test_api.py::test_timeout - connection refused"),
+        (5, 2, "##[error]Process completed with exit code 1."),
+    ]
+
+
+def _serve(client, conclusion="failure"):
+    downloads = []
+    
+    def download(endpoint, path):
+        downloads.append(endpoint)
+        _write_log(path)
+        return len(LOG)
+    
+    client.download = download
+    client.responses[("GET", RUN)] = {"id": 5, "name": "CI", "conclusion": conclusion,
+                                      "created_at": "2024-01-01T00:00:00Z"}
+    client.pages[f"{RUN}/jobs"] = [
+        {"id": 11, "run_id": 5, "name": "test", "conclusion": "failure", "steps": STEPS},
+        {"id": 12, "run_id": 5, "name": "lint", "conclusion": "success", "steps": []},
+    ]
+    return downloads
+
+
+def test_failures_downloads_failed_jobs_once(stub_client, capsys):
+    downloads = _serve(stub_client)
+    manager = LogManager(stub_client)
+    report = manager.failures("r", 5, tail=1)
+    assert downloads == ["/repos/me/r/actions/jobs/11/logs"]
+    assert report == [{"job": "test", "step": "Run tests", "lines": [
+        "collected 2 items", "continuation without timestamp",
+        "FAILED tests/test_api.py::test_timeout - connection refused",
+        "##[error]Process completed with exit code 1.",
+    ]}]
+    out = capsys.readouterr().out
+    assert "»      4 FAILED" in out and "collected 2 items" not in out
+    
+    # 作业已索引时不再下载，但运行记录仍然更新
+    downloads = _serve(stub_client, conclusion="cancelled")
+    assert manager.failures("r", 5) == report
+    assert downloads == []
+    index = LogIndex("me", "r")
+    try:
+        row = index.db.execute("SELECT conclusion FROM runs WHERE run_id = 5").fetchone()
+        assert row["conclusion"] == "cancelled"
+    finally:
+        index.close()
+
+
+def test_search_uses_local_index(stub_client):
+    _serve(stub_client)
+    manager = LogManager(stub_client)
+    assert manager.search("r", "connection refused") == []
+    manager.failures("r", 5)
+    stub_client.calls.clear()
+    rows = manager.search("r", "connection refused")
+    assert [(row["job_name"], row["step_name"], row["lineno"]) for row in rows] == [("test", "Run tests", 4)]
+    assert stub_client.calls == []
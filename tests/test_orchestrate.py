@@ -0,0 +1,57 @@
+import pytest
+
+from core.exceptions import GitHubManagerError
+from managers.orchestrate import OrchestrationManager
+
+
+def _nodes(**needs):
+    return {name: {"needs": deps} for name, deps in needs.items()}
+
+
+def test_stages_group_independent_nodes():
+    nodes = _nodes(build=[], lint=[], test_b=["build"], test_c=["build"],
+                   deploy=["test_b", "test_c", "lint"])
+    assert OrchestrationManager.stages(nodes) == [
+        ["build", "lint"],
+        ["test_b", "test_c"],
+        ["deploy"],
+    ]
+
+
+def test_stages_do_not_modify_plan():
+    nodes = _nodes(a=[], b=["a"])
+    OrchestrationManager.stages(nodes)
+    assert nodes["b"]["needs"] == ["a"]
+
+
+def test_stages_reject_cycles():
+    with pytest.raises(GitHubManagerError, match="循环依赖"):
+        OrchestrationManager.stages(_nodes(a=[], b=["c"], c=["b"]))
+
+
+def test_load_plan_expands_defaults(stub_client):
+    manager = OrchestrationManager(stub_client)
+    nodes = manager.load_plan({
+        "defaults": {"ref": "release", "timeout": 60},
+        "nodes": {
+            "build": {"repo": "app", "workflow": "build.yml",
+                      "inputs": {"version": "1.2", "debug": True, "shards": 4}},
+            "deploy": {"repo": "ops", "workflow": "deploy.yml", "needs": "build", "ref": "main"},
+        },
+    })
+    assert nodes["build"]["ref"] == "release"
+    assert nodes["build"]["inputs"] == {"version": "1.2", "debug": "true", "shards": "4"}
+    assert nodes["build"]["correlation_input"] == "correlation_id"
+    assert nodes["deploy"]["needs"] == ["build"]
+    assert nodes["deploy"]["ref"] == "main"
+    assert nodes["deploy"]["timeout"] == 60
+
+
+@pytest.mark.parametrize("plan, message", [
+    ({}, "nodes"),
+    ({"nodes": {"a": {"repo": "x"}}}, "workflow"),
+    ({"nodes": {"a": {"repo": "x", "workflow": "w", "needs": ["b"]}}}, "不存在"),
+])
+def test_load_plan_validation(stub_client, plan, message):
+    with pytest.raises(GitHubManagerError, match=message):
+        OrchestrationManager(stub_client).load_plan(plan)
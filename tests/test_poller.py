@@ -0,0 +1,57 @@
+from core.exceptions import PollTimeoutError
+from core.poller import PENDING, Poller, PollTask
+
+
+def test_task_backoff_is_capped():
+    task = PollTask("k", lambda t: None, interval=1.0, max_interval=5.0, factor=2.0, timeout=0)
+    assert [task.advance() for _ in range(4)] == [2.0, 4.0, 5.0, 5.0]
+
+
+def test_hold_overrides_one_backoff_step():
+    task = PollTask("k", lambda t: None, interval=1.0, max_interval=30.0, factor=2.0, timeout=0)
+    task.hold(0.5)
+    assert task.advance() == 0.5
+    assert task.advance() == 1.0
+
+
+def test_run_collects_results_in_completion_order():
+    poller = Poller()
+    seen = []
+    
+    def after(polls, value):
+        def check(task):
+            seen.append(task.key)
+            return value if task.attempts >= polls else PENDING
+        return check
+    
+    poller.add("slow", after(3, "a"), interval=0.001, max_interval=0.001)
+    poller.add("fast", after(1, "b"), interval=0.001, max_interval=0.001)
+    
+    assert poller.run() == {"slow": "a", "fast": "b"}
+    assert seen.count("slow") == 3
+    assert seen.count("fast") == 1
+    assert poller.pending() == 0
+
+
+def test_errors_and_timeouts_are_recorded_per_task():
+    poller = Poller()
+    
+    def broken(task):
+        raise ValueError("boom")
+    
+    poller.add("broken", broken)
+    poller.add("never", lambda task: PENDING, interval=0.001, max_interval=0.001, timeout=0.01)
+    poller.add("ok", lambda task: 1)
+    
+    assert poller.run() == {"ok": 1}
+    assert isinstance(poller.errors["broken"], ValueError)
+    assert isinstance(poller.errors["never"], PollTimeoutError)
+
+
+def test_timeout_is_not_overshot_by_backoff():
+    poller = Poller()
+    task = poller.add("k", lambda t: PENDING, interval=0.001, max_interval=60.0,
+                      factor=1000.0, timeout=0.05)
+    poller.run()
+    assert "k" in poller.errors
+    assert task.attempts >= 2
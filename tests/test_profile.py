@@ -0,0 +1,45 @@
+import json
+
+from managers.profile import ProfileManager
+
+
+def _at(seconds: int) -> str:
+    return f"2024-01-01T00:{seconds // 60:02d}:{seconds % 60:02d}Z"
+
+
+def _job(job_id, name, created, started, completed, steps=()):
+    return {"id": job_id, "name": name, "conclusion": "success",
+            "created_at": _at(created), "started_at": _at(started), "completed_at": _at(completed),
+            "steps": [{"name": step, "number": i, "conclusion": "success",
+                       "started_at": _at(begin), "completed_at": _at(end)}
+                      for i, (step, begin, end) in enumerate(steps, 1)]}
+
+
+def test_profile_infers_critical_path(stub_client, tmp_path):
+    # build -> test -> deploy 是关键路径；lint 与 build 并行，较早结束
+    stub_client.pages["/repos/me/r/actions/runs/5/jobs"] = [
+        _job(4, "deploy", 302, 330, 400),
+        _job(1, "build", 0, 20, 120, steps=[("checkout", 20, 25), ("compile", 25, 120)]),
+        _job(2, "lint", 0, 5, 60),
+        _job(3, "test", 122, 140, 300),
+        {"id": 5, "name": "skipped", "started_at": None, "completed_at": None},
+    ]
+    trace = str(tmp_path / "trace.json")
+    result = ProfileManager(stub_client).profile("r", 5, trace_file=trace)
+    
+    assert result["critical_path"] == ["build", "test", "deploy"]
+    assert result["critical_seconds"] == 400
+    assert result["critical_queue"] == 20 + 18 + 28
+    assert result["queue_total"] == 20 + 5 + 18 + 28
+    
+    with open(trace, encoding="utf-8") as f:
+        events = json.load(f)["traceEvents"]
+    critical = {e["name"]: e["args"]["critical"] for e in events if e.get("cat") == "job"}
+    assert critical == {"build": True, "lint": False, "test": True, "deploy": True}
+    compile_step = next(e for e in events if e["name"] == "compile")
+    assert compile_step["ts"] == 25_000_000 and compile_step["dur"] == 95_000_000
+
+
+def test_profile_without_finished_jobs(stub_client):
+    stub_client.pages["/repos/me/r/actions/runs/5/jobs"] = [{"id": 1, "name": "build", "started_at": None}]
+    assert ProfileManager(stub_client).profile("r", 5)["critical_path"] == []
@@ -0,0 +1,94 @@
+import json
+
+import pytest
+
+from core.exceptions import GitHubManagerError
+from managers.provision import ProvisionManager
+from utils.manifest import load_manifest
+
+LIVE = [
+    {"name": "api", "description": "API", "private": True},
+    {"name": "web", "description": "", "private": False},
+    {"name": "legacy", "description": "old", "private": False},
+]
+
+
+@pytest.fixture
+def manager(stub_client) -> ProvisionManager:
+    stub_client.pages["/user/repos"] = LIVE
+    return ProvisionManager(stub_client)
+
+
+def test_plan_only_lists_needed_changes(manager):
+    actions = manager.plan({
+        "defaults": {"private": True},
+        "repos": [
+            {"name": "api", "description": "API"},
+            {"name": "web", "description": "Website"},
+            {"name": "new-svc"},
+            {"name": "linux", "fork": "torvalds/linux"},
+            {"name": "legacy", "state": "absent"},
+            {"name": "gone", "state": "absent"},
+        ],
+    })
+    assert [(a["action"], a["name"]) for a in actions] == [
+        ("update", "web"),
+        ("create", "new-svc"),
+        ("fork", "linux"),
+        ("delete", "legacy"),
+    ]
+    assert actions[0]["changes"] == {"description": "Website", "private": True}
+    assert actions[1]["spec"]["private"] is True
+
+
+def test_plan_is_empty_when_manifest_matches(manager):
+    assert manager.plan({"repos": [{"name": "api", "description": "API", "private": True}]}) == []
+
+
+@pytest.mark.parametrize("repos, message", [
+    ([{"description": "x"}], "缺少 name"),
+    ([{"name": "a"}, {"name": "a"}], "重复"),
+])
+def test_plan_validation(manager, repos, message):
+    with pytest.raises(GitHubManagerError, match=message):
+        manager.plan({"repos": repos})
+
+
+def test_apply_reports_each_action(manager, stub_client):
+    stub_client.responses[("POST", "/user/repos")] = (
+        lambda params, body: {"html_url": f"https://github.com/me/{body['name']}", **body}
+    )
+    stub_client.responses[("PATCH", "/repos/me/web")] = {}
+    stub_client.responses[("POST", "/repos/torvalds/linux/forks")] = {
+        "name": "linux", "full_name": "me/linux", "html_url": "https://github.com/me/linux"
+    }
+    stub_client.responses[("GET", "/repos/me/linux/git/refs/heads")] = [{"ref": "refs/heads/master"}]
+    
+    def refuse(params, body):
+        raise GitHubManagerError("denied")
+    stub_client.responses[("DELETE", "/repos/me/legacy")] = refuse
+    
+    actions = manager.plan({"repos": [
+        {"name": "web", "description": "Website"},
+        {"name": "new-svc", "private": True},
+        {"name": "linux", "fork": "torvalds/linux"},
+        {"name": "legacy", "state": "absent"},
+    ]})
+    report = {entry["name"]: entry for entry in manager.apply(actions, max_workers=2)}
+    
+    assert all(report[name]["ok"] for name in ("web", "new-svc", "linux"))
+    assert report["legacy"] == {"action": "delete", "name": "legacy", "ok": False, "error": "denied"}
+    created = [body for method, endpoint, body in stub_client.calls
+               if (method, endpoint) == ("POST", "/user/repos")]
+    assert created == [{"name": "new-svc", "description": "", "private": True, "auto_init": True}]
+
+
+def test_apply_rejects_malformed_fork(manager):
+    actions = [{"action": "fork", "name": "x", "spec": {"name": "x", "fork": "no-slash"}}]
+    assert manager.apply(actions)[0]["ok"] is False
+
+
+def test_load_json_manifest(tmp_path):
+    path = tmp_path / "repos.json"
+    path.write_text(json.dumps({"repos": [{"name": "api"}]}), encoding="utf-8")
+    assert load_manifest(str(path)) == {"repos": [{"name": "api"}]}
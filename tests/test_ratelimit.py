@@ -0,0 +1,71 @@
+import pytest
+
+import core.ratelimit as ratelimit
+from core.ratelimit import RateLimiter, WindowBudget
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+        self.sleeps = []
+    
+    def monotonic(self) -> float:
+        return self.now
+    
+    def sleep(self, seconds: float):
+        self.sleeps.append(seconds)
+        self.now += seconds
+
+
+@pytest.fixture
+def clock(monkeypatch) -> FakeClock:
+    clock = FakeClock()
+    monkeypatch.setattr(ratelimit.time, "monotonic", clock.monotonic)
+    monkeypatch.setattr(ratelimit.time, "sleep", clock.sleep)
+    return clock
+
+
+def test_rate_limiter_spaces_requests(clock):
+    limiter = RateLimiter(2.0)
+    for _ in range(3):
+        limiter.acquire()
+    assert clock.sleeps == [0.5, 0.5]
+
+
+def test_rate_limiter_unlimited(clock):
+    limiter = RateLimiter(0)
+    for _ in range(3):
+        limiter.acquire()
+    assert clock.sleeps == []
+
+
+def test_rate_limiter_backoff_delays_next_slot(clock):
+    limiter = RateLimiter(1.0)
+    limiter.acquire()
+    limiter.backoff(10)
+    limiter.acquire()
+    assert clock.sleeps == [10]
+
+
+def test_window_budget_limits_and_expires(clock):
+    budget = WindowBudget(3, window=60)
+    budget.spend(2)
+    assert budget.allows(1)
+    assert not budget.allows(2)
+    
+    clock.now += 30
+    budget.spend(1)
+    assert budget.used() == 3
+    assert budget.wait_time() == 30
+    
+    clock.now += 30
+    assert budget.used() == 1
+    assert budget.allows(2)
+    assert budget.wait_time() == 30
+
+
+def test_window_budget_unlimited(clock):
+    budget = WindowBudget(0)
+    budget.spend(10 ** 6)
+    assert budget.allows(10 ** 6)
+    assert WindowBudget(5).wait_time() == 0.0
@@ -0,0 +1,38 @@
+from core.exceptions import APIError
+from managers.repository import RepositoryManager
+
+
+def test_wait_for_forks_polls_until_refs_exist(stub_client):
+    polls = {"me/a": 0}
+    
+    def refs(params, body):
+        polls["me/a"] += 1
+        if polls["me/a"] < 3:
+            raise APIError("Git Repository is empty.", status_code=409)
+        return [{"ref": "refs/heads/main"}]
+    
+    def missing(params, body):
+        raise APIError("资源未找到", status_code=404)
+    
+    stub_client.responses[("GET", "/repos/me/a/git/refs/heads")] = refs
+    stub_client.responses[("GET", "/repos/me/b/git/refs/heads")] = missing
+    
+    ready = RepositoryManager(stub_client).wait_for_forks(
+        [{"full_name": "me/a"}, {"full_name": "me/b"}],
+        timeout=0.2, interval=0.001, max_interval=0.01
+    )
+    assert list(ready) == ["me/a"]
+    assert polls["me/a"] == 3
+
+
+
+
+
+def test_select_filters_by_patterns(stub_client):
+    inventory = {name: {"name": name, "archived": name == "team-old"}
+                 for name in ("team-a", "team-b", "team-old", "infra")}
+    manager = RepositoryManager(stub_client)
+    assert [r["name"] for r in manager.select("team-*,!team-b", inventory=inventory)] == ["team-a"]
+    assert [r["name"] for r in manager.select("team-*", include_archived=True, inventory=inventory)] == [
+        "team-a", "team-b", "team-old"
+    ]
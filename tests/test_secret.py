@@ -0,0 +1,69 @@
+import base64
+import time
+
+import pytest
+
+from core.exceptions import APIError, GitHubManagerError
+from managers.secret import SecretManager
+
+public = pytest.importorskip("nacl.public")
+
+
+def _key(key_id):
+    private = public.PrivateKey.generate()
+    return private, {"key_id": key_id, "key": base64.b64encode(bytes(private.public_key)).decode()}
+
+
+def _decrypt(private, body):
+    return public.SealedBox(private).decrypt(base64.b64decode(body["encrypted_value"])).decode()
+
+
+def test_set_secret_encrypts_once_per_key_and_retries_rotated_keys(stub_client):
+    shared_private, shared = _key("k1")
+    _, old = _key("k2")
+    new_private, new = _key("k3")
+    keys = {"me/a": [shared], "me/b": [shared], "me/c": [old, new]}
+    puts = {}
+    
+    def public_key(full_name):
+        def respond(params, body):
+            if full_name not in keys:
+                raise APIError("资源未找到", status_code=404)
+            return keys[full_name].pop(0) if len(keys[full_name]) > 1 else keys[full_name][0]
+        return respond
+    
+    def put(full_name):
+        def respond(params, body):
+            if body["key_id"] == "k2":
+                raise APIError("Bad key", status_code=422)
+            puts[full_name] = body
+        return respond
+    
+    now = time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime(time.time() + 60))
+    for full_name in ("me/a", "me/b", "me/c", "me/d"):
+        stub_client.responses[("GET", f"/repos/{full_name}/actions/secrets/public-key")] = public_key(full_name)
+        stub_client.responses[("PUT", f"/repos/{full_name}/actions/secrets/API_TOKEN")] = put(full_name)
+    for full_name in ("me/a", "me/c"):
+        stub_client.pages[f"/repos/{full_name}/actions/secrets"] = [{"name": "API_TOKEN", "updated_at": now}]
+    
+    repos = [{"full_name": name} for name in ("me/a", "me/b", "me/c", "me/d")]
+    report = {r["repo"]: r for r in SecretManager(stub_client).set_secret("API_TOKEN", "s3cret", repos)}
+    
+    assert puts["me/a"] == puts["me/b"]
+    assert _decrypt(shared_private, puts["me/a"]) == "s3cret"
+    assert puts["me/c"]["key_id"] == "k3" and _decrypt(new_private, puts["me/c"]) == "s3cret"
+    assert (report["me/a"]["ok"], report["me/a"]["verified"]) == (True, True)
+    assert (report["me/b"]["ok"], report["me/b"]["verified"]) == (True, False)
+    assert report["me/c"]["verified"] is True
+    assert report["me/d"] == {"repo": "me/d", "ok": False, "verified": None, "error": "无法获取公钥"}
+    
+    # 公钥已缓存，再次设置时不重新请求
+    stub_client.calls.clear()
+    SecretManager(stub_client).set_secret("API_TOKEN", "s3cret", repos[:2], verify=False)
+    assert [c for c in stub_client.calls if c[1].endswith("public-key")] == []
+
+
+@pytest.mark.parametrize("name", ["GITHUB_TOKEN", "1ABC", "bad-name"])
+def test_set_secret_rejects_invalid_names(stub_client, name):
+    with pytest.raises(GitHubManagerError):
+        SecretManager(stub_client).set_secret(name, "x", [])
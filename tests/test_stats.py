@@ -0,0 +1,113 @@
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from managers.export import RUN_SCHEMA  # noqa: E402
+from managers.stats import ActionsStatsManager, RunStatsCache  # noqa: E402
+from utils.columnar import ColumnarWriter  # noqa: E402
+
+RUNS = "/repos/me/r/actions/runs"
+
+
+def _iso(seconds: int) -> str:
+    return f"2024-01-01T00:{seconds // 60:02d}:{seconds % 60:02d}Z"
+
+
+def _run(run_id, name="CI", conclusion="success", attempt=1, created=0):
+    return {"id": run_id, "name": name, "status": "completed", "conclusion": conclusion,
+            "run_attempt": attempt, "created_at": _iso(created),
+            "run_started_at": _iso(created + 10), "updated_at": _iso(created + 70)}
+
+
+def _job(job_id, run_id, name, conclusion, attempt=1, created=0, duration=30):
+    return {"id": job_id, "run_id": run_id, "run_attempt": attempt, "name": name,
+            "status": "completed", "conclusion": conclusion, "created_at": _iso(created),
+            "started_at": _iso(created + 5), "completed_at": _iso(created + 5 + duration)}
+
+
+@pytest.fixture
+def github(stub_client):
+    """运行 1 成功；运行 2 的 test 第一次失败、重试后成功；运行 3 失败"""
+    runs = [_run(3, conclusion="failure", created=120), _run(2, attempt=2, created=60), _run(1)]
+    jobs = {
+        1: [_job(10, 1, "build", "success"), _job(11, 1, "test", "success")],
+        2: [_job(20, 2, "build", "success", created=60),
+            _job(21, 2, "test", "failure", created=60),
+            _job(22, 2, "test", "success", attempt=2, created=60, duration=50)],
+        3: [_job(30, 3, "build", "success", created=120), _job(31, 3, "test", "failure", created=120)],
+    }
+    stub_client.pages[RUNS] = lambda params: runs
+    for run_id, run_jobs in jobs.items():
+        stub_client.pages[f"{RUNS}/{run_id}/jobs"] = run_jobs
+    return stub_client, runs, jobs
+
+
+def _by(rows, key):
+    return {row[key]: row for row in rows}
+
+
+def test_stats_aggregation(github):
+    client, _, _ = github
+    manager = ActionsStatsManager(client)
+    assert manager.sync("r", fmt="npy") == 3
+    report = manager.stats("r")
+    
+    ci = _by(report["runs"], "workflow")["CI"]
+    assert ci["runs"] == 3
+    assert ci["success_rate"] == pytest.approx(2 / 3)
+    assert ci["duration_p50"] == 60
+    
+    jobs = _by(report["jobs"], "job")
+    assert jobs["test"]["runs"] == 3
+    assert jobs["test"]["failure_rate"] == pytest.approx(1 / 3)
+    assert jobs["test"]["flaky_rate"] == pytest.approx(1 / 3)
+    assert jobs["build"]["failure_rate"] == 0
+    assert jobs["build"]["flaky_rate"] == 0
+    assert jobs["test"]["queue_p50"] == 5
+
+
+def test_sync_skips_cached_runs(github):
+    client, _, _ = github
+    manager = ActionsStatsManager(client)
+    manager.sync("r", fmt="npy")
+    client.calls.clear()
+    assert manager.sync("r") == 0
+    assert [endpoint for _, endpoint, _ in client.calls] == [RUNS]
+
+
+def test_sync_refetches_rerun_attempts(github):
+    client, runs, jobs = github
+    manager = ActionsStatsManager(client)
+    manager.sync("r", fmt="npy")
+    
+    runs[0].update(run_attempt=2, conclusion="success")
+    jobs[3].append(_job(32, 3, "test", "success", attempt=2, created=120))
+    assert manager.sync("r") == 1
+    
+    cache = RunStatsCache("me", "r")
+    loaded = cache.load("runs", ["id", "run_attempt"])
+    assert sorted(loaded["id"].tolist()) == [1, 2, 3]
+    assert dict(zip(loaded["id"].tolist(), loaded["run_attempt"].tolist()))[3] == 2
+    assert len(cache.load("jobs", ["run_id"])["run_id"]) == 8
+    
+    test = _by(manager.stats("r")["jobs"], "job")["test"]
+    assert test["failure_rate"] == 0
+    assert test["flaky_rate"] == pytest.approx(2 / 3)
+
+
+def test_load_merges_segment_dictionaries():
+    cache = RunStatsCache("me", "merged")
+    rows = [
+        [{"id": 1, "name": "CI", "conclusion": "success"}],
+        [{"id": 2, "name": "Deploy", "conclusion": None}, {"id": 3, "name": "CI", "conclusion": "failure"}],
+    ]
+    for number, segment in enumerate(rows, 1):
+        path = f"{cache.directory}/runs-{number:06d}"
+        with ColumnarWriter(path, RUN_SCHEMA, fmt="npy") as writer:
+            writer.write_all(segment)
+    merged = cache.load("runs", ["id", "name", "conclusion"])
+    names = merged["name:values"]
+    assert [names[code] for code in merged["name"]] == ["CI", "Deploy", "CI"]
+    conclusions = merged["conclusion:values"]
+    assert merged["conclusion"][1] == -1
+    assert conclusions[merged["conclusion"][2]] == "failure"
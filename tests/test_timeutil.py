@@ -0,0 +1,30 @@
+import pytest
+
+from utils.timeutil import parse_duration, parse_timestamp
+
+
+@pytest.mark.parametrize("value, seconds", [
+    ("30", 30 * 86400),
+    ("30d", 30 * 86400),
+    ("12h", 12 * 3600),
+    ("2w", 2 * 604800),
+    ("90s", 90),
+    ("1.5m", 90),
+    (" 3H ", 3 * 3600),
+])
+def test_parse_duration(value, seconds):
+    assert parse_duration(value) == seconds
+
+
+@pytest.mark.parametrize("value", ["", "d", "-1d", "10y", "1 2d"])
+def test_parse_duration_rejects_invalid(value):
+    with pytest.raises(ValueError):
+        parse_duration(value)
+
+
+def test_parse_timestamp():
+    assert parse_timestamp("1970-01-01T00:00:00Z") == 0
+    assert parse_timestamp("2024-01-01T08:00:00Z") == 1704096000
+    assert parse_timestamp("2024-01-01T16:00:00+08:00") == 1704096000
+    assert parse_timestamp(None) is None
+    assert parse_timestamp("") is None
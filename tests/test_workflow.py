@@ -0,0 +1,360 @@
+import hashlib
+import io
+import os
+import zipfile
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+import managers.workflow as workflow
+from core.exceptions import APIError, GitHubManagerError, RateLimitError
+from managers.workflow import WorkflowManager
+
+RUN = "/repos/me/r/actions/runs/5"
+NOW = datetime.now(timezone.utc)
+
+
+def _run(status, conclusion=None):
+    return {"id": 5, "name": "CI", "run_number": 9, "head_branch": "main",
+            "html_url": "https://github.com/me/r/actions/runs/5",
+            "status": status, "conclusion": conclusion}
+
+
+def _job(job_id, status, conclusion=None):
+    return {"id": job_id, "name": f"job-{job_id}", "status": status,
+            "conclusion": conclusion, "steps": []}
+
+
+def _sequence(*replies):
+    """依次返回 replies 中的值，异常直接抛出，最后一个值重复返回"""
+    replies = list(replies)
+    
+    def respond(params, body):
+        reply = replies.pop(0) if len(replies) > 1 else replies[0]
+        if isinstance(reply, Exception):
+            raise reply
+        return reply
+    return respond
+
+
+def _watch(client):
+    return WorkflowManager(client).watch_run("r", 5, interval=0.001, max_interval=0.001)
+
+
+def test_watch_run_retries_transient_errors(stub_client, capsys):
+    stub_client.responses[("GET", RUN)] = _sequence(
+        APIError("Bad Gateway", status_code=502),
+        RateLimitError("rate limited", retry_after=0, status_code=403),
+        APIError("连接失败"),
+        _run("in_progress"),
+        _run("completed", "success"),
+    )
+    stub_client.responses[("GET", f"{RUN}/jobs")] = {"total_count": 1, "jobs": [_job(1, "completed", "success")]}
+    assert _watch(stub_client)["conclusion"] == "success"
+    assert "运行结束: success" in capsys.readouterr().out
+
+
+def test_watch_run_stops_on_client_errors(stub_client):
+    stub_client.responses[("GET", RUN)] = _sequence(APIError("资源未找到", status_code=404))
+    with pytest.raises(APIError):
+        _watch(stub_client)
+
+
+def test_watch_run_reads_every_job_page(stub_client, capsys):
+    stub_client.responses[("GET", RUN)] = _sequence(_run("in_progress"), _run("completed", "failure"))
+    stub_client.responses[("GET", f"{RUN}/jobs")] = {"total_count": 2, "jobs": [_job(1, "completed", "success")]}
+    stub_client.pages[f"{RUN}/jobs"] = lambda params: [_job(2, "completed", "failure")] if params["page"] == 2 else []
+    assert _watch(stub_client)["conclusion"] == "failure"
+    out = capsys.readouterr().out
+    assert "job-1: completed (success)" in out
+    assert "job-2: completed (failure)" in out
+
+
+class _UUID:
+    hex = "c0ffee0000000000"
+
+
+def _dispatched(run):
+    return {"id": run, "name": "Deploy", "display_title": "Deploy",
+            "created_at": f"2024-01-01T00:00:0{run}Z",
+            "html_url": f"https://github.com/me/r/actions/runs/{run}"}
+
+
+def test_trigger_and_find_matches_correlation_id(stub_client, monkeypatch):
+    monkeypatch.setattr(workflow.uuid, "uuid4", lambda: _UUID())
+    endpoint = "/repos/me/r/actions/workflows/deploy.yml"
+    other = dict(_dispatched(1), display_title="Deploy other")
+    mine = dict(_dispatched(2), display_title="Deploy c0ffee000000")
+    stub_client.responses[("GET", f"{endpoint}/runs")] = {"workflow_runs": [mine, other]}
+    stub_client.responses[("GET", "/repos/me/r/actions/runs/1/jobs")] = {"jobs": [{"name": "deploy", "steps": []}]}
+    
+    run = WorkflowManager(stub_client).trigger_and_find("r", "deploy.yml", inputs={"env": "prod"})
+    assert run["id"] == 2
+    dispatch = next(body for method, endpoint_, body in stub_client.calls if method == "POST")
+    assert dispatch == {"ref": "main", "inputs": {"env": "prod", "correlation_id": "c0ffee000000"}}
+    params = next(params for _, endpoint_, params in stub_client.calls if endpoint_ == f"{endpoint}/runs")
+    assert params["event"] == "workflow_dispatch" and params["actor"] == "me"
+    assert params["created"].startswith(">=")
+
+
+def test_run_matcher_checks_job_names_once(stub_client):
+    jobs = "/repos/me/r/actions/runs/3/jobs"
+    stub_client.responses[("GET", jobs)] = _sequence(
+        {"jobs": []},
+        {"jobs": [{"name": "build", "steps": [{"name": "Set up job"}]}]},
+        {"jobs": [{"name": "build", "steps": [{"name": "echo abc"}]}]},
+    )
+    matches = WorkflowManager(stub_client).run_matcher("r", "abc")
+    run = {"id": 3, "name": "CI", "display_title": "CI"}
+    # 还没有 job 时下次重新检查；有 job 但不匹配后不再请求
+    assert not matches(run)
+    assert not matches(run)
+    assert not matches(run)
+    assert len([c for c in stub_client.calls if c[1] == jobs]) == 2
+    assert matches({"id": 4, "name": "CI abc"})
+
+
+def _log_zip(path):
+    with zipfile.ZipFile(path, "w") as archive:
+        archive.writestr("build/1_Set up job.txt", "setup\n")
+        archive.writestr("build/3_Run tests.txt", "FAILED test_x\n")
+        archive.writestr("lint/1_Set up job.txt", "setup\n")
+
+
+def test_get_logs_downloads_once_and_extracts_matches(stub_client, tmp_path):
+    downloads = []
+    
+    def download(endpoint, path):
+        downloads.append(endpoint)
+        _log_zip(path)
+        return os.path.getsize(path)
+    
+    stub_client.download = download
+    manager = WorkflowManager(stub_client)
+    path = manager.get_logs("r", 5)
+    assert manager.get_logs("r", 5) == path
+    assert downloads == [f"{RUN}/logs"]
+    
+    target = str(tmp_path / "out")
+    assert manager.get_logs("r", 5, only=["*/3_*"], extract_dir=target) == target
+    assert sorted(os.listdir(os.path.join(target, "build"))) == ["3_Run tests.txt"]
+    assert not os.path.exists(os.path.join(target, "lint"))
+
+
+def _iso(when: datetime) -> str:
+    return when.strftime("%Y-%m-%dT%H:%M:%SZ")
+
+
+def _aged_run(run_id: int, age_days: float, name: str = "CI") -> dict:
+    return {"id": run_id, "name": name, "created_at": _iso(NOW - timedelta(days=age_days))}
+
+
+def _serve_runs(runs, limit=None):
+    """按 created 过滤（<X / <=X）的运行列表，新 -> 旧，limit 模拟查询结果上限"""
+    def page(params):
+        created = params.get("created")
+        selected = sorted(runs, key=lambda r: (r["created_at"], r["id"]), reverse=True)
+        if created and created.startswith("<="):
+            selected = [r for r in selected if r["created_at"] <= created[2:]]
+        elif created:
+            selected = [r for r in selected if r["created_at"] < created[1:]]
+        return selected[:limit] if limit else selected
+    return page
+
+
+def _select(client, older_days=30, keep_last=0):
+    manager = WorkflowManager(client)
+    return manager._select_prune_victims("r", older_days * 86400, keep_last,
+                                         "completed", None, verbose=False)
+
+
+def test_selects_only_runs_older_than_cutoff(stub_client):
+    runs = [_aged_run(1, 100), _aged_run(2, 60, "Deploy"), _aged_run(3, 10), _aged_run(4, 1)]
+    stub_client.pages["/repos/me/r/actions/runs"] = _serve_runs(runs)
+    assert _select(stub_client) == [2, 1]
+
+
+def test_keep_last_protects_newest_runs(stub_client):
+    runs = [_aged_run(1, 100), _aged_run(2, 90), _aged_run(3, 80)]
+    stub_client.pages["/repos/me/r/actions/runs"] = _serve_runs(runs)
+    assert _select(stub_client, keep_last=2) == [1]
+    assert _select(stub_client, keep_last=5) == []
+
+
+def test_continues_past_query_limit_without_duplicates(stub_client, monkeypatch):
+    monkeypatch.setattr(workflow, "RUN_QUERY_LIMIT", 3)
+    runs = [_aged_run(i, 100 + i // 2) for i in range(1, 10)]
+    stub_client.pages["/repos/me/r/actions/runs"] = _serve_runs(runs, limit=3)
+    victims = _select(stub_client)
+    assert sorted(victims) == list(range(1, 10))
+    assert len(victims) == len(set(victims))
+
+
+def _artifact_zip(members):
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, "w") as archive:
+        for name, data in members.items():
+            archive.writestr(name, data)
+    return buffer.getvalue()
+
+
+def _artifact(artifact_id, name, content, run_id, digest=None, expired=False):
+    return {"id": artifact_id, "name": name, "size_in_bytes": len(content), "expired": expired,
+            "created_at": "2024-01-01T00:00:00Z", "workflow_run": {"id": run_id},
+            "digest": digest or "sha256:" + hashlib.sha256(content).hexdigest()}
+
+
+def test_get_artifacts_dedupes_by_digest_and_verifies(stub_client, tmp_path):
+    dist = _artifact_zip({"app/main.py": "print()\n", "../escape.txt": "x"})
+    report_zip = _artifact_zip({"report.xml": "<ok/>"})
+    contents = {1: dist, 2: dist, 3: report_zip, 4: report_zip}
+    stub_client.pages.update({
+        "/repos/me/r/actions/runs/10/artifacts": [
+            _artifact(1, "dist", dist, 10), _artifact(3, "report", report_zip, 10),
+            _artifact(5, "coverage", b"", 10, expired=True),
+        ],
+        "/repos/me/r/actions/runs/11/artifacts": [
+            _artifact(2, "dist", dist, 11), _artifact(4, "report", report_zip, 11, digest="sha256:bad"),
+        ],
+    })
+    downloads = []
+    
+    def download(endpoint, path):
+        artifact_id = int(endpoint.split("/")[-2])
+        downloads.append(artifact_id)
+        with open(path, "wb") as f:
+            f.write(contents[artifact_id])
+        return len(contents[artifact_id])
+    
+    stub_client.download = download
+    manager = WorkflowManager(stub_client)
+    output = str(tmp_path / "artifacts")
+    report = manager.get_artifacts("r", [10, 11], output_dir=output, extract=True)
+    
+    assert sorted(downloads) == [1, 3, 4]
+    results = {r["artifact"]["id"]: (r["downloaded"], r["error"]) for r in report}
+    assert results[1] == (True, None) and results[2] == (False, None) and results[3] == (True, None)
+    assert "摘要不匹配" in results[4][1]
+    assert not os.path.exists(os.path.join(output, "11", "report.zip"))
+    with open(os.path.join(output, "11", "dist", "app", "main.py")) as f:
+        assert f.read() == "print()\n"
+    assert not os.path.exists(os.path.join(output, "11", "escape.txt"))
+    assert not os.path.exists(os.path.join(output, "escape.txt"))
+    
+    # 重新运行时已下载的产物直接跳过
+    downloads.clear()
+    report = manager.get_artifacts("r", [10, 11], patterns=["dist"], output_dir=output)
+    assert downloads == [] and [r["downloaded"] for r in report] == [False, False]
+
+
+CACHES = "/repos/me/r/actions/caches"
+
+
+def _cache(cache_id, key, size, accessed, ref="refs/heads/main"):
+    return {"id": cache_id, "key": key, "ref": ref, "size_in_bytes": size,
+            "created_at": accessed, "last_accessed_at": accessed, "version": "x"}
+
+
+def _serve_caches(client):
+    caches = [
+        _cache(1, "Linux-node-3f2a9c1d", 300, "2024-03-01T00:00:00Z"),
+        _cache(2, "Linux-node-9b8c7d6e", 200, "2024-01-01T00:00:00Z"),
+        _cache(3, "Linux-pip-42", 100, "2024-02-01T00:00:00Z", ref="refs/heads/feature"),
+        _cache(4, "Linux-pip-41", 50, "2024-01-15T00:00:00Z", ref="refs/heads/feature"),
+    ]
+    
+    def page(params):
+        return [c for c in caches
+                if c["key"].startswith(params.get("key", "")) and c["ref"] == params.get("ref", c["ref"])]
+    client.pages[CACHES] = page
+    return caches
+
+
+@pytest.mark.parametrize("key, depth, prefix", [
+    ("Linux-node-3f2a9c1d", None, "Linux-node"),
+    ("Linux-pip-42", None, "Linux-pip"),
+    ("setup-go-1.22-linux-amd64", None, "setup-go-1.22-linux-amd64"),
+    ("Linux-node-3f2a9c1d", 1, "Linux"),
+])
+def test_cache_prefix(key, depth, prefix):
+    assert workflow.cache_prefix(key, depth) == prefix
+
+
+def test_cache_usage_reports_reclaimable_versions(stub_client):
+    _serve_caches(stub_client)
+    manager = WorkflowManager(stub_client)
+    usage = manager.cache_usage("r")
+    assert [(g["group"], g["count"], g["size"], g["reclaimable"]) for g in usage] == [
+        ("Linux-node", 2, 500, 200),
+        ("Linux-pip", 2, 150, 50),
+    ]
+    assert [g["group"] for g in manager.cache_usage("r", by="ref")] == ["refs/heads/main", "refs/heads/feature"]
+    
+    # 离线汇总使用上次保存的快照
+    stub_client.calls.clear()
+    assert manager.cache_usage("r", offline=True) == usage
+    assert stub_client.calls == []
+
+
+def test_evict_caches_deletes_and_updates_snapshot(stub_client):
+    _serve_caches(stub_client)
+    
+    def gone(params, body):
+        raise APIError("Not Found", status_code=404)
+    
+    stub_client.responses[("DELETE", f"{CACHES}/4")] = gone
+    manager = WorkflowManager(stub_client)
+    manager.list_caches("r")
+    
+    assert manager.evict_caches("r", ref="refs/heads/feature", dry_run=True)["freed"] == 0
+    result = manager.evict_caches("r", ref="refs/heads/feature")
+    assert result == {"selected": 2, "deleted": 2, "failed": 0, "freed": 150}
+    assert [g["group"] for g in manager.cache_usage("r", offline=True)] == ["Linux-node"]
+    
+    assert manager.evict_caches("r", older_than=30 * 86400)["deleted"] == 4
+    with pytest.raises(GitHubManagerError):
+        manager.evict_caches("r")
+
+
+def test_bulk_set_state_reresolves_stale_ids(stub_client):
+    current = {
+        "me/a": {"deploy.yml": 1},
+        "me/b": {"deploy.yml": 2},
+        "me/c": {"ci.yml": 3},
+        "me/d": {"deploy.yml": 4},
+        "me/e": {"deploy.yml": 5},
+    }
+    for full_name in current:
+        stub_client.pages[f"/repos/{full_name}/actions/workflows"] = (
+            lambda params, full_name=full_name: [
+                {"id": workflow_id, "name": file[:-4].title(), "path": f".github/workflows/{file}"}
+                for file, workflow_id in current[full_name].items()
+            ]
+        )
+    repos = [{"full_name": full_name} for full_name in current]
+    manager = WorkflowManager(stub_client)
+    assert manager.bulk_set_state(repos, "deploy.yml", False, dry_run=True)["missing"] == 1
+    
+    # b 的 workflow 被删除后重建，d 的 workflow 已删除，e 返回 5xx
+    current["me/b"] = {"deploy.yml": 20}
+    current["me/d"] = {}
+    live = {("me/a", 1), ("me/b", 20), ("me/e", 5)}
+    
+    def put(full_name, workflow_id):
+        def respond(params, body):
+            if full_name == "me/e":
+                raise APIError("Server Error", status_code=500)
+            if (full_name, workflow_id) not in live:
+                raise APIError("Not Found", status_code=404)
+        return respond
+    
+    for full_name, workflow_id in [("me/a", 1), ("me/b", 2), ("me/b", 20), ("me/d", 4), ("me/e", 5)]:
+        endpoint = f"/repos/{full_name}/actions/workflows/{workflow_id}/disable"
+        stub_client.responses[("PUT", endpoint)] = put(full_name, workflow_id)
+    stub_client.calls.clear()
+    
+    result = manager.bulk_set_state(repos, "Deploy", False)
+    assert (result["changed"], result["missing"], result["failed"]) == (2, 2, 1)
+    # 映射中有 Deploy 的仓库不再读取列表；c 没有该 workflow，b、d 返回 404 后重新解析
+    listed = sorted(c[1] for c in stub_client.calls if c[1].endswith("/actions/workflows"))
+    assert listed == [f"/repos/me/{name}/actions/workflows" for name in "bcd"]
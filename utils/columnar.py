@@ -0,0 +1,302 @@
+import csv
+import json
+import os
+import sys
+from array import array
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+# 列类型:
+#   int64  整数（时间戳已转换为 epoch 秒），缺失值记为 0
+#   dict   字典编码的字符串（status、conclusion 等低基数字段），缺失值编码为 -1
+#   str    普通字符串（SHA、提交信息等）
+Schema = List[Tuple[str, str]]
+
+# NPY 头部固定占用的字节数，写入完成后回填真实 shape
+NPY_HEADER_SIZE = 128
+NPY_DTYPES = {"int64": ("<i8", "q"), "dict": ("<i4", "i")}
+
+
+def has_arrow() -> bool:
+    """是否可以使用 pyarrow 写入 Parquet"""
+    try:
+        import pyarrow  # noqa: F401
+        return True
+    except ImportError:
+        return False
+
+
+def resolve_format(fmt: str) -> str:
+    """auto 时优先 Parquet，未安装 pyarrow 时退回 NPY 目录格式"""
+    if fmt == "auto":
+        return "parquet" if has_arrow() else "npy"
+    return fmt
+
+
+class ColumnarWriter:
+    """
+    按批次流式写入列式文件
+    
+    parquet: 单个 .parquet 文件（需要 pyarrow），字典列使用 Arrow 字典类型
+    npy:     目录格式，数值列和字典编码列各为一个 .npy 文件，
+             字符串列写入 strings.csv，schema.json 保存列类型和字典
+    """
+    
+    def __init__(self, path: str, schema: Schema, fmt: str = "auto",
+                 batch_size: int = 10000):
+        self.path = path
+        self.schema = schema
+        self.format = resolve_format(fmt)
+        self.batch_size = batch_size
+        self.rows = 0
+        self._buffer: Dict[str, List[Any]] = {name: [] for name, _ in schema}
+        self._dictionaries: Dict[str, Dict[str, int]] = {
+            name: {} for name, kind in schema if kind == "dict"
+        }
+        
+        if self.format == "parquet":
+            self._open_parquet()
+        elif self.format == "npy":
+            self._open_npy()
+        else:
+            raise ValueError(f"不支持的导出格式: {fmt}")
+    
+    def write(self, row: Dict[str, Any]):
+        """写入一行，缓冲区满时自动落盘"""
+        for name, _ in self.schema:
+            self._buffer[name].append(row.get(name))
+        self.rows += 1
+        if len(self._buffer[self.schema[0][0]]) >= self.batch_size:
+            self._flush()
+    
+    def write_all(self, rows: Iterable[Dict[str, Any]]) -> int:
+        """写入全部行，返回累计行数"""
+        for row in rows:
+            self.write(row)
+        return self.rows
+    
+    def close(self):
+        """写出剩余数据并完成文件"""
+        self._flush()
+        if self.format == "parquet":
+            self._parquet_writer.close()
+        else:
+            self._close_npy()
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+    
+    def _flush(self):
+        count = len(self._buffer[self.schema[0][0]])
+        if not count:
+            return
+        if self.format == "parquet":
+            self._flush_parquet()
+        else:
+            self._flush_npy()
+        for values in self._buffer.values():
+            values.clear()
+    
+    # ---------- Parquet ----------
+    
+    def _open_parquet(self):
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+        
+        types = {
+            "int64": pa.int64(),
+            "dict": pa.dictionary(pa.int32(), pa.string()),
+            "str": pa.string()
+        }
+        self._arrow_schema = pa.schema([(name, types[kind]) for name, kind in self.schema])
+        self._parquet_writer = pq.ParquetWriter(self.path, self._arrow_schema)
+    
+    def _flush_parquet(self):
+        import pyarrow as pa
+        
+        arrays = []
+        for name, kind in self.schema:
+            values = self._buffer[name]
+            if kind == "dict":
+                arrays.append(pa.array(values, type=pa.string()).dictionary_encode())
+            else:
+                arrays.append(pa.array(values, type=self._arrow_schema.field(name).type))
+        batch = pa.RecordBatch.from_arrays(arrays, schema=self._arrow_schema)
+        self._parquet_writer.write_batch(batch)
+    
+    # ---------- NPY 目录 ----------
+    
+    def _open_npy(self):
+        os.makedirs(self.path, exist_ok=True)
+        self._npy_files = {}
+        for name, kind in self.schema:
+            if kind in NPY_DTYPES:
+                f = open(os.path.join(self.path, f"{name}.npy"), "wb")
+                f.write(b"\0" * NPY_HEADER_SIZE)
+                self._npy_files[name] = f
+        
+        self._str_columns = [name for name, kind in self.schema if kind == "str"]
+        self._csv_file = None
+        if self._str_columns:
+            self._csv_file = open(
+                os.path.join(self.path, "strings.csv"), "w", encoding="utf-8", newline=""
+            )
+            self._csv_writer = csv.writer(self._csv_file)
+            self._csv_writer.writerow(self._str_columns)
+    
+    def _flush_npy(self):
+        for name, kind in self.schema:
+            values = self._buffer[name]
+            if kind == "int64":
+                data = array("q", (v or 0 for v in values))
+            elif kind == "dict":
+                codes = self._dictionaries[name]
+                data = array("i", (
+                    -1 if v is None else codes.setdefault(v, len(codes))
+                    for v in values
+                ))
+            else:
+                continue
+            if sys.byteorder != "little":
+                data.byteswap()
+            data.tofile(self._npy_files[name])
+        
+        if self._csv_file:
+            columns = [self._buffer[name] for name in self._str_columns]
+            self._csv_writer.writerows(zip(*columns))
+    
+    def _close_npy(self):
+        for name, kind in self.schema:
+            if name not in self._npy_files:
+                continue
+            f = self._npy_files[name]
+            f.seek(0)
+            f.write(_npy_header(NPY_DTYPES[kind][0], self.rows))
+            f.close()
+        if self._csv_file:
+            self._csv_file.close()
+        
+        schema = {
+            "rows": self.rows,
+            "columns": [{"name": name, "type": kind} for name, kind in self.schema],
+            "dictionaries": {
+                name: sorted(codes, key=codes.get)
+                for name, codes in self._dictionaries.items()
+            }
+        }
+        with open(os.path.join(self.path, "schema.json"), "w", encoding="utf-8") as f:
+            json.dump(schema, f, ensure_ascii=False)
+
+
+def _npy_header(descr: str, rows: int) -> bytes:
+    """生成固定长度的 NPY v1.0 头部"""
+    header = f"{{'descr': '{descr}', 'fortran_order': False, 'shape': ({rows},), }}"
+    padding = NPY_HEADER_SIZE - 10 - len(header) - 1
+    header = header + " " * padding + "\n"
+    return b"\x93NUMPY\x01\x00" + len(header).to_bytes(2, "little") + header.encode("latin1")
+
+
+class ColumnarTable:
+    """
+    读取导出的列式数据
+    
+    columns 中数值列为整数数组，字典列为编码数组（-1 表示缺失），
+    对应取值保存在 dictionaries 中；安装了 numpy 时数组为 ndarray（NPY 使用 mmap）。
+    """
+    
+    def __init__(self, columns: Dict[str, Any], dictionaries: Dict[str, List[str]],
+                 types: Dict[str, str]):
+        self.columns = columns
+        self.dictionaries = dictionaries
+        self.types = types
+    
+    def __len__(self) -> int:
+        first = next(iter(self.columns.values()), [])
+        return len(first)
+    
+    def decode(self, name: str) -> List[Optional[str]]:
+        """将字典列还原为字符串列表"""
+        values = self.dictionaries[name]
+        return [values[code] if code >= 0 else None for code in self.columns[name]]
+    
+    def code(self, name: str, value: str) -> int:
+        """返回字典列中某个取值的编码，不存在时返回 -1"""
+        try:
+            return self.dictionaries[name].index(value)
+        except ValueError:
+            return -1
+    
+    @classmethod
+    def load(cls, path: str, columns: Optional[List[str]] = None) -> "ColumnarTable":
+        """加载 .parquet 文件或 NPY 目录，columns 指定只读取部分列"""
+        if os.path.isdir(path):
+            return cls._load_npy(path, columns)
+        return cls._load_parquet(path, columns)
+    
+    @classmethod
+    def _load_parquet(cls, path: str, columns: Optional[List[str]]) -> "ColumnarTable":
+        import pyarrow as pa
+        import pyarrow.compute as pc
+        import pyarrow.parquet as pq
+        
+        # 各批次的字典不同，先统一再合并
+        table = pq.read_table(path, columns=columns).unify_dictionaries()
+        data, dictionaries, types = {}, {}, {}
+        for field in table.schema:
+            column = table.column(field.name).combine_chunks()
+            if pa.types.is_dictionary(field.type):
+                dictionaries[field.name] = column.dictionary.to_pylist()
+                data[field.name] = pc.fill_null(column.indices, -1).to_numpy()
+                types[field.name] = "dict"
+            elif pa.types.is_integer(field.type):
+                data[field.name] = pc.fill_null(column, 0).to_numpy()
+                types[field.name] = "int64"
+            else:
+                data[field.name] = column.to_pylist()
+                types[field.name] = "str"
+        return cls(data, dictionaries, types)
+    
+    @classmethod
+    def _load_npy(cls, path: str, columns: Optional[List[str]]) -> "ColumnarTable":
+        with open(os.path.join(path, "schema.json"), "r", encoding="utf-8") as f:
+            schema = json.load(f)
+        types = {c["name"]: c["type"] for c in schema["columns"]}
+        wanted = columns or list(types)
+        
+        data = {}
+        for name in wanted:
+            if types[name] in NPY_DTYPES:
+                data[name] = _load_npy_column(
+                    os.path.join(path, f"{name}.npy"), NPY_DTYPES[types[name]][1]
+                )
+        
+        str_columns = [name for name in wanted if types[name] == "str"]
+        if str_columns:
+            with open(os.path.join(path, "strings.csv"), "r", encoding="utf-8", newline="") as f:
+                reader = csv.reader(f)
+                header = next(reader)
+                indexes = [header.index(name) for name in str_columns]
+                values = {name: [] for name in str_columns}
+                for row in reader:
+                    for name, index in zip(str_columns, indexes):
+                        values[name].append(row[index])
+            data.update(values)
+        
+        dictionaries = {k: v for k, v in schema["dictionaries"].items() if k in data}
+        return cls(data, dictionaries, {k: types[k] for k in wanted})
+
+
+def _load_npy_column(path: str, typecode: str):
+    try:
+        import numpy as np
+        return np.load(path, mmap_mode="r")
+    except ImportError:
+        data = array(typecode)
+        with open(path, "rb") as f:
+            f.seek(NPY_HEADER_SIZE)
+            data.frombytes(f.read())
+        if sys.byteorder != "little":
+            data.byteswap()
+        return data
@@ -0,0 +1,41 @@
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Any, Callable, Iterable, List, Optional, Tuple
+
+# (输入项, 返回值, 异常)
+TaskResult = Tuple[Any, Any, Optional[Exception]]
+
+
+def run_concurrent(func: Callable[[Any], Any], items: Iterable[Any],
+                   max_workers: int = 4,
+                   on_done: Optional[Callable[[TaskResult], None]] = None) -> List[TaskResult]:
+    """
+    在有界线程池上对每个输入项执行 func
+    
+    单个任务失败不会中断其他任务，异常会记录在对应结果中。
+    
+    Args:
+        func: 处理单个输入项的函数
+        items: 输入项
+        max_workers: 最大并发数
+        on_done: 每个任务完成时的回调（在调用线程中执行）
+    
+    Returns:
+        与输入顺序一致的 (输入项, 返回值, 异常) 列表
+    """
+    items = list(items)
+    results: List[Optional[TaskResult]] = [None] * len(items)
+    if not items:
+        return []
+    
+    with ThreadPoolExecutor(max_workers=max(1, max_workers)) as executor:
+        futures = {executor.submit(func, item): i for i, item in enumerate(items)}
+        for future in as_completed(futures):
+            index = futures[future]
+            try:
+                result = (items[index], future.result(), None)
+            except Exception as e:
+                result = (items[index], None, e)
+            results[index] = result
+            if on_done:
+                on_done(result)
+    return results
@@ -0,0 +1,22 @@
+import json
+from typing import Any
+from core.exceptions import GitHubManagerError
+
+
+def load_manifest(path: str) -> Any:
+    """
+    读取 YAML 或 JSON 格式的清单文件
+    
+    .json 文件直接使用标准库解析；其他扩展名按 YAML 解析，需要安装 PyYAML。
+    """
+    with open(path, "r", encoding="utf-8") as f:
+        if path.endswith(".json"):
+            return json.load(f)
+        
+        try:
+            import yaml
+        except ImportError:
+            raise GitHubManagerError(
+                f"读取 YAML 清单需要 PyYAML (pip install pyyaml)，或改用 JSON 格式: {path}"
+            )
+        return yaml.safe_load(f)
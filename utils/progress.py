@@ -0,0 +1,38 @@
+import threading
+import time
+
+
+class ProgressReporter:
+    """批量操作的进度行：完成数、吞吐量和预计剩余时间"""
+    
+    def __init__(self, total: int, label: str = "进度"):
+        self.total = total
+        self.label = label
+        self.done = 0
+        self.failed = 0
+        self.start = time.monotonic()
+        self._lock = threading.Lock()
+    
+    def advance(self, ok: bool = True):
+        """记录一个完成项并输出进度行"""
+        with self._lock:
+            self.done += 1
+            if not ok:
+                self.failed += 1
+            print(f"  [{self.label}] {self._format()}")
+    
+    def summary(self) -> str:
+        """返回最终统计信息"""
+        elapsed = time.monotonic() - self.start
+        rate = self.done / elapsed if elapsed > 0 else 0.0
+        return (f"完成 {self.done}/{self.total}，失败 {self.failed}，"
+                f"耗时 {elapsed:.1f}s，吞吐量 {rate:.2f} 个/秒")
+    
+    def _format(self) -> str:
+        elapsed = time.monotonic() - self.start
+        rate = self.done / elapsed if elapsed > 0 else 0.0
+        remaining = self.total - self.done
+        eta = f"{remaining / rate:.0f}s" if rate > 0 else "--"
+        percent = self.done * 100 // self.total if self.total else 100
+        return (f"{self.done}/{self.total} ({percent}%) "
+                f"{rate:.2f} 个/秒 预计剩余 {eta} 失败 {self.failed}")
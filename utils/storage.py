@@ -0,0 +1,33 @@
+import json
+import os
+from typing import Any
+from urllib.parse import quote
+from config import Config
+
+
+def cache_path(*parts: str) -> str:
+    """
+    返回本地缓存目录下的文件路径，并确保父目录存在
+    
+    路径片段会做 URL 编码，分支名中的 / 等字符不会产生子目录。
+    """
+    safe_parts = [quote(str(part), safe="-_.") for part in parts]
+    path = os.path.join(Config.CACHE_DIR, *safe_parts)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    return path
+
+
+def read_json(path: str, default: Any = None) -> Any:
+    """读取 JSON 文件，文件不存在时返回 default"""
+    if not os.path.exists(path):
+        return default
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def write_json(path: str, data: Any):
+    """原子写入 JSON 文件（先写临时文件再替换）"""
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(data, f, ensure_ascii=False)
+    os.replace(tmp_path, path)
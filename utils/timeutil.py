@@ -0,0 +1,21 @@
+import re
+from datetime import datetime
+from typing import Optional
+
+DURATION_UNITS = {"s": 1, "m": 60, "h": 3600, "d": 86400, "w": 604800}
+
+
+def parse_timestamp(value: Optional[str]) -> Optional[int]:
+    """将 GitHub 的 ISO 8601 时间（如 2024-01-01T08:00:00Z）转换为 epoch 秒"""
+    if not value:
+        return None
+    return int(datetime.fromisoformat(value.replace("Z", "+00:00")).timestamp())
+
+
+def parse_duration(value: str) -> int:
+    """将 30d、12h、2w 等时长转换为秒数（不带单位时按天）"""
+    match = re.fullmatch(r"\s*(\d+(?:\.\d+)?)\s*([smhdw]?)\s*", value.lower())
+    if not match:
+        raise ValueError(f"无效的时长: {value}（示例: 30d、12h、2w）")
+    number, unit = match.groups()
+    return int(float(number) * DURATION_UNITS[unit or "d"])